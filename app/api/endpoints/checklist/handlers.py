@@ -1,7 +1,14 @@
-from fastapi import Request, HTTPException, Form
+from typing import Optional
+from datetime import datetime, timedelta
+from fastapi import Request, HTTPException, Form, Query
 from fastapi.responses import HTMLResponse
+from app.api.pagination import paginate
 from app.services.checklist import ChecklistService
-from app.models.schemas.checklist import CreateChecklistRequest
+from app.services.orders import OrdersService
+from app.models.schemas.checklist import CreateChecklistRequest, GenerateChecklistsRequest, BatchItemUpdateRequest
+
+# Longest date range accepted by bulk checklist generation
+MAX_GENERATE_DAYS = 31
 
 async def checklist_page(request: Request) -> HTMLResponse:
     """
@@ -24,17 +31,19 @@ async def checklist_page(request: Request) -> HTMLResponse:
             detail=f"Error loading checklist page: {str(e)}"
         )
 
-async def get_checklists_data():
+async def get_checklists_data(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """
     Get all checklists data
     """
     try:
         checklists = ChecklistService.get_all_checklists()
-        return {
-            "success": True,
-            "data": checklists,
-            "total": len(checklists)
-        }
+        return paginate(checklists, limit, cursor, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -79,6 +88,44 @@ async def create_checklist(checklist_data: CreateChecklistRequest):
             detail=f"Error creating checklist: {str(e)}"
         )
 
+async def generate_checklists(request_data: GenerateChecklistsRequest):
+    """
+    Create checklists for every active order in a date range that has none yet
+    """
+    try:
+        date_to = request_data.date_to or request_data.date_from
+        if date_to < request_data.date_from:
+            raise HTTPException(status_code=400, detail="date_to must not be before date_from")
+        if (date_to - request_data.date_from).days >= MAX_GENERATE_DAYS:
+            raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_GENERATE_DAYS} days")
+        
+        available = ChecklistService.get_available_categories()
+        categories = request_data.categories or available
+        unknown = [category for category in categories if category not in available]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown categories: {', '.join(unknown)}")
+        
+        start = datetime.combine(request_data.date_from, datetime.min.time())
+        end = datetime.combine(date_to, datetime.min.time()) + timedelta(days=1)
+        orders = [order for order in OrdersService.get_orders_in_range(start, end)
+                  if order.status in OrdersService.ACTIVE_STATUSES]
+        
+        created = ChecklistService.create_checklists_for_orders(orders, categories, request_data.supervisor)
+        return {
+            "success": True,
+            "message": f"Created {len(created)} checklists",
+            "orders": len(orders),
+            "skipped": len(orders) - len(created),
+            "data": created
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error generating checklists: {str(e)}"
+        )
+
 async def update_checklist_item(checklist_id: int, item_id: int, completed: bool = Form(...)):
     """
     Update checklist item status
@@ -90,7 +137,8 @@ async def update_checklist_item(checklist_id: int, item_id: int, completed: bool
         
         return {
             "success": True,
-            "message": "Checklist item updated successfully"
+            "message": "Checklist item updated successfully",
+            "progress": ChecklistService.get_checklist_progress(checklist_id)
         }
     except HTTPException:
         raise
@@ -100,6 +148,53 @@ async def update_checklist_item(checklist_id: int, item_id: int, completed: bool
             detail=f"Error updating checklist item: {str(e)}"
         )
 
+async def update_checklist_items(checklist_id: int, request_data: BatchItemUpdateRequest):
+    """
+    Apply many item changes to a checklist in one request
+    """
+    try:
+        if not request_data.changes:
+            raise HTTPException(status_code=400, detail="No changes provided")
+        checklist = ChecklistService.get_checklist_by_id(checklist_id)
+        if not checklist:
+            raise HTTPException(status_code=404, detail="Checklist not found")
+        if checklist.status == "cancelled":
+            raise HTTPException(status_code=409, detail="Checklist is cancelled")
+        
+        checklist, errors = ChecklistService.update_checklist_items(checklist_id, [
+            (change.item_id, change.completed, change.notes, change.client_timestamp)
+            for change in request_data.changes
+        ])
+        if checklist is None:
+            raise HTTPException(status_code=409, detail="Checklist is archived")
+        if errors:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": "No items were updated",
+                    "errors": [{"index": index, "error": error} for index, error in errors]
+                }
+            )
+        
+        return {
+            "success": True,
+            "message": f"{len(request_data.changes)} item changes applied",
+            "data": {
+                "checklist_id": checklist.id,
+                "status": checklist.status,
+                "completed_at": checklist.completed_at,
+                "progress": ChecklistService.get_checklist_progress(checklist.id),
+                "summary": ChecklistService.get_checklists_summary()
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error updating checklist items: {str(e)}"
+        )
+
 async def complete_checklist(checklist_id: int):
     """
     Complete a checklist
@@ -5,7 +5,9 @@ from app.api.endpoints.checklist.handlers import (
     get_checklists_data,
     get_checklist_details,
     create_checklist,
+    generate_checklists,
     update_checklist_item,
+    update_checklist_items,
     complete_checklist
 )
 
@@ -16,5 +18,7 @@ router.get("/checklist", response_class=HTMLResponse, summary="Checklist Page")(
 router.get("/api/checklists", summary="Get checklists data")(get_checklists_data)
 router.get("/api/checklists/{checklist_id}", summary="Get checklist details")(get_checklist_details)
 router.post("/api/checklists", summary="Create new checklist")(create_checklist)
+router.post("/api/checklists/generate", summary="Create checklists for a date range of orders")(generate_checklists)
+router.put("/api/checklists/{checklist_id}/items", summary="Update many checklist items")(update_checklist_items)
 router.put("/api/checklists/{checklist_id}/items/{item_id}", summary="Update checklist item")(update_checklist_item)
 router.put("/api/checklists/{checklist_id}/complete", summary="Complete checklist")(complete_checklist)
\ No newline at end of file
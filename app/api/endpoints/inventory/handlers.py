@@ -1,6 +1,19 @@
-from fastapi import Request, HTTPException, Form
-from fastapi.responses import HTMLResponse
+from typing import Optional
+from datetime import datetime, date, timedelta
+from fastapi import Request, HTTPException, Form, Query
+from fastapi.responses import HTMLResponse, StreamingResponse
+from app.api.pagination import paginate
 from app.services.inventory import InventoryService
+from app.services.orders import OrdersService
+from app.services.events import inventory_events, event_stream
+from app.services.forecast import ForecastService
+from app.models.schemas.inventory import BatchAvailabilityRequest, BulkStockUpdateRequest
+
+# Longest rolling usage window, in days
+MAX_USAGE_WINDOW = 365
+
+# Longest restock forecast horizon, in days
+MAX_FORECAST_HORIZON = 365
 
 async def inventory_page(request: Request) -> HTMLResponse:
     """
@@ -23,17 +36,19 @@ async def inventory_page(request: Request) -> HTMLResponse:
             detail=f"Error loading inventory page: {str(e)}"
         )
 
-async def get_inventory_data():
+async def get_inventory_data(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """
     Get all inventory data
     """
     try:
         inventory = InventoryService.get_all_materials()
-        return {
-            "success": True,
-            "data": inventory,
-            "total": len(inventory)
-        }
+        return paginate(inventory, limit, cursor, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -61,12 +76,13 @@ async def get_material_details(material_id: int):
             detail=f"Error loading material details: {str(e)}"
         )
 
-async def update_material_stock(material_id: int, new_stock: float = Form(...)):
+async def update_material_stock(material_id: int, new_stock: float = Form(...),
+                                reason: Optional[str] = Form(None)):
     """
     Update material stock
     """
     try:
-        success = InventoryService.update_material_stock(material_id, new_stock)
+        success = InventoryService.update_material_stock(material_id, new_stock, reason)
         if not success:
             raise HTTPException(status_code=404, detail="Material not found")
         
@@ -76,12 +92,60 @@ async def update_material_stock(material_id: int, new_stock: float = Form(...)):
         }
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, 
             detail=f"Error updating material stock: {str(e)}"
         )
 
+async def bulk_update_stock(request_data: BulkStockUpdateRequest):
+    """
+    Update the stock of many materials at once; all updates apply or none do
+    """
+    try:
+        if not request_data.updates:
+            raise HTTPException(status_code=400, detail="No updates provided")
+        
+        materials, errors = InventoryService.bulk_update_stock([
+            (update.material_id, update.new_stock, update.reason)
+            for update in request_data.updates
+        ])
+        if errors:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": "No stock was updated",
+                    "errors": [{"index": index, "error": error} for index, error in errors]
+                }
+            )
+        
+        return {
+            "success": True,
+            "message": f"Stock updated for {len(materials)} materials",
+            "data": materials
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error updating stock: {str(e)}"
+        )
+
+async def stream_inventory_events(request: Request):
+    """
+    Server-Sent Events stream of stock changes
+    """
+    subscription = inventory_events.subscribe()
+    
+    return StreamingResponse(
+        event_stream(inventory_events, subscription, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 async def get_material_usage(material_id: int):
     """
     Get material usage statistics
@@ -101,4 +165,175 @@ async def get_material_usage(material_id: int):
         raise HTTPException(
             status_code=500, 
             detail=f"Error loading material usage: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+async def get_usage_overview(
+    windows: Optional[str] = None,
+    as_of: Optional[date] = None
+):
+    """
+    Get rolling usage statistics for every material
+    """
+    try:
+        try:
+            window_days = ([int(window) for window in windows.split(",") if window.strip()]
+                           if windows else list(InventoryService.USAGE_WINDOWS))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="windows must be a comma separated list of days")
+        if not window_days or any(window < 1 or window > MAX_USAGE_WINDOW for window in window_days):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Each window must be between 1 and {MAX_USAGE_WINDOW} days"
+            )
+        
+        return {
+            "success": True,
+            "data": InventoryService.get_usage_overview(window_days, as_of)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error loading usage overview: {str(e)}"
+        )
+
+async def check_batch_availability(request_data: BatchAvailabilityRequest):
+    """
+    Check stock against the cumulative demand of many orders at once
+    """
+    try:
+        orders = []
+        if request_data.order_ids:
+            for order_id in request_data.order_ids:
+                order = OrdersService.get_order_by_id(order_id)
+                if not order:
+                    raise HTTPException(status_code=404, detail=f"Order {order_id} not found")
+                orders.append(order)
+        if request_data.scheduled_date:
+            day_start = datetime.combine(request_data.scheduled_date, datetime.min.time())
+            orders.extend(
+                order for order in OrdersService.get_orders_in_range(day_start, day_start + timedelta(days=1))
+                if order.status in OrdersService.ACTIVE_STATUSES
+            )
+        if not orders and not request_data.items:
+            raise HTTPException(status_code=400, detail="Provide order_ids, items or scheduled_date")
+        
+        # Orders draw on stock in the sequence they are poured
+        orders.sort(key=lambda order: order.scheduled_time)
+        demands = [({"order_id": order.id}, order.mix_type, order.volume) for order in orders]
+        demands.extend(({"item": index}, item.mix_type, item.volume)
+                       for index, item in enumerate(request_data.items or []))
+        
+        return {
+            "success": True,
+            "data": InventoryService.check_batch_availability(
+                demands, held_by=[order.id for order in orders]
+            )
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error checking availability: {str(e)}"
+        )
+
+async def get_restock_forecast(
+    horizon: int = Query(90, ge=1, le=MAX_FORECAST_HORIZON),
+    history_window: int = Query(30, ge=1, le=MAX_USAGE_WINDOW),
+    include_projection: bool = False
+):
+    """
+    Forecast stock levels and propose restocks grouped by supplier
+    """
+    try:
+        return {
+            "success": True,
+            "data": ForecastService.plan_restocks(horizon, history_window,
+                                                  include_projection=include_projection)
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error forecasting stock: {str(e)}"
+        )
+
+async def get_stock_history(at: datetime):
+    """
+    Get the stock of every material at a past moment
+    """
+    try:
+        materials = InventoryService.get_stock_at(at)
+        if materials is None:
+            raise HTTPException(status_code=404, detail="No stock history recorded for that time")
+        
+        return {
+            "success": True,
+            "data": {
+                "at": at,
+                "materials": materials
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error loading stock history: {str(e)}"
+        )
+
+async def get_reservations():
+    """
+    Get reserved and available stock per material
+    """
+    try:
+        return {
+            "success": True,
+            "data": InventoryService.get_reservations()
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error retrieving reservations: {str(e)}"
+        )
+
+async def get_material_requirements(
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to"),
+    plant: Optional[str] = None
+):
+    """
+    Project material demand of the active orders scheduled in a window
+    """
+    try:
+        from_time = from_time or datetime.now()
+        to_time = to_time or from_time + timedelta(days=7)
+        orders = [order for order in OrdersService.get_orders_in_range(from_time, to_time, plant)
+                  if order.status in OrdersService.ACTIVE_STATUSES]
+        
+        by_plant = InventoryService.calculate_demand(
+            (order.assigned_plant, order.mix_type, order.volume) for order in orders
+        )
+        by_day = InventoryService.calculate_demand(
+            (order.scheduled_time.date().isoformat(), order.mix_type, order.volume) for order in orders
+        )
+        
+        return {
+            "success": True,
+            "data": {
+                "from": from_time,
+                "to": to_time,
+                "orders": len(orders),
+                "materials": by_plant["materials"],
+                "total": by_plant["total"],
+                "by_plant": by_plant["by_group"],
+                "by_day": dict(sorted(by_day["by_group"].items())),
+                "unknown_mixes": by_plant["unknown_mixes"]
+            }
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error calculating material requirements: {str(e)}"
+        )
@@ -5,7 +5,15 @@ from app.api.endpoints.inventory.handlers import (
     get_inventory_data,
     get_material_details,
     update_material_stock,
-    get_material_usage
+    bulk_update_stock,
+    stream_inventory_events,
+    get_material_usage,
+    check_batch_availability,
+    get_material_requirements,
+    get_reservations,
+    get_usage_overview,
+    get_restock_forecast,
+    get_stock_history
 )
 
 router = APIRouter()
@@ -13,6 +21,14 @@ router = APIRouter()
 # Register routes
 router.get("/inventory", response_class=HTMLResponse, summary="Inventory Page")(inventory_page)
 router.get("/api/inventory", summary="Get inventory data")(get_inventory_data)
+router.get("/api/inventory/events", summary="Stream stock changes")(stream_inventory_events)
+router.put("/api/inventory/stock", summary="Update stock of many materials at once")(bulk_update_stock)
+router.post("/api/inventory/availability", summary="Check availability for many orders")(check_batch_availability)
+router.get("/api/inventory/requirements", summary="Project material demand for scheduled orders")(get_material_requirements)
+router.get("/api/inventory/reservations", summary="Get material reservations of active orders")(get_reservations)
+router.get("/api/inventory/usage", summary="Get rolling usage statistics for all materials")(get_usage_overview)
+router.get("/api/inventory/forecast", summary="Forecast stock-outs and plan restocks")(get_restock_forecast)
+router.get("/api/inventory/history", summary="Get stock of all materials at a past moment")(get_stock_history)
 router.get("/api/inventory/{material_id}", summary="Get material details")(get_material_details)
 router.put("/api/inventory/{material_id}/stock", summary="Update material stock")(update_material_stock)
 router.get("/api/inventory/{material_id}/usage", summary="Get material usage")(get_material_usage)
\ No newline at end of file
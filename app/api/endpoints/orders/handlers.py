@@ -1,8 +1,139 @@
-from fastapi import Request, HTTPException, Form
-from fastapi.responses import HTMLResponse
+import csv
+import json
+from collections import deque
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
+from datetime import datetime, timedelta
+from fastapi import Request, HTTPException, Form, Query
+from pydantic import ValidationError
+from fastapi.responses import HTMLResponse, StreamingResponse
+from app.api.pagination import paginate, id_key
 from app.services.orders import OrdersService
+from app.services.checklist import ChecklistService
+from app.services.inventory import InventoryService
+from app.services.events import order_events, event_stream
+from app.services.rollups import RollupService
 from app.models.schemas.orders import CreateOrderRequest
 
+# Rows validated and inserted together during a bulk import
+IMPORT_BATCH_SIZE = 500
+
+# Default and maximum rollup windows per granularity
+ROLLUP_DEFAULT_WINDOW = {"hour": timedelta(hours=24), "day": timedelta(days=30)}
+ROLLUP_MAX_WINDOW = {"hour": timedelta(days=366), "day": timedelta(days=3660)}
+
+def _scheduled_key(order):
+    return (order.scheduled_time.isoformat(timespec="microseconds"), order.id)
+
+async def _iter_lines(request: Request) -> AsyncIterator[str]:
+    """
+    Yield decoded lines from the request body as it streams in
+    """
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8-sig").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8-sig").rstrip("\r")
+
+def _quote_open_after(line: str, open_quote: bool) -> bool:
+    """
+    Whether a quoted field is still open at the end of a CSV line. Follows
+    csv.reader: a quote opens a field only at the start of the field, and a
+    doubled quote inside a quoted field is an escaped quote
+    """
+    field_start = not open_quote
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if open_quote:
+            if char == '"':
+                if line[index + 1:index + 2] == '"':
+                    index += 1
+                else:
+                    open_quote = False
+        elif char == '"' and field_start:
+            open_quote = True
+        field_start = not open_quote and char == ","
+        index += 1
+    return open_quote
+
+class _LineFeed:
+    """
+    Line iterator for a single csv.reader, refilled one complete record at a time
+    """
+
+    def __init__(self):
+        self.lines = deque()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.popleft()
+
+async def _iter_rows(request: Request, is_csv: bool) -> AsyncIterator[Tuple[int, Any, Optional[str]]]:
+    """
+    Yield (row number, parsed row, parse error) from an NDJSON or CSV body
+    """
+    header = None
+    row_number = 0
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    # Lines of a CSV record whose quoted field continues on the next line
+    pending: List[str] = []
+    open_quote = False
+    async for line in _iter_lines(request):
+        if not pending and not line.strip():
+            continue
+        
+        if is_csv:
+            pending.append(line + "\n")
+            open_quote = _quote_open_after(line, open_quote)
+            if open_quote:
+                continue
+            feed.lines.extend(pending)
+            pending = []
+            values = next(reader)
+            if header is None:
+                header = [value.strip() for value in values]
+                continue
+            row_number += 1
+            # Empty cells fall back to the request model defaults
+            yield row_number, {name: value for name, value in zip(header, values) if value != ""}, None
+        else:
+            row_number += 1
+            try:
+                yield row_number, json.loads(line), None
+            except ValueError as e:
+                yield row_number, None, f"Invalid JSON: {str(e)}"
+    
+    if pending:
+        yield row_number + 1, None, "Unterminated quoted field"
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+def _reservation(order_id: int) -> Dict[str, Any]:
+    short = InventoryService.get_shortage(order_id)
+    return {"reserved": not short, "short_materials": short}
+
+def _insert_batch(batch: List[CreateOrderRequest], rows: List[int], order_ids: List[int],
+                  errors: List[Dict[str, Any]], unreserved: List[Dict[str, Any]]) -> None:
+    created, failed = OrdersService.create_orders(batch)
+    order_ids.extend(order.id for order in created)
+    errors.extend({"row": rows[index], "error": message} for index, message in failed)
+    for order in created:
+        short = InventoryService.get_shortage(order.id)
+        if short:
+            unreserved.append({"order_id": order.id, "short_materials": short})
+
 async def orders_page(request: Request) -> HTMLResponse:
     """
     Serve the orders management page
@@ -24,17 +155,37 @@ async def orders_page(request: Request) -> HTMLResponse:
             detail=f"Error loading orders page: {str(e)}"
         )
 
-async def get_orders_data():
+async def get_orders_data(
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to"),
+    plant: Optional[str] = None,
+    status: Optional[str] = None,
+    ready: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """
-    Get all orders data
+    Get orders data, optionally within a scheduled time window.
+    With `ready`, only active orders that are (or are not) ready to pour
     """
     try:
-        orders = OrdersService.get_all_orders()
-        return {
-            "success": True,
-            "data": orders,
-            "total": len(orders)
-        }
+        if ready is not None and not (from_time or to_time or status):
+            # Only active orders can be ready to pour: read just their status indexes
+            orders = sorted((order for active in OrdersService.ACTIVE_STATUSES
+                             for order in OrdersService.get_orders_in_range(plant=plant, status=active)),
+                            key=lambda order: order.id)
+        else:
+            orders = OrdersService.get_orders_in_range(from_time, to_time, plant, status)
+        if ready is not None:
+            orders = [order for order in orders
+                      if order.status in OrdersService.ACTIVE_STATUSES
+                      and ChecklistService.is_ready_to_pour(order.id) == ready]
+        # Time windows come back sorted by scheduled time, everything else by id
+        key = _scheduled_key if from_time or to_time else id_key
+        return paginate(orders, limit, cursor, fields, key)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -52,7 +203,8 @@ async def get_order_details(order_id: int):
         
         return {
             "success": True,
-            "data": order
+            "data": order,
+            "checklists": ChecklistService.get_order_readiness(order_id)
         }
     except HTTPException:
         raise
@@ -68,11 +220,18 @@ async def create_order(order_data: CreateOrderRequest):
     """
     try:
         order = OrdersService.create_order(order_data)
+        reservation = _reservation(order.id)
+        message = "Order created successfully"
+        if not reservation["reserved"]:
+            message = f"Order created, but materials are short: {', '.join(reservation['short_materials'])}"
         return {
             "success": True,
-            "message": "Order created successfully",
-            "data": order
+            "message": message,
+            "data": order,
+            "reservation": reservation
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -98,4 +257,95 @@ async def update_order_status(order_id: int, status: str = Form(...)):
         raise HTTPException(
             status_code=500, 
             detail=f"Error updating order status: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+async def import_orders(request: Request):
+    """
+    Bulk import orders from a streamed NDJSON or CSV body
+    """
+    try:
+        is_csv = "csv" in request.headers.get("content-type", "")
+        order_ids: List[int] = []
+        errors: List[Dict[str, Any]] = []
+        batch: List[CreateOrderRequest] = []
+        batch_rows: List[int] = []
+        unreserved: List[Dict[str, Any]] = []
+        
+        async for row_number, row, error in _iter_rows(request, is_csv):
+            if error is None:
+                try:
+                    batch.append(CreateOrderRequest.model_validate(row))
+                    batch_rows.append(row_number)
+                except ValidationError as e:
+                    error = _format_validation_error(e)
+            if error:
+                errors.append({"row": row_number, "error": error})
+            
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                _insert_batch(batch, batch_rows, order_ids, errors, unreserved)
+                batch, batch_rows = [], []
+        
+        if batch:
+            _insert_batch(batch, batch_rows, order_ids, errors, unreserved)
+        
+        errors.sort(key=lambda e: e["row"])
+        return {
+            "success": True,
+            "message": f"Imported {len(order_ids)} orders, {len(errors)} rows rejected",
+            "data": {
+                "created": len(order_ids),
+                "failed": len(errors),
+                "order_ids": order_ids,
+                "errors": errors,
+                # Created orders whose materials could not be reserved
+                "unreserved": unreserved
+            }
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error importing orders: {str(e)}"
+        )
+
+async def stream_order_events(request: Request):
+    """
+    Server-Sent Events stream of order changes
+    """
+    subscription = order_events.subscribe()
+    
+    return StreamingResponse(
+        event_stream(order_events, subscription, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def get_order_rollups(
+    granularity: str = "day",
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to"),
+    plant: Optional[str] = None,
+    mix_type: Optional[str] = None
+):
+    """
+    Get scheduled and completed volume per plant and mix, bucketed by hour or day
+    """
+    try:
+        if granularity not in ROLLUP_DEFAULT_WINDOW:
+            raise HTTPException(status_code=400, detail="Granularity must be 'hour' or 'day'")
+        
+        to_time = to_time or datetime.now()
+        from_time = from_time or to_time - ROLLUP_DEFAULT_WINDOW[granularity]
+        if to_time - from_time > ROLLUP_MAX_WINDOW[granularity]:
+            raise HTTPException(status_code=400, detail=f"Window too large for granularity '{granularity}'")
+        
+        return {
+            "success": True,
+            "data": RollupService.get_rollups(granularity, from_time, to_time, plant, mix_type)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error loading order rollups: {str(e)}"
+        )
@@ -5,6 +5,9 @@ from app.api.endpoints.orders.handlers import (
     get_orders_data,
     get_order_details,
     create_order,
+    import_orders,
+    stream_order_events,
+    get_order_rollups,
     update_order_status
 )
 
@@ -13,6 +16,9 @@ router = APIRouter()
 # Register routes
 router.get("/orders", response_class=HTMLResponse, summary="Orders Page")(orders_page)
 router.get("/api/orders", summary="Get orders data")(get_orders_data)
+router.get("/api/orders/events", summary="Stream order changes (SSE)")(stream_order_events)
+router.get("/api/orders/rollups", summary="Get volume rollups by plant and mix")(get_order_rollups)
 router.get("/api/orders/{order_id}", summary="Get order details")(get_order_details)
 router.post("/api/orders", summary="Create new order")(create_order)
+router.post("/api/orders/import", summary="Bulk import orders (NDJSON or CSV)")(import_orders)
 router.put("/api/orders/{order_id}/status", summary="Update order status")(update_order_status)
\ No newline at end of file
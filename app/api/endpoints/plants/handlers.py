@@ -1,6 +1,14 @@
-from fastapi import Request, HTTPException
+from typing import Optional
+from datetime import datetime, timedelta
+from fastapi import Request, HTTPException, Form, Query
 from fastapi.responses import HTMLResponse
+from app.api.pagination import paginate
 from app.services.plants import PlantsService
+from app.services.dispatch import DispatchService
+from app.services.fleet import FleetService
+
+# Longest window served by the plant load timeline and searched for suggestions
+MAX_LOAD_WINDOW = timedelta(days=31)
 
 async def plants_page(request: Request) -> HTMLResponse:
     """
@@ -23,17 +31,19 @@ async def plants_page(request: Request) -> HTMLResponse:
             detail=f"Error loading plants page: {str(e)}"
         )
 
-async def get_plants_data():
+async def get_plants_data(
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
     """
     Get all plants data
     """
     try:
         plants = PlantsService.get_all_plants()
-        return {
-            "success": True,
-            "data": plants,
-            "total": len(plants)
-        }
+        return paginate(plants, limit, cursor, fields)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -51,7 +61,11 @@ async def get_plant_details(plant_id: int):
         
         return {
             "success": True,
-            "data": plant
+            "data": plant,
+            "fleet": {
+                "available": FleetService.count_available(plant.name),
+                "trucks": FleetService.get_all_trucks(plant.name)
+            }
         }
     except HTTPException:
         raise
@@ -59,4 +73,119 @@ async def get_plant_details(plant_id: int):
         raise HTTPException(
             status_code=500, 
             detail=f"Error loading plant details: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+async def get_plant_load(
+    plant_id: int,
+    from_time: Optional[datetime] = Query(None, alias="from"),
+    to_time: Optional[datetime] = Query(None, alias="to")
+):
+    """
+    Get the hourly load timeline of a plant
+    """
+    try:
+        plant = PlantsService.get_plant_by_id(plant_id)
+        if not plant:
+            raise HTTPException(status_code=404, detail="Plant not found")
+        start, end = DispatchService.load_window(from_time, to_time)
+        if end <= start:
+            raise HTTPException(status_code=400, detail="'to' must be after 'from'")
+        if end - start > MAX_LOAD_WINDOW:
+            raise HTTPException(status_code=400, detail="Load window cannot exceed 31 days")
+        
+        return {
+            "success": True,
+            "data": DispatchService.get_plant_load(plant, start, end)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error loading plant load: {str(e)}"
+        )
+
+async def suggest_plant_assignment(
+    mix_type: str,
+    volume: float = Query(..., gt=0),
+    estimated_duration: float = Query(..., ge=0),
+    earliest: Optional[datetime] = None,
+    latest: Optional[datetime] = None,
+    limit: int = Query(5, ge=1, le=50)
+):
+    """
+    Suggest plants and start times that can take a new order
+    """
+    try:
+        first_slot, last_slot = DispatchService.suggestion_window(earliest, latest)
+        if last_slot < first_slot:
+            raise HTTPException(status_code=400, detail="'latest' must not be before 'earliest'")
+        if last_slot - first_slot > MAX_LOAD_WINDOW:
+            raise HTTPException(status_code=400, detail="Suggestion window cannot exceed 31 days")
+        
+        suggestions = DispatchService.suggest_assignment(
+            mix_type, volume, estimated_duration, first_slot, last_slot, limit
+        )
+        return {
+            "success": True,
+            "data": suggestions,
+            "total": len(suggestions)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error suggesting plant assignment: {str(e)}"
+        )
+
+async def get_trucks_data(
+    plant: Optional[str] = None,
+    state: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Get the truck fleet, optionally by home plant and state
+    """
+    try:
+        trucks = FleetService.get_all_trucks(plant, state)
+        result = paginate(trucks, limit, cursor, fields)
+        result["summary"] = FleetService.get_fleet_summary(
+            [plant.name for plant in PlantsService.get_all_plants()]
+        )
+        return result
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error loading trucks data: {str(e)}"
+        )
+
+async def update_truck_state(truck_id: int, state: str = Form(...)):
+    """
+    Put an idle truck in or out of maintenance
+    """
+    try:
+        truck, error = FleetService.set_truck_state(truck_id, state)
+        if error and truck is None:
+            raise HTTPException(status_code=400, detail=error)
+        if truck is None:
+            raise HTTPException(status_code=404, detail="Truck not found")
+        if error:
+            raise HTTPException(status_code=409, detail=error)
+        
+        return {
+            "success": True,
+            "message": f"Truck state updated to {state}",
+            "data": truck
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Error updating truck state: {str(e)}"
+        )
@@ -3,7 +3,11 @@ from fastapi.responses import HTMLResponse
 from app.api.endpoints.plants.handlers import (
     plants_page,
     get_plants_data,
-    get_plant_details
+    get_plant_details,
+    get_plant_load,
+    suggest_plant_assignment,
+    get_trucks_data,
+    update_truck_state
 )
 
 router = APIRouter()
@@ -11,4 +15,8 @@ router = APIRouter()
 # Register routes
 router.get("/plants", response_class=HTMLResponse, summary="Plants Page")(plants_page)
 router.get("/api/plants", summary="Get plants data")(get_plants_data)
-router.get("/api/plants/{plant_id}", summary="Get plant details")(get_plant_details)
\ No newline at end of file
+router.get("/api/plants/assignment-suggestions", summary="Suggest plant and slot for a new order")(suggest_plant_assignment)
+router.get("/api/plants/trucks", summary="Get truck fleet")(get_trucks_data)
+router.put("/api/plants/trucks/{truck_id}/state", summary="Update truck state")(update_truck_state)
+router.get("/api/plants/{plant_id}", summary="Get plant details")(get_plant_details)
+router.get("/api/plants/{plant_id}/load", summary="Get plant load timeline")(get_plant_load)
\ No newline at end of file
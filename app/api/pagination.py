@@ -0,0 +1,96 @@
+import base64
+import json
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+from fastapi import HTTPException
+
+def id_key(item: Any) -> Tuple:
+    """
+    Default keyset: collections kept in ascending id order
+    """
+    return (item.id,)
+
+def encode_cursor(key: Tuple) -> str:
+    """
+    Encode a sort key as an opaque URL-safe cursor
+    """
+    raw = json.dumps(list(key), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple:
+    """
+    Decode a cursor produced by encode_cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return tuple(json.loads(base64.urlsafe_b64decode(padded)))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Turn "id,status,items.completed" into a pydantic include mapping
+    """
+    if not fields:
+        return None
+
+    include: Dict[str, Any] = {}
+    for field in fields.split(","):
+        field = field.strip()
+        if not field:
+            continue
+        name, _, nested = field.partition(".")
+        if nested:
+            # Nested fields apply to every element of a list attribute
+            current = include.get(name)
+            if current is True:
+                continue
+            if current is None:
+                current = include[name] = {"__all__": {}}
+            current["__all__"][nested] = True
+        else:
+            include[name] = True
+    return include
+
+def _seek(items: Sequence, target: Tuple, key: Callable[[Any], Tuple]) -> int:
+    """
+    Index of the first item whose key is greater than target
+    """
+    low, high = 0, len(items)
+    while low < high:
+        middle = (low + high) // 2
+        if key(items[middle]) <= target:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+def paginate(
+    items: Sequence,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    key: Callable[[Any], Tuple] = id_key
+) -> Dict[str, Any]:
+    """
+    Keyset-paginate a collection already sorted by key and project its fields
+    """
+    start = 0
+    if cursor:
+        try:
+            start = _seek(items, decode_cursor(cursor), key)
+        except TypeError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    end = start + limit if limit else len(items)
+    page = items[start:end]
+    next_cursor = encode_cursor(key(page[-1])) if page and end < len(items) else None
+
+    include = parse_fields(fields)
+    data = [item.model_dump(include=include) for item in page] if include else page
+
+    return {
+        "success": True,
+        "data": data,
+        "total": len(items),
+        "next_cursor": next_cursor
+    }
@@ -36,6 +36,21 @@ class CreateChecklistRequest(BaseModel):
     scheduled_time: datetime
     categories: List[str]
 
+class ChecklistItemChange(BaseModel):
+    item_id: int
+    completed: bool
+    notes: Optional[str] = None
+    client_timestamp: datetime
+
+class BatchItemUpdateRequest(BaseModel):
+    changes: List[ChecklistItemChange]
+
+class GenerateChecklistsRequest(BaseModel):
+    date_from: date
+    date_to: Optional[date] = None  # inclusive; defaults to date_from
+    categories: Optional[List[str]] = None  # defaults to every category
+    supervisor: Optional[str] = None  # defaults to each order's client
+
 class ChecklistSummary(BaseModel):
     total_checklists: int
     todays_checklists: int
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Optional, Dict
+from datetime import datetime
+
+class Truck(BaseModel):
+    id: int
+    plate: str
+    home_plant: str  # same form as ConcreteOrder.assigned_plant, e.g. "PLANTA 1"
+    capacity: float  # m³ per trip
+    state: str  # available, loading, delivering, maintenance
+    order_id: Optional[int] = None
+    updated_at: Optional[datetime] = None
+
+class FleetSummary(BaseModel):
+    total_trucks: int
+    available: int
+    active: int
+    maintenance: int
+    available_by_plant: Dict[str, int]
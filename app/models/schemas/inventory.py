@@ -45,6 +45,23 @@ class MaterialRequirements(BaseModel):
     volume: float
     requirements: Dict[str, float]
 
+class MixDemand(BaseModel):
+    mix_type: str
+    volume: float
+
+class BatchAvailabilityRequest(BaseModel):
+    order_ids: Optional[List[int]] = None
+    items: Optional[List[MixDemand]] = None
+    scheduled_date: Optional[date] = None  # every active order scheduled that day
+
+class StockUpdate(BaseModel):
+    material_id: int
+    new_stock: float
+    reason: Optional[str] = None
+
+class BulkStockUpdateRequest(BaseModel):
+    updates: List[StockUpdate]
+
 class AvailabilityCheck(BaseModel):
     available: bool
     missing_materials: List[Dict[str, Any]]
@@ -30,4 +30,5 @@ class PlantSummary(BaseModel):
     active_plants: int
     total_capacity: float
     available_trucks: int
+    active_trucks: int
     maintenance_plants: int
\ No newline at end of file
@@ -0,0 +1,158 @@
+import gzip
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from app.models.schemas.checklist import ConcreteChecklist
+
+BUCKET_PREFIX = "checklists-"
+TOTALS_FILE = "totals.json"
+
+class ChecklistArchive:
+    """
+    Cold storage for finished checklists as gzip-compressed JSON buckets.
+
+    Checklist ids are grouped `bucket_size` to a file, so a lookup by id
+    opens a single bucket and an archiving pass rewrites only the buckets
+    it touches. Running item totals and the highest archived id are kept
+    in a small side file so summaries never have to open the buckets. The
+    side file is marked pending while buckets are written; a crash midway
+    leaves the mark, and the totals are recounted from the buckets on open.
+    """
+
+    def __init__(self, directory: str, bucket_size: int = 1000, cached_buckets: int = 4):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.bucket_size = bucket_size
+        self.cached_buckets = cached_buckets
+
+        self._lock = threading.RLock()
+        # bucket number -> checklist id -> JSON document, most recently used last
+        self._cache: "OrderedDict[int, Dict[str, str]]" = OrderedDict()
+        self._totals = {"checklists": 0, "total_items": 0, "completed_items": 0, "max_id": 0}
+
+        path = self._path(TOTALS_FILE)
+        stored = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                stored = json.load(handle)
+        if stored is not None and not stored.get("pending") and set(self._totals) <= set(stored):
+            self._totals.update((key, stored[key]) for key in self._totals)
+        elif stored is not None or self._bucket_numbers():
+            self._recount()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _bucket_file(self, bucket: int) -> str:
+        return self._path(f"{BUCKET_PREFIX}{bucket:08d}.json.gz")
+
+    def _bucket_numbers(self) -> List[int]:
+        return sorted(int(filename[len(BUCKET_PREFIX):-len(".json.gz")])
+                      for filename in os.listdir(self.directory)
+                      if filename.startswith(BUCKET_PREFIX) and filename.endswith(".json.gz"))
+
+    def _count(self, checklists: Iterable[ConcreteChecklist]) -> None:
+        for checklist in checklists:
+            self._totals["checklists"] += 1
+            self._totals["total_items"] += len(checklist.items)
+            self._totals["completed_items"] += sum(1 for item in checklist.items if item.completed)
+            self._totals["max_id"] = max(self._totals["max_id"], checklist.id)
+
+    def _recount(self) -> None:
+        """
+        Rebuild the totals by reading every bucket, then store them
+        """
+        self._totals = dict.fromkeys(self._totals, 0)
+        for bucket in self._bucket_numbers():
+            with gzip.open(self._bucket_file(bucket), "rt", encoding="utf-8") as handle:
+                documents = json.load(handle)
+            self._count(ConcreteChecklist.model_validate_json(document) for document in documents.values())
+        self._write(self._path(TOTALS_FILE), self._totals, compress=False)
+
+    def _read_bucket(self, bucket: int) -> Dict[str, str]:
+        documents = self._cache.get(bucket)
+        if documents is not None:
+            self._cache.move_to_end(bucket)
+            return documents
+
+        path = self._bucket_file(bucket)
+        documents = {}
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                documents = json.load(handle)
+
+        self._cache[bucket] = documents
+        if len(self._cache) > self.cached_buckets:
+            self._cache.popitem(last=False)
+        return documents
+
+    def _write(self, path: str, payload: dict, compress: bool) -> None:
+        temporary = path + ".tmp"
+        opener = gzip.open if compress else open
+        with opener(temporary, "wt", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        with open(temporary, "rb") as handle:
+            os.fsync(handle.fileno())
+        # Atomic rename: a crash leaves either the old or the new file
+        os.replace(temporary, path)
+
+    @property
+    def totals(self) -> Dict[str, int]:
+        """
+        Checklist and item counts of everything archived
+        """
+        with self._lock:
+            return {key: value for key, value in self._totals.items() if key != "max_id"}
+
+    @property
+    def max_id(self) -> int:
+        """
+        Highest checklist id ever archived, so ids are not handed out again
+        """
+        with self._lock:
+            return self._totals["max_id"]
+
+    def get(self, checklist_id: int) -> Optional[ConcreteChecklist]:
+        """
+        Load an archived checklist by id
+        """
+        with self._lock:
+            document = self._read_bucket(checklist_id // self.bucket_size).get(str(checklist_id))
+        return ConcreteChecklist.model_validate_json(document) if document else None
+
+    def put_many(self, checklists: Iterable[ConcreteChecklist]) -> List[ConcreteChecklist]:
+        """
+        Durably write checklists to their buckets and return the ones that
+        were not archived before, so a retried pass does not count twice
+        """
+        with self._lock:
+            by_bucket: Dict[int, List[ConcreteChecklist]] = {}
+            for checklist in checklists:
+                by_bucket.setdefault(checklist.id // self.bucket_size, []).append(checklist)
+
+            added = []
+            updated: Dict[int, Dict[str, str]] = {}
+            for bucket, members in sorted(by_bucket.items()):
+                documents = updated[bucket] = dict(self._read_bucket(bucket))
+                for checklist in members:
+                    key = str(checklist.id)
+                    if key not in documents:
+                        added.append(checklist)
+                    documents[key] = checklist.model_dump_json()
+
+            if added:
+                # Until the new totals land, a crash is recovered by recounting
+                self._write(self._path(TOTALS_FILE), {**self._totals, "pending": True}, compress=False)
+            for bucket, documents in updated.items():
+                self._write(self._bucket_file(bucket), documents, compress=True)
+                self._cache[bucket] = documents
+                self._cache.move_to_end(bucket)
+            while len(self._cache) > self.cached_buckets:
+                self._cache.popitem(last=False)
+
+            if added:
+                self._count(added)
+                self._write(self._path(TOTALS_FILE), self._totals, compress=False)
+            return added
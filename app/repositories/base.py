@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+from pydantic import BaseModel
+
+class EntitySpec:
+    """
+    Describes how an entity collection is stored: model, table and indexed columns
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: Type[BaseModel],
+        columns: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        unique: Iterable[str] = ()
+    ):
+        self.name = name
+        self.model = model
+        # Column name -> extractor; every column gets an index
+        self.columns = columns or {}
+        self.unique = set(unique)
+
+class Repository(ABC):
+    """
+    Persistence interface shared by every storage backend
+    """
+
+    def __init__(self, spec: EntitySpec):
+        self.spec = spec
+
+    @abstractmethod
+    def load_all(self) -> List[BaseModel]:
+        """
+        Load every stored entity ordered by id
+        """
+
+    @abstractmethod
+    def get(self, entity_id: int) -> Optional[BaseModel]:
+        """
+        Load a single entity by id
+        """
+
+    @abstractmethod
+    def save(self, entity: BaseModel) -> None:
+        """
+        Insert or update an entity
+        """
+
+    @abstractmethod
+    def save_many(self, entities: Iterable[BaseModel]) -> None:
+        """
+        Insert or update several entities in one transaction
+        """
+
+    @abstractmethod
+    def delete(self, entity_id: int) -> bool:
+        """
+        Remove an entity by id
+        """
+
+    @abstractmethod
+    def delete_many(self, entity_ids: Iterable[int]) -> None:
+        """
+        Remove several entities by id in one transaction
+        """
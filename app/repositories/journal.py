@@ -0,0 +1,281 @@
+import json
+import os
+import threading
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SNAPSHOT_PREFIX = "snapshot-"
+SEGMENT_PREFIX = "journal-"
+
+class StockJournal:
+    """
+    Append-only log of stock movements stored as JSON-lines segments.
+
+    Each entry records a material's absolute stock after the movement.
+    Entries are buffered and written in batches with one fsync per batch.
+    Every `snapshot_every` entries the full stock state is written to a
+    snapshot file and a new segment starts. Recovery therefore reads only
+    the latest snapshot and the segment after it. Older snapshots and
+    segments are kept so stock can be reconstructed at any past time.
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 0.2, snapshot_every: int = 1000):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+
+        # Guards the pending buffer and sequence numbers
+        self._lock = threading.Lock()
+        # Serialises file writes, snapshots and history reads
+        self._io_lock = threading.RLock()
+        self._pending: List[Dict[str, Any]] = []
+        self._wake = threading.Event()
+        self._closed = False
+
+        # (seq, timestamp, filename) of every snapshot, oldest first
+        self._snapshots: List[Tuple[int, str, str]] = []
+        # (first seq, filename) of every segment, oldest first
+        self._segments: List[Tuple[int, str]] = []
+        self._state: Dict[int, float] = {}
+        self._seq = 0
+        self._flushed_seq = 0
+        self._since_snapshot = 0
+        self._segment = None
+        # (segment filename, offset) to cut back to after a failed write
+        self._torn: Optional[Tuple[str, int]] = None
+
+        self._recover()
+        self._flusher = threading.Thread(target=self._run, name="stock-journal", daemon=True)
+        self._flusher.start()
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _recover(self) -> None:
+        for filename in sorted(os.listdir(self.directory)):
+            if filename.startswith(SNAPSHOT_PREFIX) and filename.endswith(".json"):
+                with open(self._path(filename), encoding="utf-8") as handle:
+                    snapshot = json.load(handle)
+                self._snapshots.append((snapshot["seq"], snapshot["ts"], filename))
+            elif filename.startswith(SEGMENT_PREFIX) and filename.endswith(".log"):
+                self._segments.append((int(filename[len(SEGMENT_PREFIX):-4]), filename))
+        self._snapshots.sort()
+        self._segments.sort()
+
+        if self._snapshots:
+            seq, _, filename = self._snapshots[-1]
+            with open(self._path(filename), encoding="utf-8") as handle:
+                snapshot = json.load(handle)
+            self._state = {int(material_id): stock for material_id, stock in snapshot["stock"].items()}
+            self._seq = seq
+
+        # Only the tail written after the latest snapshot needs replaying
+        for entry in self._read_entries(after=self._seq, repair=True):
+            self._state[entry["material_id"]] = entry["stock"]
+            self._seq = entry["seq"]
+            self._since_snapshot += 1
+        self._flushed_seq = self._seq
+
+        if self._segments and self._segments[-1][0] > (self._snapshots[-1][0] if self._snapshots else 0):
+            self._segment = open(self._path(self._segments[-1][1]), "a", encoding="utf-8")
+
+    def _read_entries(self, after: int, repair: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Entries with seq > after, in order. With repair, a torn final line
+        left by a crash is cut off so appends resume on a clean boundary
+        """
+        firsts = [first for first, _ in self._segments]
+        start = max(bisect_right(firsts, after + 1) - 1, 0)
+        for first, filename in self._segments[start:]:
+            path = self._path(filename)
+            with open(path, "rb") as handle:
+                offset = 0
+                for line in handle:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        if repair:
+                            with open(path, "r+b") as damaged:
+                                damaged.truncate(offset)
+                        break
+                    offset += len(line)
+                    if entry["seq"] > after:
+                        yield entry
+
+    @property
+    def state(self) -> Dict[int, float]:
+        """
+        Stock per material id as of the last flushed entry
+        """
+        with self._io_lock:
+            return dict(self._state)
+
+    @property
+    def has_history(self) -> bool:
+        return bool(self._snapshots or self._segments)
+
+    def append(self, material_id: int, stock: float, previous: Optional[float] = None,
+               reason: Optional[str] = None, event: str = "stock_updated") -> int:
+        """
+        Queue a movement for the next batched write and return its sequence number
+        """
+        with self._lock:
+            self._seq += 1
+            self._pending.append({
+                "seq": self._seq,
+                "ts": datetime.now().isoformat(),
+                "material_id": material_id,
+                "stock": stock,
+                "previous": previous,
+                "reason": reason,
+                "event": event
+            })
+            if len(self._pending) >= self.snapshot_every:
+                self._wake.set()
+            return self._seq
+
+    def flush(self) -> None:
+        """
+        Write every pending entry with a single fsync, snapshotting when due
+        """
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+
+            offset = None
+            try:
+                if self._torn is not None:
+                    self._repair_segment()
+                if self._segment is None:
+                    self._start_segment(batch[0]["seq"])
+                offset = self._segment.tell()
+                self._segment.write("".join(json.dumps(entry) + "\n" for entry in batch))
+                self._segment.flush()
+                os.fsync(self._segment.fileno())
+            except OSError:
+                if offset is not None:
+                    # Part of the batch may have reached the file; cut it off before retrying
+                    self._drop_segment(offset)
+                # Keep the batch for the next attempt
+                with self._lock:
+                    self._pending = batch + self._pending
+                raise
+
+            for entry in batch:
+                self._state[entry["material_id"]] = entry["stock"]
+            self._flushed_seq = batch[-1]["seq"]
+            self._since_snapshot += len(batch)
+            if self._since_snapshot >= self.snapshot_every:
+                self._snapshot(batch[-1]["ts"])
+
+    def _start_segment(self, first_seq: int) -> None:
+        filename = f"{SEGMENT_PREFIX}{first_seq:012d}.log"
+        self._segment = open(self._path(filename), "a", encoding="utf-8")
+        self._segments.append((first_seq, filename))
+
+    def _drop_segment(self, offset: int) -> None:
+        """
+        Abandon the segment handle after a failed write and remember where
+        its last complete entry ends
+        """
+        try:
+            self._segment.close()
+        except OSError:
+            pass
+        self._segment = None
+        self._torn = (self._segments[-1][1], offset)
+
+    def _repair_segment(self) -> None:
+        """
+        Truncate a torn segment back to its last complete entry and reopen it for appends
+        """
+        filename, offset = self._torn
+        path = self._path(filename)
+        os.truncate(path, offset)
+        self._segment = open(path, "a", encoding="utf-8")
+        self._torn = None
+
+    def snapshot(self) -> None:
+        """
+        Flush, then persist the full state and start a new segment
+        """
+        with self._io_lock:
+            self.flush()
+            self._snapshot(datetime.now().isoformat())
+
+    def _snapshot(self, timestamp: str) -> None:
+        seq = self._flushed_seq
+        filename = f"{SNAPSHOT_PREFIX}{seq:012d}.json"
+        temporary = self._path(filename + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump({"seq": seq, "ts": timestamp, "stock": self._state}, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        # Atomic rename: a crash leaves either the old or the new snapshot
+        os.replace(temporary, self._path(filename))
+
+        if not self._snapshots or self._snapshots[-1][0] != seq:
+            self._snapshots.append((seq, timestamp, filename))
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        self._since_snapshot = 0
+
+    def initialize(self, stock: Dict[int, float]) -> None:
+        """
+        Record the baseline stock of a journal with no history yet
+        """
+        with self._io_lock:
+            if self.has_history:
+                return
+            self._state = dict(stock)
+            self._snapshot(datetime.now().isoformat())
+
+    def state_at(self, moment: datetime) -> Optional[Dict[int, float]]:
+        """
+        Stock per material id as it was at `moment`: the closest earlier
+        snapshot plus the entries written after it, up to that time.
+        None when the journal starts after `moment`
+        """
+        self.flush()
+        target = moment.isoformat()
+        with self._io_lock:
+            times = [timestamp for _, timestamp, _ in self._snapshots]
+            position = bisect_right(times, target) - 1
+            if position < 0:
+                return None
+            seq, _, filename = self._snapshots[position]
+            with open(self._path(filename), encoding="utf-8") as handle:
+                state = {int(material_id): stock for material_id, stock in json.load(handle)["stock"].items()}
+
+            for entry in self._read_entries(after=seq):
+                if entry["ts"] > target:
+                    break
+                state[entry["material_id"]] = entry["stock"]
+            return state
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"⚠️  Stock journal flush failed: {e}")
+
+    def close(self) -> None:
+        """
+        Stop the background writer and flush what is left
+        """
+        self._closed = True
+        self._wake.set()
+        self._flusher.join()
+        self.flush()
+        with self._io_lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
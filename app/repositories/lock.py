@@ -0,0 +1,55 @@
+import os
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class InstanceLock:
+    """
+    Exclusive lock on a file held for the life of the process, so only one
+    server process at a time works on the same data directory
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._handle: Optional[object] = None
+
+    def acquire(self) -> None:
+        """
+        Take the lock or raise RuntimeError when another process holds it
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handle = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            handle.close()
+            raise RuntimeError(
+                f"{self.path} is locked by another process. Each process keeps its own "
+                f"in-memory state, so run a single worker per data directory"
+            )
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        self._handle = handle
+
+    def release(self) -> None:
+        if self._handle is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+        else:
+            self._handle.seek(0)
+            msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+        self._handle.close()
+        self._handle = None
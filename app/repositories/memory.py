@@ -0,0 +1,32 @@
+from typing import Dict, Iterable, List, Optional
+from pydantic import BaseModel
+from app.repositories.base import EntitySpec, Repository
+
+class MemoryRepository(Repository):
+    """
+    In-memory repository, used for tests and as the default before startup
+    """
+
+    def __init__(self, spec: EntitySpec):
+        super().__init__(spec)
+        self._entities: Dict[int, BaseModel] = {}
+
+    def load_all(self) -> List[BaseModel]:
+        return [self._entities[entity_id] for entity_id in sorted(self._entities)]
+
+    def get(self, entity_id: int) -> Optional[BaseModel]:
+        return self._entities.get(entity_id)
+
+    def save(self, entity: BaseModel) -> None:
+        self._entities[entity.id] = entity
+
+    def save_many(self, entities: Iterable[BaseModel]) -> None:
+        for entity in entities:
+            self._entities[entity.id] = entity
+
+    def delete(self, entity_id: int) -> bool:
+        return self._entities.pop(entity_id, None) is not None
+
+    def delete_many(self, entity_ids: Iterable[int]) -> None:
+        for entity_id in entity_ids:
+            self._entities.pop(entity_id, None)
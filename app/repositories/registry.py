@@ -0,0 +1,90 @@
+from operator import attrgetter
+from typing import Dict, Optional
+from app.models.schemas.auth import User
+from app.models.schemas.checklist import ConcreteChecklist
+from app.models.schemas.fleet import Truck
+from app.models.schemas.inventory import Material
+from app.models.schemas.orders import ConcreteOrder
+from app.models.schemas.plants import ConcretePlant
+from app.repositories.base import EntitySpec, Repository
+from app.repositories.memory import MemoryRepository
+from app.repositories.sqlite import ConnectionPool, SQLiteIdSequences, SQLiteRepository
+
+# Persisted entity collections and the columns indexed for each
+ENTITIES: Dict[str, EntitySpec] = {
+    "orders": EntitySpec("orders", ConcreteOrder, {
+        "status": attrgetter("status"),
+        "assigned_plant": attrgetter("assigned_plant"),
+        "scheduled_time": lambda order: order.scheduled_time.isoformat(),
+    }),
+    "checklists": EntitySpec("checklists", ConcreteChecklist, {
+        "order_id": attrgetter("order_id"),
+        "status": attrgetter("status"),
+    }),
+    "materials": EntitySpec("materials", Material, {
+        "name": attrgetter("name"),
+        "status": attrgetter("status"),
+    }, unique=["name"]),
+    "plants": EntitySpec("plants", ConcretePlant, {
+        "status": attrgetter("status"),
+    }),
+    "trucks": EntitySpec("trucks", Truck, {
+        "home_plant": attrgetter("home_plant"),
+        "state": attrgetter("state"),
+    }),
+    "users": EntitySpec("users", User, {
+        "email": attrgetter("email"),
+    }, unique=["email"]),
+}
+
+BACKENDS = ("memory", "sqlite")
+
+_repositories: Dict[str, Repository] = {}
+_pool: Optional[ConnectionPool] = None
+_sequences: Optional[SQLiteIdSequences] = None
+
+def init_repositories(backend: str = "memory", path: str = "", pool_size: int = 4) -> None:
+    """
+    Create one repository per entity on the selected backend
+    """
+    global _pool, _sequences
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    close_repositories()
+    if backend == "sqlite":
+        _pool = ConnectionPool(path, pool_size)
+        _sequences = SQLiteIdSequences(_pool)
+        for name, spec in ENTITIES.items():
+            _repositories[name] = SQLiteRepository(spec, _pool)
+    else:
+        for name, spec in ENTITIES.items():
+            _repositories[name] = MemoryRepository(spec)
+
+def get_repository(name: str) -> Repository:
+    """
+    Get the repository for an entity, defaulting to memory before startup
+    """
+    repository = _repositories.get(name)
+    if repository is None:
+        repository = _repositories[name] = MemoryRepository(ENTITIES[name])
+    return repository
+
+def get_id_sequences() -> Optional[SQLiteIdSequences]:
+    """
+    Database-backed id sequences shared by every process, None on the memory backend
+    """
+    return _sequences
+
+def close_repositories() -> None:
+    """
+    Release backend resources and forget the current repositories
+    """
+    global _pool, _sequences
+
+    _repositories.clear()
+    _sequences = None
+    if _pool is not None:
+        _pool.close()
+        _pool = None
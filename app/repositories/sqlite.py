@@ -0,0 +1,157 @@
+import os
+import queue
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+from pydantic import BaseModel
+from app.repositories.base import EntitySpec, Repository
+
+class ConnectionPool:
+    """
+    Small fixed-size pool of SQLite connections in WAL mode
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._connections: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._all: List[sqlite3.Connection] = []
+        for _ in range(size):
+            connection = self._connect()
+            self._all.append(connection)
+            self._connections.put(connection)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Statements are parameterised constants, so the per-connection
+        # statement cache keeps them prepared across calls
+        connection = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("PRAGMA busy_timeout=5000")
+        return connection
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for the duration of the block
+        """
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self) -> None:
+        for connection in self._all:
+            connection.close()
+        self._all.clear()
+
+class SQLiteIdSequences:
+    """
+    Per-entity id counters stored in the database, so every process using
+    the same file draws ids from one sequence
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self._pool = pool
+        with self._pool.connection() as connection, connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS id_sequences (entity TEXT PRIMARY KEY, last INTEGER NOT NULL)"
+            )
+
+    def raise_floor(self, entity: str, value: int) -> None:
+        """
+        Make sure the sequence continues after `value`
+        """
+        with self._pool.connection() as connection, connection:
+            connection.execute(
+                "INSERT INTO id_sequences (entity, last) VALUES (?, ?) "
+                "ON CONFLICT(entity) DO UPDATE SET last = MAX(last, excluded.last)",
+                (entity, value)
+            )
+
+    def reserve(self, entity: str, count: int) -> int:
+        """
+        Atomically claim the next `count` ids and return the last one
+        """
+        with self._pool.connection() as connection, connection:
+            connection.execute("INSERT OR IGNORE INTO id_sequences (entity, last) VALUES (?, 0)", (entity,))
+            (last,) = connection.execute(
+                "UPDATE id_sequences SET last = last + ? WHERE entity = ? RETURNING last", (count, entity)
+            ).fetchone()
+        return last
+
+class SQLiteRepository(Repository):
+    """
+    Repository storing each entity as a JSON document plus indexed columns
+    """
+
+    def __init__(self, spec: EntitySpec, pool: ConnectionPool):
+        super().__init__(spec)
+        self._pool = pool
+
+        table = spec.name
+        columns = ["id", "data", *spec.columns]
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+
+        self._select_all = f"SELECT data FROM {table} ORDER BY id"
+        self._select_one = f"SELECT data FROM {table} WHERE id = ?"
+        self._upsert = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                        f"ON CONFLICT(id) DO UPDATE SET {updates}")
+        self._delete = f"DELETE FROM {table} WHERE id = ?"
+
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        table = self.spec.name
+        column_defs = "".join(f", {column}" for column in self.spec.columns)
+        with self._pool.connection() as connection, connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, data TEXT NOT NULL{column_defs})"
+            )
+            for column in self.spec.columns:
+                unique = "UNIQUE " if column in self.spec.unique else ""
+                connection.execute(
+                    f"CREATE {unique}INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column})"
+                )
+
+    def _row(self, entity: BaseModel) -> tuple:
+        values = [extract(entity) for extract in self.spec.columns.values()]
+        return (entity.id, entity.model_dump_json(), *values)
+
+    def load_all(self) -> List[BaseModel]:
+        with self._pool.connection() as connection:
+            rows = connection.execute(self._select_all).fetchall()
+        return [self.spec.model.model_validate_json(data) for (data,) in rows]
+
+    def get(self, entity_id: int) -> Optional[BaseModel]:
+        with self._pool.connection() as connection:
+            row = connection.execute(self._select_one, (entity_id,)).fetchone()
+        return self.spec.model.model_validate_json(row[0]) if row else None
+
+    def save(self, entity: BaseModel) -> None:
+        with self._pool.connection() as connection, connection:
+            connection.execute(self._upsert, self._row(entity))
+
+    def save_many(self, entities: Iterable[BaseModel]) -> None:
+        rows = [self._row(entity) for entity in entities]
+        if not rows:
+            return
+        with self._pool.connection() as connection, connection:
+            connection.executemany(self._upsert, rows)
+
+    def delete(self, entity_id: int) -> bool:
+        with self._pool.connection() as connection, connection:
+            cursor = connection.execute(self._delete, (entity_id,))
+        return cursor.rowcount > 0
+
+    def delete_many(self, entity_ids: Iterable[int]) -> None:
+        rows = [(entity_id,) for entity_id in entity_ids]
+        if not rows:
+            return
+        with self._pool.connection() as connection, connection:
+            connection.executemany(self._delete, rows)
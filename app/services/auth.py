@@ -1,12 +1,18 @@
+import threading
 from typing import Optional, Dict, Any
 from datetime import datetime
 from app.models.schemas.auth import User
+from app.services.ids import id_allocator
+from app.repositories.registry import get_repository
 
 class AuthService:
     """
     Service class for authentication and user management
     """
     
+    # Serialises mutations so concurrent requests see consistent state
+    _lock = threading.RLock()
+    
     # Mock database for demonstration
     _users_db = [
         User(
@@ -33,6 +39,20 @@ class AuthService:
         )
     ]
     
+    @staticmethod
+    def load_from_repository() -> None:
+        """
+        Load users from the configured repository, seeding it with the mock data when empty
+        """
+        with AuthService._lock:
+            repository = get_repository("users")
+            users = repository.load_all()
+            if users:
+                AuthService._users_db = users
+            else:
+                repository.save_many(AuthService._users_db)
+            id_allocator.reset("users", (user.id for user in AuthService._users_db))
+    
     @staticmethod
     def authenticate_user(email: str, password: str) -> Optional[User]:
         """
@@ -51,25 +71,27 @@ class AuthService:
         """
         Register a new user
         """
-        # Check if user already exists
-        if any(user.email == email for user in AuthService._users_db):
-            return None
+        with AuthService._lock:
+            # Check if user already exists
+            if any(user.email == email for user in AuthService._users_db):
+                return None
         
-        # Create new user
-        new_user = User(
-            id=len(AuthService._users_db) + 1,
-            name=name,
-            email=email,
-            password=f"hashed_password_{password}",  # En producción usar bcrypt
-            company=company,
-            phone=phone,
-            role="client",  # Default role
-            created_at=datetime.now(),
-            active=True
-        )
+            # Create new user
+            new_user = User(
+                id=id_allocator.next("users"),
+                name=name,
+                email=email,
+                password=f"hashed_password_{password}",  # En producción usar bcrypt
+                company=company,
+                phone=phone,
+                role="client",  # Default role
+                created_at=datetime.now(),
+                active=True
+            )
         
-        AuthService._users_db.append(new_user)
-        return new_user
+            AuthService._users_db.append(new_user)
+            get_repository("users").save(new_user)
+            return new_user
     
     @staticmethod
     def get_user_by_id(user_id: int) -> Optional[User]:
@@ -97,8 +119,12 @@ class AuthService:
         """
         Update user active status
         """
-        user = AuthService.get_user_by_id(user_id)
-        if user:
-            user.active = active
-            return True
-        return False
\ No newline at end of file
+        with AuthService._lock:
+            user = AuthService.get_user_by_id(user_id)
+            if user:
+                user.active = active
+                get_repository("users").save(user)
+                return True
+            return False
+
+id_allocator.reset("users", (user.id for user in AuthService._users_db))
@@ -1,14 +1,57 @@
-from typing import List, Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Iterable, Sequence, Tuple
 from datetime import datetime, timedelta
 from app.models.schemas.checklist import ConcreteChecklist, CreateChecklistRequest, ChecklistItem
+from app.models.schemas.orders import ConcreteOrder
+from app.services.checklist_store import ChecklistStore, CompactChecklist, ItemProgress
+from app.repositories.archive import ChecklistArchive
+from app.services.ids import id_allocator
+from app.services.timeutils import to_local
+from app.repositories.registry import get_repository
+
+def _group_by_category(items: Iterable[ChecklistItem]) -> Dict[str, List[str]]:
+    grouped: Dict[str, List[str]] = {}
+    for item in items:
+        grouped.setdefault(item.category, []).append(item.description)
+    return grouped
 
 class ChecklistService:
     """
     Service class for concrete pouring checklists management
     """
     
+    # Serialises mutations so concurrent requests see consistent state
+    _lock = threading.RLock()
+    
+    # Template items for new checklists
+    _template_items = [
+        # Pre-vaciado
+        ChecklistItem(id=1, category="pre_vaciado", description="Verificar limpieza y preparación del área de vaciado", completed=False),
+        ChecklistItem(id=2, category="pre_vaciado", description="Confirmar disponibilidad de mezcla especificada", completed=False),
+        ChecklistItem(id=3, category="pre_vaciado", description="Verificar equipo de bombeo y mangueras", completed=False),
+        ChecklistItem(id=4, category="pre_vaciado", description="Confirmar acceso para camiones mixer", completed=False),
+        
+        # Seguridad
+        ChecklistItem(id=5, category="seguridad", description="Verificar EPP del personal (casco, chaleco, botas)", completed=False),
+        ChecklistItem(id=6, category="seguridad", description="Delimitación y señalización del área de trabajo", completed=False),
+        ChecklistItem(id=7, category="seguridad", description="Verificar extintores y kit de primeros auxilios", completed=False),
+        
+        # Calidad
+        ChecklistItem(id=8, category="calidad", description="Toma de muestra para cilindros de prueba", completed=False),
+        ChecklistItem(id=9, category="calidad", description="Verificar temperatura del concreto", completed=False),
+        ChecklistItem(id=10, category="calidad", description="Control de asentamiento (slump test)", completed=False),
+        
+        # Post-vaciado
+        ChecklistItem(id=11, category="post_vaciado", description="Limpieza final del área", completed=False),
+        ChecklistItem(id=12, category="post_vaciado", description="Curado inicial aplicado", completed=False),
+        ChecklistItem(id=13, category="post_vaciado", description="Documentación y reportes completados", completed=False)
+    ]
+    
+    # Template descriptions grouped by category, in template order
+    _template_by_category = _group_by_category(_template_items)
+    
     # Mock database for checklists - ACTUALIZADO para coincidir con OrdersService
-    _checklists_db = [
+    _checklists_db = ChecklistStore([
         ConcreteChecklist(
             id=1,
             order_id=2,  # Orden 2: VITTRIO - ZAPATA H-12 TORRE 4
@@ -181,54 +224,103 @@ class ChecklistService:
                 )
             ]
         )
-    ]
+    ], _template_items)
     
-    # Template items for new checklists
-    _template_items = [
-        # Pre-vaciado
-        ChecklistItem(id=1, category="pre_vaciado", description="Verificar limpieza y preparación del área de vaciado", completed=False),
-        ChecklistItem(id=2, category="pre_vaciado", description="Confirmar disponibilidad de mezcla especificada", completed=False),
-        ChecklistItem(id=3, category="pre_vaciado", description="Verificar equipo de bombeo y mangueras", completed=False),
-        ChecklistItem(id=4, category="pre_vaciado", description="Confirmar acceso para camiones mixer", completed=False),
-        
-        # Seguridad
-        ChecklistItem(id=5, category="seguridad", description="Verificar EPP del personal (casco, chaleco, botas)", completed=False),
-        ChecklistItem(id=6, category="seguridad", description="Delimitación y señalización del área de trabajo", completed=False),
-        ChecklistItem(id=7, category="seguridad", description="Verificar extintores y kit de primeros auxilios", completed=False),
-        
-        # Calidad
-        ChecklistItem(id=8, category="calidad", description="Toma de muestra para cilindros de prueba", completed=False),
-        ChecklistItem(id=9, category="calidad", description="Verificar temperatura del concreto", completed=False),
-        ChecklistItem(id=10, category="calidad", description="Control de asentamiento (slump test)", completed=False),
-        
-        # Post-vaciado
-        ChecklistItem(id=11, category="post_vaciado", description="Limpieza final del área", completed=False),
-        ChecklistItem(id=12, category="post_vaciado", description="Curado inicial aplicado", completed=False),
-        ChecklistItem(id=13, category="post_vaciado", description="Documentación y reportes completados", completed=False)
-    ]
+    # Cold storage for old completed checklists; None until opened at startup
+    _archive: Optional[ChecklistArchive] = None
+    
+    # Completed checklists older than this move out of memory into the archive
+    _archive_after = timedelta(days=7)
+    
+    # Items of this category must all be ticked before an order can pour
+    PRE_POUR_CATEGORY = "pre_vaciado"
+    
+    @staticmethod
+    def _reset_ids() -> None:
+        """
+        Restart the id sequence after the highest id in memory or in the archive
+        """
+        archive = ChecklistService._archive
+        ids = [checklist.id for checklist in ChecklistService._checklists_db]
+        if archive is not None:
+            ids.append(archive.max_id)
+        id_allocator.reset("checklists", ids)
+    
+    @staticmethod
+    def load_from_repository() -> None:
+        """
+        Load checklists from the configured repository, seeding it with the mock
+        data when empty and nothing has been archived
+        """
+        with ChecklistService._lock:
+            repository = get_repository("checklists")
+            checklists = repository.load_all()
+            archive = ChecklistService._archive
+            if checklists:
+                ChecklistService._checklists_db = ChecklistStore(checklists, ChecklistService._template_items)
+            elif archive is not None and archive.totals["checklists"]:
+                # Everything was archived; the mock data would reuse archived ids
+                ChecklistService._checklists_db = ChecklistStore([], ChecklistService._template_items)
+            else:
+                repository.save_many(ChecklistService._checklists_db.all())
+            ChecklistService._reset_ids()
+    
+    @staticmethod
+    def open_archive(directory: str, archive_after_days: int) -> None:
+        """
+        Attach the cold storage. Opened before loading, so loading knows which ids it holds
+        """
+        with ChecklistService._lock:
+            ChecklistService._archive = ChecklistArchive(directory)
+            ChecklistService._archive_after = timedelta(days=archive_after_days)
+            ChecklistService._reset_ids()
     
     @staticmethod
-    def get_all_checklists() -> List[ConcreteChecklist]:
+    def archive_completed(now: Optional[datetime] = None) -> int:
         """
-        Get all concrete checklists
+        Move completed checklists finished before the archive age into cold
+        storage and out of memory and the repository. Returns how many moved
         """
-        return ChecklistService._checklists_db
+        with ChecklistService._lock:
+            archive = ChecklistService._archive
+            if archive is None:
+                return 0
+            cutoff = (now or datetime.now()) - ChecklistService._archive_after
+            store = ChecklistService._checklists_db
+            ids = [record.id for record in store.records("completed")
+                   if record.completed_at and to_local(record.completed_at) < cutoff]
+            if not ids:
+                return 0
+            
+            # Written to the archive first: a crash before the delete only leaves a duplicate
+            archive.put_many(store.get(checklist_id) for checklist_id in ids)
+            get_repository("checklists").delete_many(ids)
+            store.remove_many(ids)
+            return len(ids)
+    
+    @staticmethod
+    def get_all_checklists() -> Sequence[ConcreteChecklist]:
+        """
+        Get all concrete checklists that are not archived
+        """
+        return ChecklistService._checklists_db.all()
     
     @staticmethod
     def get_checklist_by_id(checklist_id: int) -> Optional[ConcreteChecklist]:
         """
-        Get checklist by ID
+        Get checklist by ID, falling back to the archive
         """
-        return next((checklist for checklist in ChecklistService._checklists_db 
-                    if checklist.id == checklist_id), None)
+        checklist = ChecklistService._checklists_db.get(checklist_id)
+        if checklist is None and ChecklistService._archive is not None:
+            checklist = ChecklistService._archive.get(checklist_id)
+        return checklist
     
     @staticmethod
     def get_checklists_by_status(status: str) -> List[ConcreteChecklist]:
         """
         Get checklists by status
         """
-        return [checklist for checklist in ChecklistService._checklists_db 
-                if checklist.status == status]
+        return ChecklistService._checklists_db.by_status(status)
     
     @staticmethod
     def get_todays_checklists() -> List[ConcreteChecklist]:
@@ -236,96 +328,236 @@ class ChecklistService:
         Get today's checklists
         """
         today = datetime.now().date()
-        return [checklist for checklist in ChecklistService._checklists_db 
-                if checklist.scheduled_time.date() == today]
+        store = ChecklistService._checklists_db
+        return [store.get(record.id) for record in store
+                if record.scheduled_time.date() == today]
+    
+    @staticmethod
+    def _build_items(categories: Iterable[str]) -> List[ChecklistItem]:
+        """
+        Fresh template items for the requested categories, in template order
+        """
+        wanted = set(categories)
+        items = []
+        for category, descriptions in ChecklistService._template_by_category.items():
+            if category in wanted:
+                for description in descriptions:
+                    items.append(ChecklistItem(
+                        id=len(items) + 1,
+                        category=category,
+                        description=description,
+                        completed=False
+                    ))
+        return items
     
     @staticmethod
     def create_checklist(checklist_data: CreateChecklistRequest) -> ConcreteChecklist:
         """
         Create a new checklist
         """
-        # Create items from template
-        items = []
-        for template_item in ChecklistService._template_items:
-            if template_item.category in checklist_data.categories:
-                items.append(ChecklistItem(
-                    id=len(items) + 1,
-                    category=template_item.category,
-                    description=template_item.description,
-                    completed=False
-                ))
-        
-        # Create new checklist
-        new_checklist = ConcreteChecklist(
-            id=len(ChecklistService._checklists_db) + 1,
-            order_id=checklist_data.order_id,
-            project_name=checklist_data.project_name,
-            supervisor=checklist_data.supervisor,
-            scheduled_time=checklist_data.scheduled_time,
-            status="pending",
-            created_at=datetime.now(),
-            completed_at=None,
-            items=items
-        )
+        with ChecklistService._lock:
+            new_checklist = ConcreteChecklist(
+                id=id_allocator.next("checklists"),
+                order_id=checklist_data.order_id,
+                project_name=checklist_data.project_name,
+                supervisor=checklist_data.supervisor,
+                scheduled_time=checklist_data.scheduled_time,
+                status="pending",
+                created_at=datetime.now(),
+                completed_at=None,
+                items=ChecklistService._build_items(checklist_data.categories)
+            )
         
-        ChecklistService._checklists_db.append(new_checklist)
-        return new_checklist
+            ChecklistService._checklists_db.add(new_checklist)
+            get_repository("checklists").save(new_checklist)
+            return new_checklist
+    
+    @staticmethod
+    def create_checklists_for_orders(orders: Iterable[ConcreteOrder], categories: Iterable[str],
+                                     supervisor: Optional[str] = None) -> List[ConcreteChecklist]:
+        """
+        Create one checklist per order that has none yet, persisted in one batch.
+        The supervisor defaults to the order's client
+        """
+        categories = list(categories)
+        with ChecklistService._lock:
+            store = ChecklistService._checklists_db
+            covered = set()
+            now = datetime.now()
+            created = []
+            for order in orders:
+                if order.id in covered or store.has_order(order.id):
+                    continue
+                covered.add(order.id)
+                created.append(ConcreteChecklist(
+                    id=id_allocator.next("checklists"),
+                    order_id=order.id,
+                    project_name=order.project_name,
+                    supervisor=supervisor or order.client,
+                    scheduled_time=order.scheduled_time,
+                    status="pending",
+                    created_at=now,
+                    completed_at=None,
+                    items=ChecklistService._build_items(categories)
+                ))
+            
+            get_repository("checklists").save_many(created)
+            for checklist in created:
+                ChecklistService._checklists_db.add(checklist)
+            return created
     
     @staticmethod
     def update_checklist_item(checklist_id: int, item_id: int, completed: bool) -> bool:
         """
         Update checklist item status
         """
-        checklist = ChecklistService.get_checklist_by_id(checklist_id)
-        if checklist:
-            item = next((item for item in checklist.items 
-                        if item.id == item_id), None)
-            if item:
-                item.completed = completed
-                return True
-        return False
+        checklist, errors = ChecklistService.update_checklist_items(
+            checklist_id, [(item_id, completed, None, datetime.now())]
+        )
+        return checklist is not None and not errors
+    
+    @staticmethod
+    def update_checklist_items(checklist_id: int,
+                               changes: List[Tuple[int, bool, Optional[str], datetime]]
+                               ) -> Tuple[Optional[ConcreteChecklist], List[Tuple[int, str]]]:
+        """
+        Apply (item_id, completed, notes, client_timestamp) changes to a checklist
+        in timestamp order and advance its status. Nothing is applied if any
+        item is unknown
+        """
+        with ChecklistService._lock:
+            store = ChecklistService._checklists_db
+            record = store.record(checklist_id)
+            if record is None:
+                return None, []
+            
+            positions = [record.position(item_id) for item_id, _, _, _ in changes]
+            errors = [(index, f"Item {item_id} not found")
+                      for index, ((item_id, _, _, _), position) in enumerate(zip(changes, positions))
+                      if position is None]
+            if errors:
+                return store.get(checklist_id), errors
+            
+            # Offline clients may send ticks out of order: the latest one wins
+            stamped = sorted(((to_local(timestamp), position, completed, notes)
+                              for (_, completed, notes, timestamp), position in zip(changes, positions)),
+                             key=lambda change: change[0])
+            for timestamp, position, completed, notes in stamped:
+                store.set_item(record, position, completed, timestamp)
+                if notes is not None:
+                    store.set_notes(record, position, notes)
+            
+            if stamped:
+                ChecklistService._advance_status(record, stamped[-1][0])
+            checklist = store.get(checklist_id)
+            get_repository("checklists").save(checklist)
+            return checklist, []
+    
+    @staticmethod
+    def _advance_status(record: CompactChecklist, when: datetime) -> None:
+        """
+        pending -> in_progress on the first ticked item, -> completed when all are;
+        unticking an item reopens a completed checklist
+        """
+        if record.status == "cancelled":
+            return
+        store = ChecklistService._checklists_db
+        completed = record.completed_count
+        if len(record) and completed == len(record):
+            if record.status != "completed":
+                store.set_status(record, "completed")
+                record.completed_at = when
+        elif completed or record.status == "completed":
+            if record.status != "in_progress":
+                store.set_status(record, "in_progress")
+                record.completed_at = None
     
     @staticmethod
     def complete_checklist(checklist_id: int) -> bool:
         """
         Complete a checklist
         """
-        checklist = ChecklistService.get_checklist_by_id(checklist_id)
-        if checklist:
-            checklist.status = "completed"
-            checklist.completed_at = datetime.now()
-            return True
-        return False
+        with ChecklistService._lock:
+            store = ChecklistService._checklists_db
+            record = store.record(checklist_id)
+            if record:
+                store.set_status(record, "completed")
+                record.completed_at = datetime.now()
+                get_repository("checklists").save(store.get(checklist_id))
+                return True
+            return False
+    
+    @staticmethod
+    def get_checklist_progress(checklist_id: int) -> Dict[str, float]:
+        """
+        Get completed/total item counts of a checklist
+        """
+        return ChecklistService._checklists_db.progress(checklist_id).as_dict()
+    
+    @staticmethod
+    def get_order_readiness(order_id: int) -> Dict[str, Any]:
+        """
+        Progress of every checklist linked to an order and whether it is ready
+        to pour: at least one live checklist, with all pre-pour items ticked
+        """
+        store = ChecklistService._checklists_db
+        checklists = [
+            {
+                "id": record.id,
+                "status": record.status,
+                "supervisor": record.supervisor,
+                "progress": store.progress(record.id).as_dict(),
+                "pre_pour": store.category_progress(record, ChecklistService.PRE_POUR_CATEGORY).as_dict()
+            }
+            for record in store.for_order(order_id)
+        ]
+        return {"ready_to_pour": ChecklistService.is_ready_to_pour(order_id), "checklists": checklists}
+    
+    @staticmethod
+    def is_ready_to_pour(order_id: int) -> bool:
+        """
+        Whether an order has a live checklist and none with pending pre-pour items
+        """
+        store = ChecklistService._checklists_db
+        ready = False
+        for record in store.for_order(order_id):
+            if record.status == "cancelled":
+                continue
+            pre_pour = store.category_progress(record, ChecklistService.PRE_POUR_CATEGORY)
+            if pre_pour.completed < pre_pour.total:
+                return False
+            ready = True
+        return ready
+    
+    @staticmethod
+    def check_summary_consistency() -> bool:
+        """
+        Recompute the summary counters from scratch and compare
+        """
+        return ChecklistService._checklists_db.check_totals()
     
     @staticmethod
     def get_checklists_summary() -> Dict[str, Any]:
         """
-        Get checklists summary statistics
+        Get checklists summary statistics, archived checklists included in the totals
         """
-        todays_checklists = ChecklistService.get_todays_checklists()
-        completed_today = len([checklist for checklist in todays_checklists 
-                             if checklist.status == "completed"])
-        in_progress = len(ChecklistService.get_checklists_by_status("in_progress"))
-        
-        # Calculate completion rates
-        total_items = 0
-        completed_items = 0
-        for checklist in ChecklistService._checklists_db:
-            total_items += len(checklist.items)
-            completed_items += len([item for item in checklist.items 
-                                  if item.completed])
-        
-        completion_rate = (completed_items / total_items * 100) if total_items > 0 else 0
+        store = ChecklistService._checklists_db
+        today = datetime.now().date()
+        archived = ChecklistService._archive.totals if ChecklistService._archive else {}
+        items = ItemProgress()
+        items.total = store.item_totals().total + archived.get("total_items", 0)
+        items.completed = store.item_totals().completed + archived.get("completed_items", 0)
         
         return {
-            "total_checklists": len(ChecklistService._checklists_db),
-            "todays_checklists": len(todays_checklists),
-            "completed_today": completed_today,
-            "in_progress": in_progress,
-            "pending": len(ChecklistService.get_checklists_by_status("pending")),
-            "completion_rate": round(completion_rate, 1),
-            "total_items": total_items,
-            "completed_items": completed_items
+            "total_checklists": len(store) + archived.get("checklists", 0),
+            "archived_checklists": archived.get("checklists", 0),
+            "todays_checklists": store.count_on(today),
+            "completed_today": store.count_on(today, "completed"),
+            "in_progress": store.count_by_status("in_progress"),
+            "pending": store.count_by_status("pending"),
+            "completion_rate": items.percentage,
+            "total_items": items.total,
+            "completed_items": items.completed
         }
     
     @staticmethod
@@ -333,4 +565,6 @@ class ChecklistService:
         """
         Get available checklist categories
         """
-        return ["pre_vaciado", "seguridad", "calidad", "post_vaciado"]
\ No newline at end of file
+        return list(ChecklistService._template_by_category)
+
+ChecklistService._reset_ids()
@@ -0,0 +1,380 @@
+import math
+import sys
+import threading
+from array import array
+from typing import List, Optional, Dict, Iterable, Iterator, Sequence, Tuple, Union
+from datetime import date, datetime, timedelta
+from app.models.schemas.checklist import ConcreteChecklist, ChecklistItem
+from app.services.timeutils import to_local
+
+# Item completion times are kept as float seconds since this naive epoch, NaN when unset
+_EPOCH = datetime(1970, 1, 1)
+_UNSET = float("nan")
+
+def _seconds(value: Optional[datetime]) -> float:
+    return (to_local(value) - _EPOCH).total_seconds() if value is not None else _UNSET
+
+def _moment(seconds: float) -> Optional[datetime]:
+    return None if math.isnan(seconds) else _EPOCH + timedelta(seconds=seconds)
+
+class ItemCatalog:
+    """
+    Shared table of (category, description) pairs that checklists refer to
+    by index. Seeded with the template, so template items keep their position
+    """
+
+    def __init__(self, items: Iterable[ChecklistItem] = ()):
+        self._index: Dict[Tuple[str, str], int] = {}
+        self.categories: List[str] = []
+        self.descriptions: List[str] = []
+        for item in items:
+            self.ref(item.category, item.description)
+
+    def __len__(self) -> int:
+        return len(self.descriptions)
+
+    def ref(self, category: str, description: str) -> int:
+        key = (category, description)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.descriptions)
+            self.categories.append(category)
+            self.descriptions.append(description)
+        return index
+
+class CompactChecklist:
+    """
+    A checklist with its items stored as catalog refs, a completion bitmask,
+    an array of completion times and sparse notes
+    """
+
+    __slots__ = ("id", "order_id", "project_name", "supervisor", "scheduled_time", "status",
+                 "created_at", "completed_at", "item_ids", "refs", "done", "completed_times", "notes")
+
+    def __init__(self, checklist: ConcreteChecklist, catalog: ItemCatalog):
+        self.id = checklist.id
+        self.order_id = checklist.order_id
+        self.project_name = sys.intern(checklist.project_name)
+        self.supervisor = sys.intern(checklist.supervisor)
+        self.scheduled_time = checklist.scheduled_time
+        self.status = sys.intern(checklist.status)
+        self.created_at = checklist.created_at
+        self.completed_at = checklist.completed_at
+
+        items = checklist.items
+        ids = [item.id for item in items]
+        # Item ids are almost always 1..n; only irregular ones are stored
+        self.item_ids = None if ids == list(range(1, len(ids) + 1)) else array("l", ids)
+        self.refs = array("l", (catalog.ref(item.category, item.description) for item in items))
+        self.done = 0
+        for position, item in enumerate(items):
+            if item.completed:
+                self.done |= 1 << position
+        self.completed_times = array("d", (_seconds(item.completed_at) for item in items))
+        self.notes = {position: item.notes for position, item in enumerate(items)
+                      if item.notes is not None} or None
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    @property
+    def completed_count(self) -> int:
+        return self.done.bit_count()
+
+    def position(self, item_id: int) -> Optional[int]:
+        """
+        Index of an item by its id
+        """
+        if self.item_ids is None:
+            return item_id - 1 if 1 <= item_id <= len(self.refs) else None
+        try:
+            return self.item_ids.index(item_id)
+        except ValueError:
+            return None
+
+    def is_completed(self, position: int) -> bool:
+        return bool(self.done >> position & 1)
+
+    def to_model(self, catalog: ItemCatalog) -> ConcreteChecklist:
+        """
+        Build the API model of this checklist
+        """
+        notes = self.notes or {}
+        items = [
+            ChecklistItem(
+                id=self.item_ids[position] if self.item_ids is not None else position + 1,
+                category=catalog.categories[ref],
+                description=catalog.descriptions[ref],
+                completed=self.is_completed(position),
+                notes=notes.get(position),
+                completed_at=_moment(self.completed_times[position])
+            )
+            for position, ref in enumerate(self.refs)
+        ]
+        return ConcreteChecklist(
+            id=self.id,
+            order_id=self.order_id,
+            project_name=self.project_name,
+            supervisor=self.supervisor,
+            scheduled_time=self.scheduled_time,
+            status=self.status,
+            created_at=self.created_at,
+            completed_at=self.completed_at,
+            items=items
+        )
+
+class ChecklistView(Sequence):
+    """
+    Read-only sequence over compact records that builds models only for the
+    positions actually read, so paginating a large store stays cheap
+    """
+
+    def __init__(self, records: List[CompactChecklist], catalog: ItemCatalog):
+        self._records = records
+        self._catalog = catalog
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ConcreteChecklist, List[ConcreteChecklist]]:
+        if isinstance(index, slice):
+            return [record.to_model(self._catalog) for record in self._records[index]]
+        return self._records[index].to_model(self._catalog)
+
+class ItemProgress:
+    """
+    Running completed/total item counts for one checklist or for all of them
+    """
+
+    __slots__ = ("completed", "total")
+
+    def __init__(self):
+        self.completed = 0
+        self.total = 0
+
+    def apply(self, record: CompactChecklist, sign: int = 1) -> None:
+        self.total += sign * len(record)
+        self.completed += sign * record.completed_count
+
+    def matches(self, other: "ItemProgress") -> bool:
+        return self.completed == other.completed and self.total == other.total
+
+    @property
+    def percentage(self) -> float:
+        return round(self.completed / self.total * 100, 1) if self.total else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"completed": self.completed, "total": self.total, "percentage": self.percentage}
+
+class ChecklistStore:
+    """
+    In-memory checklist store holding compact records, with an id map,
+    status/day indexes and item counters kept up to date on every change.
+    Pydantic models are only built when checklists are read out
+    """
+
+    def __init__(self, checklists: Iterable[ConcreteChecklist] = (), templates: Iterable[ChecklistItem] = ()):
+        self._lock = threading.RLock()
+        self.catalog = ItemCatalog(templates)
+        # Insertion ordered, so it doubles as the listing order
+        self._by_id: Dict[int, CompactChecklist] = {}
+        self._by_status: Dict[str, Dict[int, CompactChecklist]] = {}
+        # order id -> checklist id -> record
+        self._by_order: Dict[int, Dict[int, CompactChecklist]] = {}
+        # scheduled day -> status -> count
+        self._day_status: Dict[date, Dict[str, int]] = {}
+        self._item_totals = ItemProgress()
+
+        for checklist in checklists:
+            self.add(checklist)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[CompactChecklist]:
+        return iter(list(self._by_id.values()))
+
+    def _count_day(self, record: CompactChecklist, sign: int) -> None:
+        day = record.scheduled_time.date()
+        counts = self._day_status.setdefault(day, {})
+        counts[record.status] = counts.get(record.status, 0) + sign
+        if not counts[record.status]:
+            del counts[record.status]
+            if not counts:
+                del self._day_status[day]
+
+    def add(self, checklist: ConcreteChecklist) -> None:
+        """
+        Insert a checklist and register it in every index
+        """
+        with self._lock:
+            if checklist.id in self._by_id:
+                raise ValueError(f"Checklist {checklist.id} already exists")
+
+            record = CompactChecklist(checklist, self.catalog)
+            self._by_id[record.id] = record
+            self._by_status.setdefault(record.status, {})[record.id] = record
+            self._by_order.setdefault(record.order_id, {})[record.id] = record
+            self._count_day(record, 1)
+            self._item_totals.apply(record)
+
+    def remove_many(self, checklist_ids: Iterable[int]) -> int:
+        """
+        Drop checklists from every index and counter; unknown ids are ignored
+        """
+        with self._lock:
+            removed = 0
+            for checklist_id in checklist_ids:
+                record = self._by_id.pop(checklist_id, None)
+                if record is None:
+                    continue
+                bucket = self._by_status[record.status]
+                del bucket[checklist_id]
+                if not bucket:
+                    del self._by_status[record.status]
+                linked = self._by_order[record.order_id]
+                del linked[checklist_id]
+                if not linked:
+                    del self._by_order[record.order_id]
+                self._count_day(record, -1)
+                self._item_totals.apply(record, -1)
+                removed += 1
+            return removed
+
+    def record(self, checklist_id: int) -> Optional[CompactChecklist]:
+        """
+        Get the compact record of a checklist in O(1)
+        """
+        return self._by_id.get(checklist_id)
+
+    def records(self, status: Optional[str] = None) -> List[CompactChecklist]:
+        """
+        Compact records, optionally only those with a given status
+        """
+        with self._lock:
+            source = self._by_id if status is None else self._by_status.get(status, {})
+            return list(source.values())
+
+    def for_order(self, order_id: int) -> List[CompactChecklist]:
+        """
+        Compact records of the checklists linked to an order, in O(1)
+        """
+        with self._lock:
+            return list(self._by_order.get(order_id, {}).values())
+
+    def has_order(self, order_id: int) -> bool:
+        return order_id in self._by_order
+
+    def get(self, checklist_id: int) -> Optional[ConcreteChecklist]:
+        """
+        Get checklist by ID as a model
+        """
+        with self._lock:
+            record = self._by_id.get(checklist_id)
+            return record.to_model(self.catalog) if record else None
+
+    def all(self) -> ChecklistView:
+        """
+        Get all checklists in insertion order, as a lazily built sequence of models
+        """
+        with self._lock:
+            return ChecklistView(list(self._by_id.values()), self.catalog)
+
+    def by_status(self, status: str) -> List[ConcreteChecklist]:
+        """
+        Get checklists with the given status as models
+        """
+        with self._lock:
+            return [record.to_model(self.catalog) for record in self._by_status.get(status, {}).values()]
+
+    def count_by_status(self, status: str) -> int:
+        return len(self._by_status.get(status, {}))
+
+    def count_on(self, day: date, status: Optional[str] = None) -> int:
+        """
+        Count checklists scheduled on a day, optionally with a given status
+        """
+        counts = self._day_status.get(day, {})
+        return counts.get(status, 0) if status else sum(counts.values())
+
+    def set_item(self, record: CompactChecklist, position: int, completed: bool,
+                 when: Optional[datetime] = None) -> bool:
+        """
+        Tick or untick an item and adjust the counters; False when nothing changed
+        """
+        with self._lock:
+            if record.is_completed(position) == completed:
+                return False
+            record.done ^= 1 << position
+            record.completed_times[position] = _seconds(when) if completed else _UNSET
+            self._item_totals.completed += 1 if completed else -1
+            return True
+
+    def set_notes(self, record: CompactChecklist, position: int, notes: str) -> None:
+        with self._lock:
+            if record.notes is None:
+                record.notes = {}
+            record.notes[position] = notes
+
+    def set_status(self, record: CompactChecklist, status: str) -> None:
+        """
+        Change a checklist's status and move it to the matching bucket
+        """
+        with self._lock:
+            bucket = self._by_status.get(record.status)
+            if bucket is not None:
+                bucket.pop(record.id, None)
+                if not bucket:
+                    del self._by_status[record.status]
+            self._count_day(record, -1)
+            record.status = sys.intern(status)
+            self._by_status.setdefault(record.status, {})[record.id] = record
+            self._count_day(record, 1)
+
+    def progress(self, checklist_id: int) -> ItemProgress:
+        """
+        Item counts of one checklist, read off its bitmask
+        """
+        progress = ItemProgress()
+        record = self._by_id.get(checklist_id)
+        if record is not None:
+            progress.apply(record)
+        return progress
+
+    def category_progress(self, record: CompactChecklist, category: str) -> ItemProgress:
+        """
+        Item counts of one checklist restricted to a category
+        """
+        progress = ItemProgress()
+        categories = self.catalog.categories
+        for position, ref in enumerate(record.refs):
+            if categories[ref] == category:
+                progress.total += 1
+                progress.completed += record.is_completed(position)
+        return progress
+
+    def item_totals(self) -> ItemProgress:
+        """
+        Running item counts across every checklist
+        """
+        return self._item_totals
+
+    def check_totals(self) -> bool:
+        """
+        Verify the running counters and indexes against a full recomputation
+        """
+        with self._lock:
+            expected_totals = ItemProgress()
+            expected_days: Dict[date, Dict[str, int]] = {}
+            for record in self._by_id.values():
+                if self._by_status.get(record.status, {}).get(record.id) is not record:
+                    return False
+                if self._by_order.get(record.order_id, {}).get(record.id) is not record:
+                    return False
+                expected_totals.apply(record)
+                counts = expected_days.setdefault(record.scheduled_time.date(), {})
+                counts[record.status] = counts.get(record.status, 0) + 1
+            indexed = sum(len(bucket) for bucket in self._by_status.values())
+            linked = sum(len(bucket) for bucket in self._by_order.values())
+            return (indexed == linked == len(self._by_id) and self._item_totals.matches(expected_totals)
+                    and self._day_status == expected_days)
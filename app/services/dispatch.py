@@ -0,0 +1,217 @@
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
+from app.models.schemas.orders import ConcreteOrder
+from app.models.schemas.plants import ConcretePlant
+from app.services.orders import OrdersService, plant_key
+from app.services.plants import PlantsService
+from app.services.fleet import FleetService
+from app.services.timeutils import floor_hour, to_local
+
+HOUR = timedelta(hours=1)
+
+def _hourly_shares(start: datetime, duration: float, volume: float) -> List[Tuple[datetime, float]]:
+    """
+    Split a pour's volume across the clock hours it overlaps, at a constant rate
+    """
+    if duration <= 0:
+        return [(floor_hour(start), volume)]
+
+    end = start + timedelta(hours=duration)
+    rate = volume / duration
+    shares = []
+    hour = floor_hour(start)
+    while hour < end:
+        overlap = (min(end, hour + HOUR) - max(start, hour)).total_seconds() / 3600
+        if overlap > 0:
+            shares.append((hour, rate * overlap))
+        hour += HOUR
+    return shares
+
+class PlantTimeline:
+    """
+    Hourly load buckets for one plant; each order remembers its own shares
+    so it can be removed exactly
+    """
+
+    def __init__(self):
+        self._hours: Dict[datetime, float] = {}
+        self._orders: Dict[int, List[Tuple[datetime, float]]] = {}
+
+    def add(self, order: ConcreteOrder) -> None:
+        if order.id in self._orders:
+            self.remove(order.id)
+        shares = _hourly_shares(order.scheduled_time, order.estimated_duration, order.volume)
+        for hour, amount in shares:
+            self._hours[hour] = self._hours.get(hour, 0.0) + amount
+        self._orders[order.id] = shares
+
+    def remove(self, order_id: int) -> None:
+        for hour, amount in self._orders.pop(order_id, []):
+            remaining = self._hours.get(hour, 0.0) - amount
+            if remaining > 1e-9:
+                self._hours[hour] = remaining
+            else:
+                self._hours.pop(hour, None)
+
+    def load_at(self, hour: datetime) -> float:
+        return self._hours.get(hour, 0.0)
+
+    def peak_with(self, shares: List[Tuple[datetime, float]]) -> float:
+        """
+        Highest hourly load if the given shares were added
+        """
+        return max((self.load_at(hour) + amount for hour, amount in shares), default=0.0)
+
+class DispatchService:
+    """
+    Capacity-aware dispatch planning over per-plant load timelines
+    """
+
+    _timelines: Dict[str, PlantTimeline] = {}
+    _built = False
+
+    @staticmethod
+    def _is_active(status: str) -> bool:
+        return status in OrdersService.ACTIVE_STATUSES
+
+    @staticmethod
+    def _timeline(plant_name: str) -> PlantTimeline:
+        key = plant_key(plant_name)
+        timeline = DispatchService._timelines.get(key)
+        if timeline is None:
+            timeline = DispatchService._timelines[key] = PlantTimeline()
+        return timeline
+
+    @staticmethod
+    def _ensure_built() -> None:
+        if DispatchService._built:
+            return
+        DispatchService._timelines = {}
+        for status in OrdersService.ACTIVE_STATUSES:
+            for order in OrdersService.get_orders_by_status(status):
+                DispatchService._timeline(order.assigned_plant).add(order)
+        DispatchService._built = True
+
+    @staticmethod
+    def on_order_event(event: str, order: Optional[ConcreteOrder], previous_status: Optional[str]) -> None:
+        """
+        Keep timelines in step with order creation and status changes
+        """
+        if event == "reloaded":
+            DispatchService._built = False
+            return
+        if not DispatchService._built or order is None:
+            return
+
+        timeline = DispatchService._timeline(order.assigned_plant)
+        if DispatchService._is_active(order.status):
+            if event == "created" or not DispatchService._is_active(previous_status or ""):
+                timeline.add(order)
+        else:
+            timeline.remove(order.id)
+
+    @staticmethod
+    def load_window(start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+        """
+        Resolve the hours covered by a load timeline: from the current hour
+        and for 24 hours unless given
+        """
+        start = floor_hour(to_local(start) or datetime.now())
+        end = to_local(end) or start + timedelta(hours=24)
+        return start, end
+
+    @staticmethod
+    def suggestion_window(earliest: Optional[datetime] = None,
+                          latest: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+        """
+        Resolve the first and last start hours tried for a new order: from
+        the next whole hour and for 24 hours unless given
+        """
+        earliest = to_local(earliest) or datetime.now()
+        first_slot = floor_hour(earliest)
+        if first_slot < earliest:
+            first_slot += HOUR
+        latest = to_local(latest) or first_slot + timedelta(hours=24)
+        return first_slot, latest
+
+    @staticmethod
+    def get_plant_load(plant: ConcretePlant, start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Hourly load timeline for a plant, flagging hours above capacity
+        """
+        DispatchService._ensure_built()
+        start, end = DispatchService.load_window(start, end)
+        timeline = DispatchService._timeline(plant.name)
+
+        hours = []
+        overbooked = []
+        hour = start
+        while hour < end:
+            load = timeline.load_at(hour)
+            entry = {
+                "hour": hour,
+                "load": round(load, 2),
+                "capacity": plant.capacity,
+                "utilization": round(load / plant.capacity * 100, 1) if plant.capacity else None,
+                "overbooked": load > plant.capacity + 1e-9
+            }
+            hours.append(entry)
+            if entry["overbooked"]:
+                overbooked.append(hour)
+            hour += HOUR
+
+        return {
+            "plant_id": plant.id,
+            "plant_name": plant.name,
+            "capacity": plant.capacity,
+            "trucks_available": FleetService.count_available(plant.name),
+            "from": start,
+            "to": end,
+            "hours": hours,
+            "overbooked_hours": overbooked
+        }
+
+    @staticmethod
+    def suggest_assignment(mix_type: str, volume: float, estimated_duration: float,
+                           earliest: Optional[datetime] = None, latest: Optional[datetime] = None,
+                           limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Rank (plant, start hour) slots that can absorb a new order without
+        exceeding plant capacity: earliest start first, then lowest peak load
+        """
+        DispatchService._ensure_built()
+        first_slot, latest = DispatchService.suggestion_window(earliest, latest)
+
+        suggestions = []
+        for plant in PlantsService.get_active_plants():
+            if mix_type not in plant.mixes_available or plant.capacity <= 0:
+                continue
+            # A plant cannot pour faster than its hourly capacity
+            duration = max(estimated_duration, volume / plant.capacity)
+            timeline = DispatchService._timeline(plant.name)
+
+            slot = first_slot
+            while slot <= latest:
+                shares = _hourly_shares(slot, duration, volume)
+                peak = timeline.peak_with(shares)
+                if peak <= plant.capacity + 1e-9:
+                    suggestions.append({
+                        "plant_id": plant.id,
+                        "plant_name": plant.name,
+                        "assigned_plant": plant_key(plant.name),
+                        "scheduled_time": slot,
+                        "estimated_duration": round(duration, 2),
+                        "peak_load": round(peak, 2),
+                        "peak_utilization": round(peak / plant.capacity * 100, 1),
+                        "trucks_available": FleetService.count_available(plant.name)
+                    })
+                    # Earliest feasible slot per plant is the one worth offering
+                    break
+                slot += HOUR
+
+        suggestions.sort(key=lambda s: (s["scheduled_time"], s["peak_utilization"]))
+        return suggestions[:limit]
+
+OrdersService.add_listener(DispatchService.on_order_event)
@@ -0,0 +1,137 @@
+import asyncio
+import itertools
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+from fastapi import Request
+from app.models.schemas.orders import ConcreteOrder
+from app.services.inventory import InventoryService, StockChange
+from app.services.orders import OrdersService
+
+# Seconds between keep-alive comments on an idle event stream
+EVENT_HEARTBEAT_SECONDS = 15
+
+class Subscription:
+    """
+    A connected client: a bounded queue of pending events
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_pending: int):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_pending)
+
+    def push(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog and ask it to reload instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync", "seq": event["seq"]})
+
+class EventBroadcaster:
+    """
+    Fan-out of compact change events to every subscribed client
+    """
+
+    def __init__(self, max_pending: int = 100):
+        self.max_pending = max_pending
+        self._subscriptions: Set[Subscription] = set()
+        self._sequence = itertools.count(1)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(asyncio.get_running_loop(), self.max_pending)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """
+        Deliver an event to all subscribers; safe to call from any thread
+        """
+        if not self._subscriptions:
+            return
+
+        event = {**event, "seq": next(self._sequence)}
+        try:
+            current_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            current_loop = None
+
+        for subscription in list(self._subscriptions):
+            if subscription.loop is current_loop:
+                subscription.push(event)
+            elif not subscription.loop.is_closed():
+                subscription.loop.call_soon_threadsafe(subscription.push, event)
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """
+    Encode an event in text/event-stream framing
+    """
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+async def event_stream(broadcaster: EventBroadcaster, subscription: Subscription,
+                       request: Request) -> AsyncIterator[str]:
+    """
+    Relay a subscription as SSE frames until the client disconnects
+    """
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), EVENT_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+order_events = EventBroadcaster()
+inventory_events = EventBroadcaster()
+
+def _publish_order_event(event: str, order: Optional[ConcreteOrder], previous_status: Optional[str]) -> None:
+    if order is None:
+        order_events.publish({"type": "resync"})
+        return
+
+    # Carries every column of the orders table so screens can render without refetching
+    order_events.publish({
+        "type": event,
+        "id": order.id,
+        "project_name": order.project_name,
+        "address": order.address,
+        "client": order.client,
+        "mix_type": order.mix_type,
+        "status": order.status,
+        "previous_status": previous_status,
+        "priority": order.priority,
+        "assigned_plant": order.assigned_plant,
+        "scheduled_time": order.scheduled_time.isoformat(),
+        "volume": order.volume
+    })
+
+OrdersService.add_listener(_publish_order_event)
+
+def _publish_stock_event(event: str, changes: List[StockChange]) -> None:
+    # One event per change, however many materials it touched
+    inventory_events.publish({
+        "type": event,
+        "materials": [{
+            "id": material.id,
+            "name": material.name,
+            "previous_stock": previous_stock,
+            "current_stock": material.current_stock,
+            "status": material.status,
+            "reason": reason
+        } for material, previous_stock, reason in changes]
+    })
+
+InventoryService.add_listener(_publish_stock_event)
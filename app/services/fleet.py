@@ -0,0 +1,284 @@
+import threading
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from datetime import datetime
+from app.models.schemas.fleet import Truck
+from app.models.schemas.orders import ConcreteOrder
+from app.services.orders import OrdersService, plant_key
+from app.repositories.registry import get_repository
+
+class FleetService:
+    """
+    Mixer truck fleet. Trucks follow the status of the order they serve, and
+    per-plant idle pools and state counters are updated on every move
+    """
+
+    # Serialises mutations so concurrent requests see consistent state
+    _lock = threading.RLock()
+
+    # Mock database for the truck fleet
+    _trucks_db = [
+        Truck(id=1, plate="MXR-101", home_plant="PLANTA 1", capacity=8.0, state="available"),
+        Truck(id=2, plate="MXR-102", home_plant="PLANTA 1", capacity=8.0, state="available"),
+        Truck(id=3, plate="MXR-103", home_plant="PLANTA 1", capacity=7.0, state="available"),
+        Truck(id=4, plate="MXR-104", home_plant="PLANTA 1", capacity=7.0, state="maintenance"),
+        Truck(id=5, plate="MXR-201", home_plant="PLANTA 2", capacity=8.0, state="available"),
+        Truck(id=6, plate="MXR-202", home_plant="PLANTA 2", capacity=8.0, state="available"),
+        Truck(id=7, plate="MXR-203", home_plant="PLANTA 2", capacity=8.0, state="available"),
+        Truck(id=8, plate="MXR-301", home_plant="PLANTA 3", capacity=6.0, state="maintenance")
+    ]
+
+    # Truck state while serving an order in each status; other statuses free the trucks
+    ORDER_TRUCK_STATES = {"preparing": "loading", "in_progress": "delivering"}
+
+    # States an idle truck can be put in by hand
+    MANUAL_STATES = ["available", "maintenance"]
+
+    _by_id: Dict[int, Truck] = {}
+    # plant key -> truck id -> available truck, longest idle first
+    _idle: Dict[str, Dict[int, Truck]] = {}
+    # order id -> trucks serving it
+    _by_order: Dict[int, List[Truck]] = {}
+    # plant key -> order id -> order whose trucks do not yet carry its volume, oldest first
+    _short: Dict[str, Dict[int, ConcreteOrder]] = {}
+    _state_counts: Dict[str, int] = {}
+
+    @staticmethod
+    def _count(truck: Truck, sign: int) -> None:
+        counts = FleetService._state_counts
+        counts[truck.state] = counts.get(truck.state, 0) + sign
+        if truck.state == "available":
+            pool = FleetService._idle.setdefault(plant_key(truck.home_plant), {})
+            if sign > 0:
+                pool[truck.id] = truck
+            else:
+                pool.pop(truck.id, None)
+        if truck.order_id is not None:
+            serving = FleetService._by_order.setdefault(truck.order_id, [])
+            if sign > 0:
+                serving.append(truck)
+            else:
+                serving.remove(truck)
+                if not serving:
+                    del FleetService._by_order[truck.order_id]
+
+    @staticmethod
+    def _set_state(truck: Truck, state: str, order_id: Optional[int]) -> bool:
+        """
+        Move a truck to a state and order, adjusting pools and counters
+        """
+        if truck.state == state and truck.order_id == order_id:
+            return False
+        FleetService._count(truck, -1)
+        truck.state = state
+        truck.order_id = order_id
+        truck.updated_at = datetime.now()
+        FleetService._count(truck, 1)
+        return True
+
+    @staticmethod
+    def rebuild_index() -> None:
+        """
+        Recompute every pool and counter from the truck list
+        """
+        with FleetService._lock:
+            FleetService._by_id = {truck.id: truck for truck in FleetService._trucks_db}
+            FleetService._idle = {}
+            FleetService._by_order = {}
+            FleetService._short = {}
+            FleetService._state_counts = {}
+            for truck in sorted(FleetService._trucks_db, key=lambda truck: truck.id):
+                FleetService._count(truck, 1)
+
+    @staticmethod
+    def load_from_repository() -> None:
+        """
+        Load trucks from the configured repository, seeding it with the mock data when empty
+        """
+        with FleetService._lock:
+            repository = get_repository("trucks")
+            trucks = repository.load_all()
+            if trucks:
+                FleetService._trucks_db = trucks
+            else:
+                repository.save_many(FleetService._trucks_db)
+            FleetService.rebuild_index()
+            FleetService.reconcile()
+
+    @staticmethod
+    def _sync_order(order: ConcreteOrder) -> List[Truck]:
+        """
+        Bring the trucks of one order in line with its status; returns the trucks changed
+        """
+        target = FleetService.ORDER_TRUCK_STATES.get(order.status)
+        key = plant_key(order.assigned_plant)
+        serving = list(FleetService._by_order.get(order.id, []))
+        if target is None:
+            FleetService._short.get(key, {}).pop(order.id, None)
+            released = [truck for truck in serving if FleetService._set_state(truck, "available", None)]
+            return released + FleetService._top_up({plant_key(truck.home_plant) for truck in released})
+
+        changed = [truck for truck in serving if FleetService._set_state(truck, target, order.id)]
+        # Take idle trucks from the order's plant until they carry its volume
+        carried = sum(truck.capacity for truck in serving)
+        for truck in list(FleetService._idle.get(key, {}).values()):
+            if carried >= order.volume:
+                break
+            FleetService._set_state(truck, target, order.id)
+            changed.append(truck)
+            carried += truck.capacity
+
+        if carried < order.volume:
+            FleetService._short.setdefault(key, {})[order.id] = order
+        else:
+            FleetService._short.get(key, {}).pop(order.id, None)
+        return changed
+
+    @staticmethod
+    def _top_up(keys: Iterable[str]) -> List[Truck]:
+        """
+        Hand trucks that just became idle to the oldest orders of their plant still short of capacity
+        """
+        changed = []
+        for key in keys:
+            for order in list(FleetService._short.get(key, {}).values()):
+                if not FleetService._idle.get(key):
+                    break
+                changed.extend(FleetService._sync_order(order))
+        return changed
+
+    @staticmethod
+    def reconcile() -> None:
+        """
+        Release trucks held by orders that no longer need them and assign
+        trucks to orders being prepared or poured that have none
+        """
+        with FleetService._lock:
+            changed = []
+            for order_id in list(FleetService._by_order):
+                order = OrdersService.get_order_by_id(order_id)
+                if order is None:
+                    changed.extend(truck for truck in list(FleetService._by_order[order_id])
+                                   if FleetService._set_state(truck, "available", None))
+                else:
+                    changed.extend(FleetService._sync_order(order))
+            for status in FleetService.ORDER_TRUCK_STATES:
+                for order in OrdersService.get_orders_by_status(status):
+                    changed.extend(FleetService._sync_order(order))
+            get_repository("trucks").save_many(changed)
+
+    @staticmethod
+    def on_order_event(event: str, order: Optional[ConcreteOrder], previous_status: Optional[str]) -> None:
+        """
+        Dispatch, advance or release trucks as orders move through their statuses
+        """
+        if event == "reloaded":
+            FleetService.reconcile()
+            return
+        if order is None:
+            return
+        with FleetService._lock:
+            changed = FleetService._sync_order(order)
+            if changed:
+                get_repository("trucks").save_many(changed)
+
+    @staticmethod
+    def get_all_trucks(plant: Optional[str] = None, state: Optional[str] = None) -> List[Truck]:
+        """
+        Get trucks, optionally by home plant and state
+        """
+        key = plant_key(plant) if plant else None
+        return [truck for truck in FleetService._trucks_db
+                if (key is None or plant_key(truck.home_plant) == key)
+                and (not state or truck.state == state)]
+
+    @staticmethod
+    def get_truck_by_id(truck_id: int) -> Optional[Truck]:
+        """
+        Get truck by ID in O(1)
+        """
+        return FleetService._by_id.get(truck_id)
+
+    @staticmethod
+    def get_trucks_for_order(order_id: int) -> List[Truck]:
+        """
+        Trucks currently serving an order
+        """
+        return list(FleetService._by_order.get(order_id, []))
+
+    @staticmethod
+    def count_available(plant: str) -> int:
+        """
+        Available trucks based at a plant, in O(1)
+        """
+        return len(FleetService._idle.get(plant_key(plant), {}))
+
+    @staticmethod
+    def count_by_state(state: str) -> int:
+        return FleetService._state_counts.get(state, 0)
+
+    @staticmethod
+    def count_active() -> int:
+        """
+        Trucks loading or delivering an order
+        """
+        return sum(FleetService.count_by_state(state) for state in FleetService.ORDER_TRUCK_STATES.values())
+
+    @staticmethod
+    def set_truck_state(truck_id: int, state: str) -> Tuple[Optional[Truck], Optional[str]]:
+        """
+        Put an idle truck in or out of maintenance; a truck back from maintenance
+        goes straight to an order short of trucks, if any. Returns (truck, error)
+        """
+        if state not in FleetService.MANUAL_STATES:
+            return None, f"State must be one of: {', '.join(FleetService.MANUAL_STATES)}"
+        with FleetService._lock:
+            truck = FleetService._by_id.get(truck_id)
+            if truck is None:
+                return None, None
+            if truck.order_id is not None:
+                return truck, f"Truck is serving order {truck.order_id}"
+            if FleetService._set_state(truck, state, None):
+                changed = [truck]
+                if state == "available":
+                    changed.extend(FleetService._top_up([plant_key(truck.home_plant)]))
+                get_repository("trucks").save_many(changed)
+            return truck, None
+
+    @staticmethod
+    def get_fleet_summary(plants: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Fleet counters by state, and available trucks per plant
+        """
+        return {
+            "total_trucks": len(FleetService._by_id),
+            "available": FleetService.count_by_state("available"),
+            "active": FleetService.count_active(),
+            "maintenance": FleetService.count_by_state("maintenance"),
+            "available_by_plant": {plant: FleetService.count_available(plant) for plant in plants}
+        }
+
+    @staticmethod
+    def check_counters() -> bool:
+        """
+        Recompute pools and counters from scratch and compare
+        """
+        with FleetService._lock:
+            idle: Dict[str, set] = {}
+            by_order: Dict[int, set] = {}
+            counts: Dict[str, int] = {}
+            for truck in FleetService._trucks_db:
+                counts[truck.state] = counts.get(truck.state, 0) + 1
+                if truck.state == "available":
+                    idle.setdefault(plant_key(truck.home_plant), set()).add(truck.id)
+                if truck.order_id is not None:
+                    by_order.setdefault(truck.order_id, set()).add(truck.id)
+            return (
+                {plant: set(pool) for plant, pool in FleetService._idle.items() if pool} == idle
+                and {order_id: {truck.id for truck in trucks}
+                     for order_id, trucks in FleetService._by_order.items()} == by_order
+                and {state: count for state, count in FleetService._state_counts.items() if count} == counts
+            )
+
+FleetService.rebuild_index()
+FleetService.reconcile()
+OrdersService.add_listener(FleetService.on_order_event)
@@ -0,0 +1,134 @@
+from typing import List, Optional, Dict, Any
+from datetime import datetime, date, timedelta
+import numpy as np
+from app.services.inventory import InventoryService
+from app.services.orders import OrdersService
+
+class ForecastService:
+    """
+    Day-by-day stock projection and restock planning for all materials at once
+    """
+
+    @staticmethod
+    def _scheduled_demand(start: date, horizon: int, materials: List[str]) -> np.ndarray:
+        """
+        (horizon x material) demand of the active orders, by the day they pour.
+        Overdue orders still pending count against the first day
+        """
+        mixes, recipe_materials, requirements = InventoryService.get_requirements_matrix()
+        end = datetime.combine(start + timedelta(days=horizon), datetime.min.time())
+
+        days, mix_index, volumes = [], [], []
+        for status in OrdersService.ACTIVE_STATUSES:
+            for order in OrdersService.get_orders_by_status(status):
+                if order.scheduled_time >= end or order.mix_type not in mixes:
+                    continue
+                days.append(max((order.scheduled_time.date() - start).days, 0))
+                mix_index.append(mixes[order.mix_type])
+                volumes.append(order.volume)
+
+        volume_matrix = np.zeros((horizon, len(mixes)))
+        np.add.at(volume_matrix, (np.array(days, dtype=int), np.array(mix_index, dtype=int)),
+                  np.array(volumes, dtype=float))
+        by_recipe_material = volume_matrix @ requirements
+
+        # Re-order the recipe columns to the inventory's material order
+        demand = np.zeros((horizon, len(materials)))
+        columns = {name: index for index, name in enumerate(recipe_materials)}
+        for index, name in enumerate(materials):
+            if name in columns:
+                demand[:, index] = by_recipe_material[:, columns[name]]
+        return demand
+
+    @staticmethod
+    def plan_restocks(horizon: int = 90, history_window: int = 30,
+                      start: Optional[date] = None, include_projection: bool = False) -> Dict[str, Any]:
+        """
+        Project stock over `horizon` days and propose restocks up to max_stock.
+
+        Daily demand per material is the larger of what the scheduled orders
+        need that day and the average daily usage over the last
+        `history_window` days, so far-off days with a sparse schedule still
+        draw down stock. Whenever a material would end a day below min_stock
+        it is topped up to max_stock that day.
+        """
+        start = start or datetime.now().date()
+        materials = InventoryService.get_all_materials()
+        names = [material.name for material in materials]
+
+        initial = np.array([material.current_stock for material in materials], dtype=float)
+        min_stock = np.array([material.min_stock for material in materials], dtype=float)
+        max_stock = np.array([material.max_stock for material in materials], dtype=float)
+        cost = np.array([material.cost_per_unit for material in materials], dtype=float)
+
+        average = InventoryService.get_average_daily_usage(history_window, start - timedelta(days=1))
+        baseline = np.array([average.get(material.id, 0.0) for material in materials], dtype=float)
+        demand = np.maximum(ForecastService._scheduled_demand(start, horizon, names), baseline)
+
+        stock = initial.copy()
+        restocks = np.zeros((horizon, len(materials)))
+        projection = np.zeros((horizon, len(materials)))
+        for day in range(horizon):
+            stock -= demand[day]
+            restocks[day] = np.where(stock < min_stock, max_stock - stock, 0.0)
+            stock += restocks[day]
+            projection[day] = stock
+
+        # Without restocks: first day each material drops below min_stock and below zero
+        unreplenished = initial - np.cumsum(demand, axis=0)
+        below_min = unreplenished < min_stock
+        below_zero = unreplenished < 0
+
+        def first_day(mask: np.ndarray, column: int) -> Optional[date]:
+            if not mask[:, column].any():
+                return None
+            return start + timedelta(days=int(mask[:, column].argmax()))
+
+        plan = []
+        suppliers: Dict[str, Dict[str, Any]] = {}
+        for column, material in enumerate(materials):
+            restock_days = np.flatnonzero(restocks[:, column])
+            entry = {
+                "material_id": material.id,
+                "name": material.name,
+                "unit": material.unit,
+                "supplier": material.supplier,
+                "current_stock": material.current_stock,
+                "min_stock": material.min_stock,
+                "max_stock": material.max_stock,
+                "avg_daily_demand": round(float(demand[:, column].mean()), 2),
+                "reaches_min_stock": first_day(below_min, column),
+                "stock_out": first_day(below_zero, column),
+                "restocks": [{"date": start + timedelta(days=int(day)),
+                              "quantity": round(float(restocks[day, column]), 2)}
+                             for day in restock_days],
+                "total_restock": round(float(restocks[:, column].sum()), 2),
+                "estimated_cost": round(float(restocks[:, column].sum() * cost[column]), 2)
+            }
+            if include_projection:
+                entry["projection"] = np.round(projection[:, column], 2).tolist()
+            plan.append(entry)
+
+            if entry["restocks"]:
+                supplier = suppliers.setdefault(material.supplier, {
+                    "supplier": material.supplier,
+                    "first_delivery": entry["restocks"][0]["date"],
+                    "estimated_cost": 0.0,
+                    "materials": []
+                })
+                supplier["first_delivery"] = min(supplier["first_delivery"], entry["restocks"][0]["date"])
+                supplier["estimated_cost"] = round(supplier["estimated_cost"] + entry["estimated_cost"], 2)
+                supplier["materials"].append({
+                    "name": material.name,
+                    "unit": material.unit,
+                    "quantity": entry["total_restock"],
+                    "first_needed": entry["restocks"][0]["date"]
+                })
+
+        return {
+            "from": start,
+            "horizon_days": horizon,
+            "history_window": history_window,
+            "materials": plan,
+            "suppliers": sorted(suppliers.values(), key=lambda s: (s["first_delivery"], s["supplier"]))
+        }
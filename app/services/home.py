@@ -1,6 +1,7 @@
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from app.models.schemas.home import ConcreteOrder, ConcreteMix, Project, Client
+from app.services.fleet import FleetService
 
 class HomeService:
     """
@@ -212,6 +213,6 @@ class HomeService:
             "monthly_revenue": 42500.75,
             "avg_delivery_time": "2.5 horas",
             "completion_rate": 94.5,
-            "active_trucks": 8,
+            "active_trucks": FleetService.count_active(),
             "available_pumps": 3
         }
\ No newline at end of file
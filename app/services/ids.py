@@ -0,0 +1,60 @@
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+class IdAllocator:
+    """
+    Thread-safe monotonic id sequences, one per entity.
+
+    Unbound, the sequences live in this process. Bound to a shared source
+    (the SQLite id_sequences table), ids are reserved from it in blocks, so
+    several processes on one database never hand out the same id.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last: Dict[str, int] = {}
+        self._sequences = None
+        self._block_size = 1
+        # entity -> (last id handed out, last id of the reserved block)
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+
+    def bind(self, sequences: Optional[object], block_size: int = 32) -> None:
+        """
+        Draw ids from a shared source with reserve/raise_floor, or from this process when None
+        """
+        with self._lock:
+            self._sequences = sequences
+            self._block_size = max(block_size, 1)
+            self._blocks.clear()
+            if sequences is not None:
+                for entity, last in self._last.items():
+                    sequences.raise_floor(entity, last)
+
+    def reset(self, entity: str, existing_ids: Iterable[int]) -> None:
+        """
+        Restart a sequence after the highest id already in use
+        """
+        with self._lock:
+            self._last[entity] = max(existing_ids, default=0)
+            if self._sequences is not None:
+                self._sequences.raise_floor(entity, self._last[entity])
+                self._blocks.pop(entity, None)
+
+    def next(self, entity: str) -> int:
+        """
+        Allocate the next id; never reused, even after deletions
+        """
+        with self._lock:
+            if self._sequences is None:
+                value = self._last.get(entity, 0) + 1
+            else:
+                value, end = self._blocks.get(entity, (0, 0))
+                value += 1
+                if value > end:
+                    end = self._sequences.reserve(entity, self._block_size)
+                    value = end - self._block_size + 1
+                self._blocks[entity] = (value, end)
+            self._last[entity] = max(self._last.get(entity, 0), value)
+            return value
+
+id_allocator = IdAllocator()
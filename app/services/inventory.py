@@ -1,12 +1,27 @@
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+import math
+import threading
+from typing import List, Optional, Dict, Any, Tuple, Iterable, Callable
+from datetime import datetime, date, timedelta
+import numpy as np
 from app.models.schemas.inventory import Material, MaterialUsage
+from app.models.schemas.orders import ConcreteOrder
+from app.repositories.journal import StockJournal
+from app.repositories.registry import get_repository
+from app.services.orders import OrdersService
+from app.services.timeutils import to_local
+from app.services.usage_history import UsageHistory
+
+# A stock change as seen by listeners: (material, previous stock, reason)
+StockChange = Tuple[Material, float, Optional[str]]
 
 class InventoryService:
     """
     Service class for materials inventory management
     """
     
+    # Serialises mutations so concurrent requests see consistent state
+    _lock = threading.RLock()
+    
     # Mock database for materials
     _materials_db = [
         Material(
@@ -65,11 +80,11 @@ class InventoryService:
             id=5,
             name="CMTO",
             description="Cemento Portland Tipo I",
-            current_stock=3200.0,  # kg
-            min_stock=1000.0,
-            max_stock=5000.0,
-            unit="kg",
-            cost_per_unit=0.35,
+            current_stock=320.0,  # t
+            min_stock=100.0,
+            max_stock=500.0,
+            unit="t",
+            cost_per_unit=350.00,
             supplier="Cementos Nacionales",
             last_restock=datetime.now() - timedelta(days=3),
             status="optimal"
@@ -102,8 +117,32 @@ class InventoryService:
         )
     ]
     
-    # Material usage data
-    _usage_data = [
+    # Id and name -> material indexes, rebuilt whenever _materials_db is replaced
+    _materials_by_id = {material.id: material for material in _materials_db}
+    _materials_by_name = {material.name: material for material in _materials_db}
+    
+    # Callbacks notified once per stock change, however many materials it touches
+    _listeners: List[Callable[[str, List[StockChange]], None]] = []
+    
+    # Durable stock movement journal; None until opened at startup
+    _journal: Optional[StockJournal] = None
+    
+    # Running summary aggregates: materials per status and total stock value
+    _status_counts: Dict[str, int] = {}
+    _inventory_value = 0.0
+    
+    # Reservation ledger: quantities held per active order, and their per-material totals
+    _reservations: Dict[int, Dict[str, float]] = {}
+    _reserved: Dict[str, float] = {}
+    
+    # Active orders whose mix could not be fully reserved -> materials that were short
+    _unreserved: Dict[int, List[str]] = {}
+    
+    # Completed orders that needed more than the unreserved stock -> material -> quantity missing
+    _shortfalls: Dict[int, Dict[str, float]] = {}
+    
+    # Material usage history, stored column-wise
+    _usage_history = UsageHistory([
         MaterialUsage(
             material_id=1,
             date=datetime.now().date(),
@@ -121,13 +160,17 @@ class InventoryService:
         MaterialUsage(
             material_id=5,
             date=datetime.now().date(),
-            quantity_used=1200.0,
+            quantity_used=1.2,
             project="Hospital Regional",
             mix_type="C-35"
         )
-    ]
+    ])
     
-    # Material requirements for different mix types (kg per m³ of concrete)
+    # Rolling windows (days) reported by the usage overview by default
+    USAGE_WINDOWS = (7, 30)
+    
+    # Material requirements for different mix types (kg per m³ of concrete),
+    # converted to each material's stock unit on use
     _mix_requirements = {
         "C-20": {
             "ARENA": 800,  # kg/m³
@@ -162,6 +205,116 @@ class InventoryService:
         }
     }
     
+    # Kilograms in one stock unit, for materials stocked by weight
+    KG_PER_UNIT = {"kg": 1.0, "t": 1000.0}
+    
+    # Bulk density (kg/m³) of the materials stocked by volume
+    BULK_DENSITY = {"ARENA": 1600.0, "AGUA": 1000.0, "GRAVA": 1500.0}
+    
+    @staticmethod
+    def load_from_repository() -> None:
+        """
+        Load materials from the configured repository, seeding it with the mock data when empty
+        """
+        with InventoryService._lock:
+            repository = get_repository("materials")
+            materials = repository.load_all()
+            if materials:
+                InventoryService._materials_db = materials
+                InventoryService._materials_by_id = {material.id: material for material in materials}
+                InventoryService._materials_by_name = {material.name: material for material in materials}
+                # Stock units may differ from the mock data, and the compiled recipes depend on them
+                InventoryService._requirements_matrix = None
+            else:
+                repository.save_many(InventoryService._materials_db)
+            InventoryService.rebuild_summary_counters()
+            InventoryService.rebuild_reservations()
+    
+    @staticmethod
+    def add_listener(listener: Callable[[str, List[StockChange]], None]) -> None:
+        """
+        Register a callback for stock changes
+        """
+        InventoryService._listeners.append(listener)
+    
+    @staticmethod
+    def _notify(event: str, changes: List[StockChange]) -> None:
+        for listener in InventoryService._listeners:
+            listener(event, changes)
+    
+    @staticmethod
+    def open_journal(directory: str, flush_interval: float = 0.2, snapshot_every: int = 1000,
+                     restore: bool = True) -> None:
+        """
+        Open the stock journal. With restore, stock is rebuilt from it: latest
+        snapshot plus the movements recorded after it. Without, the loaded
+        stock stands and the journal gets a reconciling entry wherever it
+        lags behind. Materials it has never seen get a baseline entry
+        """
+        with InventoryService._lock:
+            InventoryService.close_journal()
+            journal = StockJournal(directory, flush_interval, snapshot_every)
+            recovered = journal.state
+            if not journal.has_history:
+                journal.initialize({material.id: material.current_stock
+                                    for material in InventoryService._materials_db})
+            else:
+                restored = []
+                reconciled = 0
+                for material in InventoryService._materials_db:
+                    if material.id not in recovered:
+                        journal.append(material.id, material.current_stock, reason="baseline")
+                    elif recovered[material.id] == material.current_stock:
+                        continue
+                    elif restore:
+                        InventoryService._set_stock(material, recovered[material.id])
+                        restored.append(material)
+                    else:
+                        journal.append(material.id, material.current_stock, recovered[material.id],
+                                       reason="reconciled with the database", event="reconciled")
+                        reconciled += 1
+                get_repository("materials").save_many(restored)
+                if reconciled:
+                    print(f"⚠️  Stock journal was behind the database for {reconciled} materials; reconciled")
+            InventoryService._journal = journal
+    
+    @staticmethod
+    def close_journal() -> None:
+        """
+        Flush and close the stock journal
+        """
+        with InventoryService._lock:
+            if InventoryService._journal is not None:
+                InventoryService._journal.close()
+                InventoryService._journal = None
+    
+    @staticmethod
+    def _journal_changes(event: str, changes: List[StockChange]) -> None:
+        journal = InventoryService._journal
+        if journal is None:
+            return
+        for material, previous_stock, reason in changes:
+            journal.append(material.id, material.current_stock, previous_stock, reason, event)
+    
+    @staticmethod
+    def get_stock_at(moment: datetime) -> Optional[List[Dict[str, Any]]]:
+        """
+        Stock of every material at a past moment, rebuilt from the journal;
+        None when there is no journal history that far back
+        """
+        journal = InventoryService._journal
+        if journal is None:
+            return None
+        state = journal.state_at(to_local(moment))
+        if state is None:
+            return None
+        return [{
+            "material_id": material.id,
+            "name": material.name,
+            "unit": material.unit,
+            "stock": state.get(material.id)
+        } for material in InventoryService._materials_db]
+    
     @staticmethod
     def get_all_materials() -> List[Material]:
         """
@@ -174,8 +327,14 @@ class InventoryService:
         """
         Get material by ID
         """
-        return next((material for material in InventoryService._materials_db 
-                    if material.id == material_id), None)
+        return InventoryService._materials_by_id.get(material_id)
+    
+    @staticmethod
+    def get_material_by_name(name: str) -> Optional[Material]:
+        """
+        Get material by name
+        """
+        return InventoryService._materials_by_name.get(name)
     
     @staticmethod
     def get_materials_by_status(status: str) -> List[Material]:
@@ -186,25 +345,295 @@ class InventoryService:
                 if material.status == status]
     
     @staticmethod
-    def update_material_stock(material_id: int, new_stock: float) -> bool:
+    def _check_stock(new_stock: float) -> Optional[str]:
         """
-        Update material stock and recalculate status
+        Error message for a stock level that cannot be stored, else None
         """
-        material = InventoryService.get_material_by_id(material_id)
-        if material:
-            material.current_stock = new_stock
-            # Update status based on stock levels
-            stock_percentage = (new_stock / material.max_stock) * 100
-            if stock_percentage <= 15:
-                material.status = "critical"
-            elif stock_percentage <= 30:
-                material.status = "low"
-            elif stock_percentage <= 80:
-                material.status = "optimal"
-            else:
-                material.status = "high"
+        if not math.isfinite(new_stock):
+            return "Stock must be a finite number"
+        if new_stock < 0:
+            return "Stock cannot be negative"
+        return None
+    
+    @staticmethod
+    def update_material_stock(material_id: int, new_stock: float, reason: Optional[str] = None) -> bool:
+        """
+        Update material stock and recalculate status. Raises ValueError for an invalid stock level
+        """
+        with InventoryService._lock:
+            material = InventoryService.get_material_by_id(material_id)
+            if material:
+                error = InventoryService._check_stock(new_stock)
+                if error:
+                    raise ValueError(error)
+                previous_stock = material.current_stock
+                InventoryService._set_stock(material, new_stock)
+                get_repository("materials").save(material)
+                InventoryService._notify("stock_updated", [(material, previous_stock, reason)])
+                return True
+            return False
+    
+    @staticmethod
+    def bulk_update_stock(updates: List[Tuple[int, float, Optional[str]]]) -> Tuple[List[Material], List[Tuple[int, str]]]:
+        """
+        Apply many (material_id, new_stock, reason) updates as one change: all of
+        them or, if any entry is invalid or persisting fails, none
+        """
+        with InventoryService._lock:
+            errors = []
+            seen = set()
+            for index, (material_id, new_stock, reason) in enumerate(updates):
+                stock_error = InventoryService._check_stock(new_stock)
+                if material_id not in InventoryService._materials_by_id:
+                    errors.append((index, f"Material {material_id} not found"))
+                elif material_id in seen:
+                    errors.append((index, f"Material {material_id} appears more than once"))
+                elif stock_error:
+                    errors.append((index, stock_error))
+                seen.add(material_id)
+            if errors or not updates:
+                return [], errors
+            
+            changes: List[StockChange] = []
+            previous_status = {}
+            for material_id, new_stock, reason in updates:
+                material = InventoryService._materials_by_id[material_id]
+                changes.append((material, material.current_stock, reason))
+                previous_status[material_id] = material.status
+                InventoryService._set_stock(material, new_stock)
+            
+            try:
+                get_repository("materials").save_many(material for material, _, _ in changes)
+            except Exception:
+                # Put memory back exactly as it was, including the stored status
+                for material, previous_stock, _ in changes:
+                    InventoryService._count_material(material, -1)
+                    material.current_stock = previous_stock
+                    material.status = previous_status[material.id]
+                    InventoryService._count_material(material, 1)
+                raise
+            
+            InventoryService._notify("stock_updated", changes)
+            return [material for material, _, _ in changes], []
+    
+    @staticmethod
+    def _set_stock(material: Material, new_stock: float) -> None:
+        """
+        Set stock and reclassify in memory, keeping the summary counters in step;
+        callers persist and notify
+        """
+        InventoryService._count_material(material, -1)
+        material.current_stock = new_stock
+        # Update status based on stock levels
+        stock_percentage = (new_stock / material.max_stock) * 100
+        if stock_percentage <= 15:
+            material.status = "critical"
+        elif stock_percentage <= 30:
+            material.status = "low"
+        elif stock_percentage <= 80:
+            material.status = "optimal"
+        else:
+            material.status = "high"
+        InventoryService._count_material(material, 1)
+    
+    @staticmethod
+    def _count_material(material: Material, sign: int) -> None:
+        counts = InventoryService._status_counts
+        counts[material.status] = counts.get(material.status, 0) + sign
+        InventoryService._inventory_value += sign * material.current_stock * material.cost_per_unit
+    
+    @staticmethod
+    def _compute_summary_counters() -> Tuple[Dict[str, int], float]:
+        counts: Dict[str, int] = {}
+        value = 0.0
+        for material in InventoryService._materials_db:
+            counts[material.status] = counts.get(material.status, 0) + 1
+            value += material.current_stock * material.cost_per_unit
+        return counts, value
+    
+    @staticmethod
+    def rebuild_summary_counters() -> None:
+        """
+        Recompute the status counts and total value from scratch
+        """
+        with InventoryService._lock:
+            InventoryService._status_counts, InventoryService._inventory_value = \
+                InventoryService._compute_summary_counters()
+    
+    @staticmethod
+    def check_summary_consistency() -> bool:
+        """
+        Recompute the summary aggregates from scratch and compare
+        """
+        with InventoryService._lock:
+            counts, value = InventoryService._compute_summary_counters()
+            running = {status: count for status, count in InventoryService._status_counts.items() if count}
+            return running == counts and math.isclose(InventoryService._inventory_value, value,
+                                                      rel_tol=1e-9, abs_tol=1e-6)
+    
+    @staticmethod
+    def get_reserved_stock(name: str) -> float:
+        """
+        Quantity of a material held by active orders
+        """
+        return InventoryService._reserved.get(name, 0.0)
+    
+    @staticmethod
+    def get_available_stock(name: str) -> float:
+        """
+        Stock of a material not held by any reservation
+        """
+        material = InventoryService._materials_by_name.get(name)
+        if material is None:
+            return 0.0
+        return material.current_stock - InventoryService._reserved.get(name, 0.0)
+    
+    @staticmethod
+    def reserve_for_order(order: ConcreteOrder) -> bool:
+        """
+        Hold the materials of an order's mix: all of them or none
+        """
+        with InventoryService._lock:
+            if order.id in InventoryService._reservations:
+                return True
+            
+            requirements = InventoryService.calculate_material_requirements(order.mix_type, order.volume)
+            short = [name for name, quantity in requirements.items()
+                     if quantity > InventoryService.get_available_stock(name) + 1e-9]
+            if short:
+                InventoryService._unreserved[order.id] = short
+                return False
+            
+            for name, quantity in requirements.items():
+                InventoryService._reserved[name] = InventoryService._reserved.get(name, 0.0) + quantity
+            InventoryService._reservations[order.id] = requirements
+            InventoryService._unreserved.pop(order.id, None)
             return True
-        return False
+    
+    @staticmethod
+    def get_shortage(order_id: int) -> List[str]:
+        """
+        Materials an order could not reserve; empty when it is fully reserved
+        """
+        with InventoryService._lock:
+            return list(InventoryService._unreserved.get(order_id, []))
+    
+    @staticmethod
+    def release_for_order(order_id: int) -> Dict[str, float]:
+        """
+        Drop an order's reservation and return what it held
+        """
+        with InventoryService._lock:
+            InventoryService._unreserved.pop(order_id, None)
+            held = InventoryService._reservations.pop(order_id, {})
+            for name, quantity in held.items():
+                remaining = InventoryService._reserved.get(name, 0.0) - quantity
+                if remaining > 1e-9:
+                    InventoryService._reserved[name] = remaining
+                else:
+                    InventoryService._reserved.pop(name, None)
+            return held
+    
+    @staticmethod
+    def consume_for_order(order: ConcreteOrder) -> Dict[str, float]:
+        """
+        Deduct a completed order's materials from stock and record them as usage.
+        An order is never given stock held by other orders: whatever its recipe
+        needed beyond the unreserved stock is recorded as a shortfall instead.
+        Returns what was taken from stock
+        """
+        with InventoryService._lock:
+            required = (InventoryService.release_for_order(order.id)
+                        or InventoryService.calculate_material_requirements(order.mix_type, order.volume))
+            day = (order.completed_at or datetime.now()).date()
+            changes: List[StockChange] = []
+            consumed: Dict[str, float] = {}
+            shortfall: Dict[str, float] = {}
+            for name, quantity in required.items():
+                material = InventoryService._materials_by_name.get(name)
+                if material is None:
+                    shortfall[name] = quantity
+                    continue
+                taken = min(quantity, max(InventoryService.get_available_stock(name), 0.0))
+                if quantity - taken > 1e-9:
+                    shortfall[name] = quantity - taken
+                if taken <= 0:
+                    continue
+                consumed[name] = taken
+                changes.append((material, material.current_stock, f"Order {order.id}"))
+                InventoryService._set_stock(material, material.current_stock - taken)
+                InventoryService.record_usage(material.id, day, taken, order.mix_type, order.project_name)
+            if shortfall:
+                InventoryService._shortfalls[order.id] = shortfall
+            if changes:
+                get_repository("materials").save_many(material for material, _, _ in changes)
+                InventoryService._notify("consumed", changes)
+            return consumed
+    
+    @staticmethod
+    def rebuild_reservations() -> None:
+        """
+        Rebuild the ledger from the active orders, earliest pour first
+        """
+        with InventoryService._lock:
+            InventoryService._reservations = {}
+            InventoryService._reserved = {}
+            InventoryService._unreserved = {}
+            active = [order for status in OrdersService.ACTIVE_STATUSES
+                      for order in OrdersService.get_orders_by_status(status)]
+            for order in sorted(active, key=lambda order: order.scheduled_time):
+                InventoryService.reserve_for_order(order)
+    
+    @staticmethod
+    def on_order_event(event: str, order: Optional[ConcreteOrder], previous_status: Optional[str]) -> None:
+        """
+        Reserve on creation, consume on completion, release on cancellation
+        """
+        if event == "reloaded":
+            InventoryService.rebuild_reservations()
+            return
+        if order is None:
+            return
+        
+        if order.status in OrdersService.ACTIVE_STATUSES:
+            InventoryService.reserve_for_order(order)
+        elif order.status == "completed":
+            if previous_status != "completed":
+                InventoryService.consume_for_order(order)
+        else:
+            InventoryService.release_for_order(order.id)
+    
+    @staticmethod
+    def get_reservations() -> Dict[str, Any]:
+        """
+        Get reserved and available stock per material, the active orders left
+        unreserved and the completed orders that ran short
+        """
+        with InventoryService._lock:
+            materials = [{
+                "name": material.name,
+                "unit": material.unit,
+                "current_stock": material.current_stock,
+                "reserved": round(InventoryService.get_reserved_stock(material.name), 2),
+                "available": round(InventoryService.get_available_stock(material.name), 2)
+            } for material in InventoryService._materials_db]
+            
+            return {
+                "materials": materials,
+                "reserved_orders": len(InventoryService._reservations),
+                "unreserved_orders": [{"order_id": order_id, "short_materials": short}
+                                      for order_id, short in sorted(InventoryService._unreserved.items())],
+                "shortfalls": [{"order_id": order_id,
+                                "missing": {name: round(quantity, 2) for name, quantity in missing.items()}}
+                               for order_id, missing in sorted(InventoryService._shortfalls.items())]
+            }
+    
+    @staticmethod
+    def record_usage(material_id: int, day: date, quantity: float, mix_type: str, project: str) -> None:
+        """
+        Append a usage record, in the material's stock unit, to the history
+        """
+        InventoryService._usage_history.append(material_id, day, quantity, mix_type, project)
     
     @staticmethod
     def get_material_usage(material_id: int) -> Optional[Dict[str, Any]]:
@@ -216,10 +645,10 @@ class InventoryService:
             return None
         
         # Calculate usage for last 7 days
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_usage = [usage for usage in InventoryService._usage_data 
-                       if usage.material_id == material_id and 
-                       usage.date >= week_ago.date()]
+        today = datetime.now().date()
+        recent_usage = InventoryService._usage_history.records(
+            material_id, today - timedelta(days=7), today
+        )
         
         total_used = sum(usage.quantity_used for usage in recent_usage)
         avg_daily_usage = total_used / 7 if recent_usage else 0
@@ -235,45 +664,175 @@ class InventoryService:
             "recent_usage": recent_usage
         }
     
+    @staticmethod
+    def get_average_daily_usage(window: int, as_of: Optional[date] = None) -> Dict[int, float]:
+        """
+        Average daily usage per material id over the `window` days ending at as_of
+        """
+        as_of = as_of or datetime.now().date()
+        totals = InventoryService._usage_history.totals_by_material(as_of - timedelta(days=window - 1), as_of)
+        return {material_id: used / window for material_id, used in totals.items()}
+    
+    @staticmethod
+    def get_usage_overview(windows: Iterable[int] = USAGE_WINDOWS,
+                           as_of: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Rolling usage totals, daily averages and days of stock remaining for
+        every material, one vectorised pass over the history per window
+        """
+        as_of = as_of or datetime.now().date()
+        windows = sorted(set(windows))
+        totals = {window: InventoryService._usage_history.totals_by_material(
+                      as_of - timedelta(days=window - 1), as_of)
+                  for window in windows}
+        
+        materials = []
+        for material in InventoryService._materials_db:
+            stats = {}
+            for window in windows:
+                used = totals[window].get(material.id, 0.0)
+                avg_daily = used / window
+                stats[str(window)] = {
+                    "total_used": round(used, 2),
+                    "avg_daily_usage": round(avg_daily, 2),
+                    # None when the material was not used in the window
+                    "days_remaining": round(material.current_stock / avg_daily, 1) if avg_daily > 0 else None
+                }
+            materials.append({
+                "material_id": material.id,
+                "name": material.name,
+                "unit": material.unit,
+                "current_stock": material.current_stock,
+                "windows": stats
+            })
+        
+        return {
+            "as_of": as_of,
+            "windows": windows,
+            "materials": materials
+        }
+    
     @staticmethod
     def get_inventory_summary() -> Dict[str, Any]:
         """
         Get inventory summary statistics
         """
-        total_materials = len(InventoryService._materials_db)
-        critical_materials = len(InventoryService.get_materials_by_status("critical"))
-        low_materials = len(InventoryService.get_materials_by_status("low"))
-        optimal_materials = len(InventoryService.get_materials_by_status("optimal"))
-        
-        total_inventory_value = sum(
-            material.current_stock * material.cost_per_unit 
-            for material in InventoryService._materials_db
-        )
+        counts = InventoryService._status_counts
+        critical_materials = counts.get("critical", 0)
+        low_materials = counts.get("low", 0)
         
         return {
-            "total_materials": total_materials,
+            "total_materials": len(InventoryService._materials_db),
             "critical_materials": critical_materials,
             "low_materials": low_materials,
-            "optimal_materials": optimal_materials,
-            "total_inventory_value": round(total_inventory_value, 2),
+            "optimal_materials": counts.get("optimal", 0),
+            "total_inventory_value": round(InventoryService._inventory_value, 2),
             "needs_restock": critical_materials + low_materials
         }
     
+    # Dense mix x material matrix compiled from _mix_requirements; None when stale
+    _requirements_matrix: Optional[Tuple[Dict[str, int], List[str], np.ndarray]] = None
+    
+    @staticmethod
+    def set_mix_requirements(mix_type: str, requirements: Dict[str, float]) -> None:
+        """
+        Replace the recipe (kg per m³) of a mix type and invalidate the compiled matrix
+        """
+        with InventoryService._lock:
+            InventoryService._mix_requirements[mix_type] = dict(requirements)
+            InventoryService._requirements_matrix = None
+    
+    @staticmethod
+    def get_requirements_matrix() -> Tuple[Dict[str, int], List[str], np.ndarray]:
+        """
+        Get (mix index, material names, matrix) where matrix[mix, material] is
+        the quantity per m³ in the material's stock unit; compiled once per recipe change
+        """
+        compiled = InventoryService._requirements_matrix
+        if compiled is None:
+            recipes = {mix_type: InventoryService.get_stock_recipe(mix_type)
+                       for mix_type in InventoryService._mix_requirements}
+            mixes = {mix_type: index for index, mix_type in enumerate(recipes)}
+            materials = sorted({name for recipe in recipes.values() for name in recipe})
+            columns = {name: index for index, name in enumerate(materials)}
+            
+            matrix = np.zeros((len(mixes), len(materials)))
+            for mix_type, recipe in recipes.items():
+                for name, quantity in recipe.items():
+                    matrix[mixes[mix_type], columns[name]] = quantity
+            
+            compiled = InventoryService._requirements_matrix = (mixes, materials, matrix)
+        return compiled
+    
+    @staticmethod
+    def calculate_demand(demands: Iterable[Tuple[str, str, float]]) -> Dict[str, Any]:
+        """
+        Material demand for (group, mix_type, volume) entries as one matrix product:
+        a group x mix volume matrix times the mix x material requirements matrix
+        """
+        mixes, materials, matrix = InventoryService.get_requirements_matrix()
+        
+        groups: Dict[str, int] = {}
+        group_index, mix_index, volumes = [], [], []
+        unknown_mixes = set()
+        for group, mix_type, volume in demands:
+            if mix_type not in mixes:
+                unknown_mixes.add(mix_type)
+                continue
+            group_index.append(groups.setdefault(group, len(groups)))
+            mix_index.append(mixes[mix_type])
+            volumes.append(volume)
+        
+        volume_matrix = np.zeros((len(groups), len(mixes)))
+        np.add.at(volume_matrix, (np.array(group_index, dtype=int), np.array(mix_index, dtype=int)),
+                  np.array(volumes, dtype=float))
+        demand = volume_matrix @ matrix
+        
+        return {
+            "materials": materials,
+            "total": dict(zip(materials, np.round(demand.sum(axis=0), 2).tolist())),
+            "by_group": {group: dict(zip(materials, np.round(demand[row], 2).tolist()))
+                         for group, row in groups.items()},
+            "unknown_mixes": sorted(unknown_mixes)
+        }
+    
+    @staticmethod
+    def kg_per_stock_unit(name: str) -> float:
+        """
+        Kilograms in one stock unit of a material; unknown materials count in kg
+        """
+        material = InventoryService._materials_by_name.get(name)
+        unit = material.unit if material else "kg"
+        if unit == "m³" and name in InventoryService.BULK_DENSITY:
+            return InventoryService.BULK_DENSITY[name]
+        if unit in InventoryService.KG_PER_UNIT:
+            return InventoryService.KG_PER_UNIT[unit]
+        raise ValueError(f"No conversion from kg to {unit} for {name}")
+    
+    @staticmethod
+    def get_stock_recipe(mix_type: str) -> Optional[Dict[str, float]]:
+        """
+        Quantity of each material per m³ of a mix, in the material's stock unit
+        """
+        recipe = InventoryService._mix_requirements.get(mix_type)
+        if recipe is None:
+            return None
+        return {name: kg / InventoryService.kg_per_stock_unit(name) for name, kg in recipe.items()}
+    
     @staticmethod
     def calculate_material_requirements(mix_type: str, volume: float) -> Dict[str, float]:
         """
-        Calculate material requirements for a specific mix type and volume
+        Calculate material requirements for a specific mix type and volume, in stock units
         """
-        if mix_type not in InventoryService._mix_requirements:
+        recipe = InventoryService.get_stock_recipe(mix_type)
+        if recipe is None:
             return {}
-        
-        requirements = InventoryService._mix_requirements[mix_type]
-        return {material: quantity * volume for material, quantity in requirements.items()}
+        return {material: quantity * volume for material, quantity in recipe.items()}
     
     @staticmethod
     def check_availability(requirements: Dict[str, float]) -> Dict[str, Any]:
         """
-        Check if required materials are available in stock
+        Check if required materials, in stock units, are available in unreserved stock
         """
         result = {
             "available": True,
@@ -282,15 +841,15 @@ class InventoryService:
         }
         
         for material_name, required_quantity in requirements.items():
-            material = next((m for m in InventoryService._materials_db 
-                           if m.name == material_name), None)
+            material = InventoryService.get_material_by_name(material_name)
             
             if material:
-                if material.current_stock >= required_quantity:
+                available = InventoryService.get_available_stock(material_name)
+                if available >= required_quantity:
                     result["available_materials"].append({
                         "name": material_name,
                         "required": required_quantity,
-                        "available": material.current_stock,
+                        "available": available,
                         "status": "available"
                     })
                 else:
@@ -298,8 +857,8 @@ class InventoryService:
                     result["missing_materials"].append({
                         "name": material_name,
                         "required": required_quantity,
-                        "available": material.current_stock,
-                        "deficit": required_quantity - material.current_stock,
+                        "available": available,
+                        "deficit": required_quantity - available,
                         "status": "insufficient"
                     })
             else:
@@ -312,4 +871,60 @@ class InventoryService:
                     "status": "not_found"
                 })
         
-        return result
\ No newline at end of file
+        return result
+    
+    @staticmethod
+    def check_batch_availability(demands: List[Tuple[Any, str, float]],
+                                 held_by: Iterable[int] = ()) -> Dict[str, Any]:
+        """
+        Check cumulative material demand of (reference, mix_type, volume) entries,
+        in the given order, against unreserved stock in a single pass. Reservations
+        of the orders in held_by are part of that demand, so they count as available
+        """
+        held: Dict[str, float] = {}
+        for order_id in held_by:
+            for material_name, quantity in InventoryService._reservations.get(order_id, {}).items():
+                held[material_name] = held.get(material_name, 0.0) + quantity
+        
+        required: Dict[str, float] = {}
+        runs_out_at: Dict[str, Any] = {}
+        unknown_mixes = []
+        
+        for reference, mix_type, volume in demands:
+            recipe = InventoryService.get_stock_recipe(mix_type)
+            if recipe is None:
+                unknown_mixes.append({"reference": reference, "mix_type": mix_type})
+                continue
+            
+            for material_name, quantity in recipe.items():
+                total = required.get(material_name, 0.0) + quantity * volume
+                required[material_name] = total
+                if material_name not in runs_out_at:
+                    stock = InventoryService.get_available_stock(material_name) + held.get(material_name, 0.0)
+                    if total > stock:
+                        runs_out_at[material_name] = reference
+        
+        materials = []
+        for material_name, total in required.items():
+            material = InventoryService.get_material_by_name(material_name)
+            stock = InventoryService.get_available_stock(material_name) + held.get(material_name, 0.0)
+            materials.append({
+                "name": material_name,
+                "required": round(total, 2),
+                "available": round(stock, 2),
+                "deficit": round(max(total - stock, 0), 2),
+                "status": "available" if material_name not in runs_out_at else 
+                          ("insufficient" if material else "not_found"),
+                "runs_out_at": runs_out_at.get(material_name)
+            })
+        
+        return {
+            "available": not runs_out_at and not unknown_mixes,
+            "materials": materials,
+            "unknown_mixes": unknown_mixes
+        }
+
+InventoryService.rebuild_summary_counters()
+InventoryService.rebuild_reservations()
+InventoryService.add_listener(InventoryService._journal_changes)
+OrdersService.add_listener(InventoryService.on_order_event)
\ No newline at end of file
@@ -0,0 +1,224 @@
+import math
+import threading
+from bisect import bisect_left, bisect_right
+from typing import List, Optional, Dict, Iterable, Iterator, Tuple
+from datetime import date, datetime
+from app.models.schemas.orders import ConcreteOrder
+
+URGENT_PRIORITY = "high"
+
+class OrderTotals:
+    """
+    Running count, volume and urgent count for a group of orders
+    """
+
+    __slots__ = ("count", "volume", "urgent")
+
+    def __init__(self):
+        self.count = 0
+        self.volume = 0.0
+        self.urgent = 0
+
+    def apply(self, order: ConcreteOrder, sign: int = 1) -> None:
+        self.count += sign
+        self.volume += sign * order.volume
+        if order.priority == URGENT_PRIORITY:
+            self.urgent += sign
+
+    def copy(self) -> "OrderTotals":
+        totals = OrderTotals()
+        totals.count, totals.volume, totals.urgent = self.count, self.volume, self.urgent
+        return totals
+
+    def matches(self, other: "OrderTotals") -> bool:
+        return (self.count == other.count and self.urgent == other.urgent
+                and math.isclose(self.volume, other.volume, abs_tol=1e-6))
+
+class OrderStore:
+    """
+    In-memory order store with an id map and secondary indexes
+    """
+
+    def __init__(self, orders: Iterable[ConcreteOrder] = ()):
+        # Guards index updates against concurrent snapshot reads
+        self._lock = threading.RLock()
+        self._orders: List[ConcreteOrder] = []
+        self._by_id: Dict[int, ConcreteOrder] = {}
+        # Secondary indexes keep insertion order and allow O(1) removal
+        self._by_status: Dict[str, Dict[int, ConcreteOrder]] = {}
+        self._by_plant: Dict[str, Dict[int, ConcreteOrder]] = {}
+        self._by_date: Dict[date, Dict[int, ConcreteOrder]] = {}
+        # Sorted scheduled_time index, searched by bisection
+        self._times: List[datetime] = []
+        self._time_orders: List[ConcreteOrder] = []
+        # Aggregates maintained on every insert and status change
+        self._status_totals: Dict[str, OrderTotals] = {}
+        self._priority_totals: Dict[str, OrderTotals] = {}
+        self._day_totals: Dict[date, OrderTotals] = {}
+
+        for order in orders:
+            self.add(order)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __iter__(self) -> Iterator[ConcreteOrder]:
+        return iter(self._orders)
+
+    @staticmethod
+    def _index(index: Dict, key, order: ConcreteOrder) -> None:
+        index.setdefault(key, {})[order.id] = order
+
+    @staticmethod
+    def _unindex(index: Dict, key, order: ConcreteOrder) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(order.id, None)
+            if not bucket:
+                del index[key]
+
+    @staticmethod
+    def _totals(totals: Dict, key) -> OrderTotals:
+        group = totals.get(key)
+        if group is None:
+            group = totals[key] = OrderTotals()
+        return group
+
+    def add(self, order: ConcreteOrder) -> None:
+        """
+        Insert an order and register it in every index
+        """
+        with self._lock:
+            if order.id in self._by_id:
+                raise ValueError(f"Order {order.id} already exists")
+            # Located first: a time that cannot be compared fails before any index changes
+            position = bisect_right(self._times, order.scheduled_time)
+
+            self._orders.append(order)
+            self._by_id[order.id] = order
+            self._index(self._by_status, order.status, order)
+            self._index(self._by_plant, order.assigned_plant, order)
+            self._index(self._by_date, order.scheduled_time.date(), order)
+
+            self._times.insert(position, order.scheduled_time)
+            self._time_orders.insert(position, order)
+
+            self._totals(self._status_totals, order.status).apply(order)
+            self._totals(self._priority_totals, order.priority).apply(order)
+            self._totals(self._day_totals, order.scheduled_time.date()).apply(order)
+
+    def all(self) -> List[ConcreteOrder]:
+        """
+        Get all orders in insertion order
+        """
+        return self._orders
+
+    def get(self, order_id: int) -> Optional[ConcreteOrder]:
+        """
+        Get order by ID in O(1)
+        """
+        return self._by_id.get(order_id)
+
+    def by_status(self, status: str) -> List[ConcreteOrder]:
+        """
+        Get orders with the given status
+        """
+        with self._lock:
+            return list(self._by_status.get(status, {}).values())
+
+    def by_plant(self, plant: str) -> List[ConcreteOrder]:
+        """
+        Get orders assigned to the given plant
+        """
+        with self._lock:
+            return list(self._by_plant.get(plant, {}).values())
+
+    def by_date(self, day: date) -> List[ConcreteOrder]:
+        """
+        Get orders scheduled on the given day
+        """
+        with self._lock:
+            return list(self._by_date.get(day, {}).values())
+
+    def in_range(self, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None) -> List[ConcreteOrder]:
+        """
+        Get orders scheduled in [start, end), sorted by scheduled time
+        """
+        with self._lock:
+            low = bisect_left(self._times, start) if start is not None else 0
+            high = bisect_left(self._times, end) if end is not None else len(self._times)
+            return self._time_orders[low:high]
+
+    def count_by_status(self, status: str) -> int:
+        """
+        Count orders with the given status without building a list
+        """
+        return len(self._by_status.get(status, {}))
+
+    def set_status(self, order: ConcreteOrder, status: str) -> None:
+        """
+        Change an order's status and move it to the matching bucket
+        """
+        with self._lock:
+            self._unindex(self._by_status, order.status, order)
+            self._totals(self._status_totals, order.status).apply(order, -1)
+            order.status = status
+            self._index(self._by_status, status, order)
+            self._totals(self._status_totals, status).apply(order)
+
+    def status_totals(self, status: str) -> OrderTotals:
+        """
+        Running totals for orders with the given status
+        """
+        return self._status_totals.get(status) or OrderTotals()
+
+    def priority_totals(self, priority: str) -> OrderTotals:
+        """
+        Running totals for orders with the given priority
+        """
+        return self._priority_totals.get(priority) or OrderTotals()
+
+    def day_totals(self, day: date) -> OrderTotals:
+        """
+        Running totals for orders scheduled on the given day
+        """
+        return self._day_totals.get(day) or OrderTotals()
+
+    def summary_snapshot(self, statuses: Iterable[str], day: date) -> Tuple[int, Dict[str, OrderTotals], OrderTotals]:
+        """
+        Order count, totals per status and totals of one day, copied in a
+        single step so concurrent writers cannot tear the summary
+        """
+        with self._lock:
+            return (len(self._orders),
+                    {status: self.status_totals(status).copy() for status in statuses},
+                    self.day_totals(day).copy())
+
+    def recompute_totals(self) -> Dict[str, Dict]:
+        """
+        Rebuild every aggregate from scratch by scanning all orders
+        """
+        with self._lock:
+            status_totals: Dict[str, OrderTotals] = {}
+            priority_totals: Dict[str, OrderTotals] = {}
+            day_totals: Dict[date, OrderTotals] = {}
+            for order in self._orders:
+                self._totals(status_totals, order.status).apply(order)
+                self._totals(priority_totals, order.priority).apply(order)
+                self._totals(day_totals, order.scheduled_time.date()).apply(order)
+            return {"status": status_totals, "priority": priority_totals, "day": day_totals}
+
+    def check_totals(self) -> bool:
+        """
+        Verify the running aggregates against a full recomputation
+        """
+        expected = self.recompute_totals()
+        for name, running in (("status", self._status_totals),
+                              ("priority", self._priority_totals),
+                              ("day", self._day_totals)):
+            for key in set(running) | set(expected[name]):
+                actual = running.get(key) or OrderTotals()
+                if not actual.matches(expected[name].get(key) or OrderTotals()):
+                    return False
+        return True
@@ -1,14 +1,25 @@
-from typing import List, Optional, Dict, Any
+import threading
+from typing import List, Optional, Dict, Any, Tuple, Callable
 from datetime import datetime, timedelta
 from app.models.schemas.orders import ConcreteOrder, CreateOrderRequest
+from app.services.order_store import OrderStore
+from app.repositories.registry import get_repository
+from app.services.timeutils import to_local
+from app.services.ids import id_allocator
+
+def plant_key(name: str) -> str:
+    """
+    Normalise plant names: orders use "PLANTA 1", plants "Planta 1"
+    """
+    return " ".join(name.upper().split())
 
 class OrdersService:
     """
     Service class for concrete orders management
     """
     
-    # Mock database for orders
-    _orders_db = [
+    # Mock database for orders, indexed by id, status, plant and date
+    _orders_db = OrderStore([
         ConcreteOrder(
             id=1,
             project_id=101,
@@ -89,7 +100,16 @@ class OrdersService:
             created_at=datetime.now() - timedelta(days=3),
             notes="Cancelado por condiciones climáticas"
         )
-    ]
+    ])
+    
+    ACTIVE_STATUSES = ["scheduled", "preparing", "in_progress"]
+    
+    # Serialises mutations so concurrent requests see consistent state
+    _lock = threading.RLock()
+    
+    # Callbacks notified as (event, order, previous_status) on order changes.
+    # Events: "created", "status_changed" and "reloaded" (order is None)
+    _listeners: List[Callable[[str, Optional[ConcreteOrder], Optional[str]], None]] = []
     
     # Projects database - ACTUALIZADO con el nombre correcto
     _projects_db = [
@@ -101,28 +121,58 @@ class OrdersService:
     ]
     
     # ... (el resto de los métodos se mantiene igual)
+    @staticmethod
+    def load_from_repository() -> None:
+        """
+        Load orders from the configured repository, seeding it with the mock data when empty
+        """
+        with OrdersService._lock:
+            repository = get_repository("orders")
+            orders = repository.load_all()
+            if orders:
+                OrdersService._orders_db = OrderStore(orders)
+            else:
+                repository.save_many(OrdersService._orders_db.all())
+            id_allocator.reset("orders", (order.id for order in OrdersService._orders_db))
+            OrdersService._notify("reloaded", None)
+    
+    @staticmethod
+    def add_listener(listener: Callable[[str, Optional[ConcreteOrder], Optional[str]], None]) -> None:
+        """
+        Register a callback for order changes
+        """
+        OrdersService._listeners.append(listener)
+    
+    @staticmethod
+    def _notify(event: str, order: Optional[ConcreteOrder], previous_status: Optional[str] = None) -> None:
+        # The change is already saved: one failing listener must not fail the
+        # request or keep the others from hearing about it
+        for listener in OrdersService._listeners:
+            try:
+                listener(event, order, previous_status)
+            except Exception as e:
+                print(f"⚠️  Order listener {getattr(listener, '__qualname__', listener)} failed on {event}: {e}")
+    
     @staticmethod
     def get_all_orders() -> List[ConcreteOrder]:
         """
         Get all concrete orders
         """
-        return OrdersService._orders_db
+        return OrdersService._orders_db.all()
     
     @staticmethod
     def get_order_by_id(order_id: int) -> Optional[ConcreteOrder]:
         """
         Get order by ID
         """
-        return next((order for order in OrdersService._orders_db 
-                    if order.id == order_id), None)
+        return OrdersService._orders_db.get(order_id)
     
     @staticmethod
     def get_orders_by_status(status: str) -> List[ConcreteOrder]:
         """
         Get orders by status
         """
-        return [order for order in OrdersService._orders_db 
-                if order.status == status]
+        return OrdersService._orders_db.by_status(status)
     
     @staticmethod
     def get_todays_orders() -> List[ConcreteOrder]:
@@ -130,31 +180,22 @@ class OrdersService:
         Get today's orders
         """
         today = datetime.now().date()
-        return [order for order in OrdersService._orders_db 
-                if order.scheduled_time.date() == today]
+        return OrdersService._orders_db.by_date(today)
     
     @staticmethod
-    def create_order(order_data: CreateOrderRequest) -> ConcreteOrder:
+    def _build_order(order_data: CreateOrderRequest, project: Dict[str, Any]) -> ConcreteOrder:
         """
-        Create a new order
+        Build a scheduled order for a resolved project and add it to the store
         """
-        # Find project
-        project = next((p for p in OrdersService._projects_db 
-                       if p["id"] == order_data.project_id), None)
-        
-        if not project:
-            raise ValueError("Project not found")
-        
-        # Create new order
         new_order = ConcreteOrder(
-            id=len(OrdersService._orders_db) + 1,
+            id=id_allocator.next("orders"),
             project_id=order_data.project_id,
             project_name=project["name"],
             client=project["client"],
             mix_type=order_data.mix_type,
             volume=order_data.volume,
             status="scheduled",
-            scheduled_time=order_data.scheduled_time,
+            scheduled_time=to_local(order_data.scheduled_time),
             address=order_data.address,
             priority=order_data.priority,
             assigned_plant=order_data.assigned_plant,
@@ -163,49 +204,130 @@ class OrdersService:
             notes=order_data.notes
         )
         
-        OrdersService._orders_db.append(new_order)
+        OrdersService._orders_db.add(new_order)
         return new_order
     
+    @staticmethod
+    def create_order(order_data: CreateOrderRequest) -> ConcreteOrder:
+        """
+        Create a new order
+        """
+        with OrdersService._lock:
+            # Find project
+            project = next((p for p in OrdersService._projects_db 
+                           if p["id"] == order_data.project_id), None)
+        
+            if not project:
+                raise ValueError("Project not found")
+        
+            new_order = OrdersService._build_order(order_data, project)
+            get_repository("orders").save(new_order)
+            OrdersService._notify("created", new_order)
+            return new_order
+    
+    @staticmethod
+    def create_orders(orders_data: List[CreateOrderRequest]) -> Tuple[List[ConcreteOrder], List[Tuple[int, str]]]:
+        """
+        Create a batch of orders sharing a single project lookup.
+        Returns the created orders and (batch index, error) pairs for rejected rows.
+        """
+        with OrdersService._lock:
+            project_ids = {order_data.project_id for order_data in orders_data}
+            projects = {p["id"]: p for p in OrdersService._projects_db 
+                        if p["id"] in project_ids}
+        
+            created = []
+            errors = []
+            for index, order_data in enumerate(orders_data):
+                project = projects.get(order_data.project_id)
+                if not project:
+                    errors.append((index, "Project not found"))
+                    continue
+                created.append(OrdersService._build_order(order_data, project))
+        
+            get_repository("orders").save_many(created)
+            for order in created:
+                OrdersService._notify("created", order)
+            return created, errors
+    
     @staticmethod
     def update_order_status(order_id: int, status: str) -> bool:
         """
         Update order status
         """
-        order = OrdersService.get_order_by_id(order_id)
-        if order:
-            order.status = status
-            if status == "completed":
-                order.completed_at = datetime.now()
-            return True
-        return False
+        with OrdersService._lock:
+            order = OrdersService.get_order_by_id(order_id)
+            if order:
+                previous_status = order.status
+                OrdersService._orders_db.set_status(order, status)
+                if status == "completed":
+                    order.completed_at = datetime.now()
+                get_repository("orders").save(order)
+                OrdersService._notify("status_changed", order, previous_status)
+                return True
+            return False
     
     @staticmethod
     def get_orders_summary() -> Dict[str, Any]:
         """
         Get orders summary statistics
         """
-        todays_orders = OrdersService.get_todays_orders()
-        active_orders = [order for order in OrdersService._orders_db 
-                        if order.status in ["scheduled", "preparing", "in_progress"]]
-        
-        total_volume_today = sum(order.volume for order in todays_orders)
-        total_volume_active = sum(order.volume for order in active_orders)
+        total, by_status, today = OrdersService._orders_db.summary_snapshot(
+            OrdersService.ACTIVE_STATUSES + ["completed"], datetime.now().date()
+        )
+        active = [by_status[status] for status in OrdersService.ACTIVE_STATUSES]
         
         return {
-            "total_orders": len(OrdersService._orders_db),
-            "active_orders": len(active_orders),
-            "todays_orders": len(todays_orders),
-            "total_volume_today": total_volume_today,
-            "total_volume_active": total_volume_active,
-            "completed_today": len(OrdersService.get_orders_by_status("completed")),
-            "urgent_orders": len([order for order in active_orders 
-                                if order.priority == "high"])
+            "total_orders": total,
+            "active_orders": sum(totals.count for totals in active),
+            "todays_orders": today.count,
+            "total_volume_today": round(today.volume, 2),
+            "total_volume_active": round(sum(totals.volume for totals in active), 2),
+            "completed_today": by_status["completed"].count,
+            "urgent_orders": sum(totals.urgent for totals in active)
         }
     
+    @staticmethod
+    def check_summary_consistency() -> bool:
+        """
+        Recompute the summary aggregates from scratch and compare
+        """
+        return OrdersService._orders_db.check_totals()
+    
+    @staticmethod
+    def get_orders_in_range(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                            plant: Optional[str] = None, status: Optional[str] = None) -> List[ConcreteOrder]:
+        """
+        Get orders scheduled in [start, end), optionally filtered by plant and status
+        """
+        if start is None and end is None:
+            # No time window: start from the narrowest secondary index
+            if status:
+                # Status buckets are in the order orders entered them, not id order
+                orders = sorted(OrdersService.get_orders_by_status(status), key=lambda order: order.id)
+                return [order for order in orders if not plant or order.assigned_plant == plant]
+            if plant:
+                return OrdersService.get_orders_by_plant(plant)
+            return OrdersService.get_all_orders()
+        
+        orders = OrdersService._orders_db.in_range(to_local(start), to_local(end))
+        return [order for order in orders
+                if (not plant or order.assigned_plant == plant)
+                and (not status or order.status == status)]
+    
+    @staticmethod
+    def get_orders_by_plant(plant: str) -> List[ConcreteOrder]:
+        """
+        Get orders assigned to a plant
+        """
+        return OrdersService._orders_db.by_plant(plant)
+    
     @staticmethod
     def get_available_projects() -> List[Dict[str, Any]]:
         """
         Get available projects for new orders
         """
         return [project for project in OrdersService._projects_db 
-                if project["status"] == "active"]
\ No newline at end of file
+                if project["status"] == "active"]
+
+id_allocator.reset("orders", (order.id for order in OrdersService._orders_db))
@@ -1,12 +1,18 @@
+import threading
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from app.models.schemas.plants import ConcretePlant, PlantProduction
+from app.services.fleet import FleetService
+from app.repositories.registry import get_repository
 
 class PlantsService:
     """
     Service class for concrete plants management
     """
     
+    # Serialises mutations so concurrent requests see consistent state
+    _lock = threading.RLock()
+    
     # Mock database for concrete plants
     _plants_db = [
         ConcretePlant(
@@ -89,6 +95,19 @@ class PlantsService:
         )
     ]
     
+    @staticmethod
+    def load_from_repository() -> None:
+        """
+        Load plants from the configured repository, seeding it with the mock data when empty
+        """
+        with PlantsService._lock:
+            repository = get_repository("plants")
+            plants = repository.load_all()
+            if plants:
+                PlantsService._plants_db = plants
+            else:
+                repository.save_many(PlantsService._plants_db)
+    
     @staticmethod
     def get_all_plants() -> List[ConcretePlant]:
         """
@@ -135,13 +154,14 @@ class PlantsService:
         """
         active_plants = PlantsService.get_active_plants()
         total_capacity = sum(plant.capacity for plant in PlantsService._plants_db)
-        available_trucks = sum(plant.trucks_available for plant in active_plants)
+        available_trucks = sum(FleetService.count_available(plant.name) for plant in active_plants)
         
         return {
             "total_plants": len(PlantsService._plants_db),
             "active_plants": len(active_plants),
             "total_capacity": total_capacity,
             "available_trucks": available_trucks,
+            "active_trucks": FleetService.count_active(),
             "maintenance_plants": len(PlantsService.get_plants_by_status("maintenance"))
         }
     
@@ -150,8 +170,10 @@ class PlantsService:
         """
         Update plant status
         """
-        plant = PlantsService.get_plant_by_id(plant_id)
-        if plant:
-            plant.status = status
-            return True
-        return False
\ No newline at end of file
+        with PlantsService._lock:
+            plant = PlantsService.get_plant_by_id(plant_id)
+            if plant:
+                plant.status = status
+                get_repository("plants").save(plant)
+                return True
+            return False
\ No newline at end of file
@@ -0,0 +1,154 @@
+from array import array
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, date, timedelta
+from app.models.schemas.orders import ConcreteOrder
+from app.services.orders import OrdersService
+from app.services.timeutils import to_local
+
+GRANULARITIES = ("hour", "day")
+
+# Buckets per storage block: about a month of hours, a month of days
+BLOCK_SIZES = {"hour": 24 * 32, "day": 32}
+
+def bucket_index(value: datetime, granularity: str) -> int:
+    """
+    Integer bucket for a timestamp: day ordinal, or day ordinal * 24 + hour
+    """
+    if granularity == "day":
+        return value.toordinal()
+    return value.toordinal() * 24 + value.hour
+
+def bucket_start(index: int, granularity: str) -> datetime:
+    if granularity == "day":
+        return datetime.combine(date.fromordinal(index), datetime.min.time())
+    day, hour = divmod(index, 24)
+    return datetime.combine(date.fromordinal(day), datetime.min.time()) + timedelta(hours=hour)
+
+class RollupSeries:
+    """
+    Scheduled/completed volume columns for one (plant, mix) pair, stored
+    as fixed-size blocks of doubles keyed by block number. Only blocks that
+    hold orders are allocated, so far-apart dates cost one block each
+    """
+
+    COLUMNS = ("scheduled", "completed")
+
+    def __init__(self, block_size: int):
+        self.block_size = block_size
+        # column -> block number -> values of buckets [block * size, (block + 1) * size)
+        self.columns: Dict[str, Dict[int, array]] = {name: {} for name in self.COLUMNS}
+
+    def add(self, column: str, index: int, volume: float) -> None:
+        block, offset = divmod(index, self.block_size)
+        blocks = self.columns[column]
+        values = blocks.get(block)
+        if values is None:
+            values = blocks[block] = array("d", [0.0]) * self.block_size
+        values[offset] += volume
+
+    def window(self, column: str, low: int, high: int) -> List[float]:
+        """
+        Values for buckets [low, high), zero-filled where no block exists
+        """
+        blocks = self.columns[column]
+        result: List[float] = []
+        index = low
+        while index < high:
+            block, offset = divmod(index, self.block_size)
+            stop = min(high - index, self.block_size - offset)
+            values = blocks.get(block)
+            if values is None:
+                result.extend([0.0] * stop)
+            else:
+                result.extend(values[offset:offset + stop])
+            index += stop
+        return result
+
+class RollupService:
+    """
+    Hourly and daily volume rollups per (plant, mix), maintained incrementally
+    """
+
+    _series: Dict[Tuple[str, str, str], RollupSeries] = {}
+    _built = False
+
+    @staticmethod
+    def _column(status: Optional[str]) -> Optional[str]:
+        if status == "completed":
+            return "completed"
+        if status in OrdersService.ACTIVE_STATUSES:
+            return "scheduled"
+        return None
+
+    @staticmethod
+    def _apply(order: ConcreteOrder, column: Optional[str], sign: int) -> None:
+        if column is None:
+            return
+        for granularity in GRANULARITIES:
+            key = (granularity, order.assigned_plant, order.mix_type)
+            series = RollupService._series.get(key)
+            if series is None:
+                series = RollupService._series[key] = RollupSeries(BLOCK_SIZES[granularity])
+            series.add(column, bucket_index(order.scheduled_time, granularity), sign * order.volume)
+
+    @staticmethod
+    def _ensure_built() -> None:
+        if RollupService._built:
+            return
+        RollupService._series = {}
+        for order in OrdersService.get_all_orders():
+            RollupService._apply(order, RollupService._column(order.status), 1)
+        RollupService._built = True
+
+    @staticmethod
+    def on_order_event(event: str, order: Optional[ConcreteOrder], previous_status: Optional[str]) -> None:
+        """
+        Move volume between columns as orders are created or change status
+        """
+        if event == "reloaded":
+            RollupService._built = False
+            return
+        if not RollupService._built or order is None:
+            return
+
+        if event == "status_changed":
+            RollupService._apply(order, RollupService._column(previous_status), -1)
+        RollupService._apply(order, RollupService._column(order.status), 1)
+
+    @staticmethod
+    def get_rollups(granularity: str, start: datetime, end: datetime,
+                    plant: Optional[str] = None, mix_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Bucketed scheduled and completed volume for [start, end)
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularity must be one of: {', '.join(GRANULARITIES)}")
+
+        RollupService._ensure_built()
+        start, end = to_local(start), to_local(end)
+        low = bucket_index(start, granularity)
+        high = max(low, bucket_index(end - timedelta(microseconds=1), granularity) + 1)
+
+        series = []
+        for (series_granularity, series_plant, series_mix), rollup in RollupService._series.items():
+            if series_granularity != granularity:
+                continue
+            if (plant and series_plant != plant) or (mix_type and series_mix != mix_type):
+                continue
+            series.append({
+                "plant": series_plant,
+                "mix_type": series_mix,
+                "scheduled": rollup.window("scheduled", low, high),
+                "completed": rollup.window("completed", low, high)
+            })
+        series.sort(key=lambda s: (s["plant"], s["mix_type"]))
+
+        return {
+            "granularity": granularity,
+            "from": start,
+            "to": end,
+            "buckets": [bucket_start(index, granularity) for index in range(low, high)],
+            "series": series
+        }
+
+OrdersService.add_listener(RollupService.on_order_event)
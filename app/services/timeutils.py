@@ -0,0 +1,16 @@
+from typing import Optional
+from datetime import datetime
+
+def to_local(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert aware datetimes to naive local time, matching stored records
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+def floor_hour(value: datetime) -> datetime:
+    """
+    Truncate a datetime to the start of its hour
+    """
+    return value.replace(minute=0, second=0, microsecond=0)
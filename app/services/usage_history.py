@@ -0,0 +1,112 @@
+import threading
+from array import array
+from typing import List, Optional, Dict, Iterable
+from datetime import date
+import numpy as np
+from app.models.schemas.inventory import MaterialUsage
+
+class CodeTable:
+    """
+    Interns repeated strings (mix types, project names) as small integer codes
+    """
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+
+    def code(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+class UsageHistory:
+    """
+    Append-only material usage history stored column by column: material id,
+    date ordinal, quantity, mix code and project code
+    """
+
+    def __init__(self, records: Iterable[MaterialUsage] = ()):
+        self._lock = threading.RLock()
+        self.material_ids = array("l")
+        self.days = array("l")
+        self.quantities = array("d")
+        self.mix_codes = array("l")
+        self.project_codes = array("l")
+        self.mixes = CodeTable()
+        self.projects = CodeTable()
+        # Rows stay in date order unless a back-dated record is appended
+        self._sorted = True
+        for record in records:
+            self.append(record.material_id, record.date, record.quantity_used,
+                        record.mix_type, record.project)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def append(self, material_id: int, day: date, quantity: float, mix_type: str, project: str) -> None:
+        with self._lock:
+            ordinal = day.toordinal()
+            if self.days and ordinal < self.days[-1]:
+                self._sorted = False
+            self.material_ids.append(material_id)
+            self.days.append(ordinal)
+            self.quantities.append(quantity)
+            self.mix_codes.append(self.mixes.code(mix_type))
+            self.project_codes.append(self.projects.code(project))
+
+    def _sort(self) -> None:
+        if self._sorted:
+            return
+        order = np.argsort(np.frombuffer(self.days, dtype="l"), kind="stable")
+        for name in ("material_ids", "days", "quantities", "mix_codes", "project_codes"):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, np.frombuffer(column, dtype=column.typecode)[order].tobytes()))
+        self._sorted = True
+
+    def _span(self, first_day: date, last_day: date) -> slice:
+        """
+        Row slice covering [first_day, last_day], found by binary search
+        """
+        self._sort()
+        days = np.frombuffer(self.days, dtype="l")
+        return slice(int(np.searchsorted(days, first_day.toordinal(), side="left")),
+                     int(np.searchsorted(days, last_day.toordinal(), side="right")))
+
+    def totals_by_material(self, first_day: date, last_day: date) -> Dict[int, float]:
+        """
+        Quantity used per material id between two days, inclusive
+        """
+        with self._lock:
+            if not self.days:
+                return {}
+            span = self._span(first_day, last_day)
+            ids = np.frombuffer(self.material_ids, dtype="l")[span]
+            if ids.size == 0:
+                return {}
+            sums = np.bincount(ids, weights=np.frombuffer(self.quantities, dtype="d")[span])
+            present = np.unique(ids)
+            return dict(zip(present.tolist(), sums[present].tolist()))
+
+    def records(self, material_id: Optional[int] = None, first_day: Optional[date] = None,
+                last_day: Optional[date] = None) -> List[MaterialUsage]:
+        """
+        Materialise matching rows as MaterialUsage objects
+        """
+        with self._lock:
+            if not self.days:
+                return []
+            span = self._span(first_day or date.min, last_day or date.max)
+            rows = range(len(self.days))[span]
+            return [
+                MaterialUsage(
+                    material_id=self.material_ids[row],
+                    date=date.fromordinal(self.days[row]),
+                    quantity_used=self.quantities[row],
+                    project=self.projects.labels[self.project_codes[row]],
+                    mix_type=self.mixes.labels[self.mix_codes[row]]
+                )
+                for row in rows
+                if material_id is None or self.material_ids[row] == material_id
+            ]
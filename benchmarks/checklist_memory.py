@@ -0,0 +1,77 @@
+"""
+Memory held by checklists kept as pydantic models versus the compact store.
+
+Builds the same synthetic checklists (one per order, with the template
+items, a third of them ticked) both ways and reports the live allocations
+traced by tracemalloc. Run from the repository root:
+
+    python benchmarks/checklist_memory.py --count 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.schemas.checklist import ConcreteChecklist, ChecklistItem
+from app.services.checklist import ChecklistService
+from app.services.checklist_store import ChecklistStore
+
+START = datetime(2026, 1, 1)
+
+def make_checklist(checklist_id: int) -> ConcreteChecklist:
+    templates = ChecklistService._template_items
+    return ConcreteChecklist(
+        id=checklist_id,
+        order_id=checklist_id,
+        project_name="VITTRIO",
+        supervisor="Ing. Supervisor",
+        scheduled_time=START + timedelta(minutes=checklist_id),
+        status="in_progress",
+        created_at=START,
+        items=[
+            ChecklistItem(
+                id=position + 1,
+                category=template.category,
+                description=template.description,
+                completed=(checklist_id + position) % 3 == 0,
+                completed_at=START + timedelta(days=1) if (checklist_id + position) % 3 == 0 else None
+            )
+            for position, template in enumerate(templates)
+        ]
+    )
+
+def traced(build):
+    """
+    Build something and return it with the bytes it keeps alive
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="checklists to build")
+    count = parser.parse_args().count
+
+    models, model_bytes = traced(lambda: [make_checklist(i) for i in range(1, count + 1)])
+    del models
+    # Fed one model at a time, so only the compact records stay alive
+    store, store_bytes = traced(lambda: ChecklistStore(
+        (make_checklist(i) for i in range(1, count + 1)), ChecklistService._template_items
+    ))
+
+    print(f"checklists:             {len(store):>12,}")
+    print(f"pydantic models:        {model_bytes / 1e6:>9.1f} MB  ({model_bytes / count:,.0f} B each)")
+    print(f"compact store:          {store_bytes / 1e6:>9.1f} MB  ({store_bytes / count:,.0f} B each)")
+    print(f"reduction:              {model_bytes / store_bytes:>11.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,16 @@ def setup_routers(app) -> None:
         from app.services.checklist import ChecklistService
         return ChecklistService.get_checklists_summary()
 
+    @app.get("/api/v1/orders-summary")
+    async def get_orders_summary():
+        from app.services.orders import OrdersService
+        return OrdersService.get_orders_summary()
+
+    @app.get("/api/v1/plants-summary")
+    async def get_plants_summary():
+        from app.services.plants import PlantsService
+        return PlantsService.get_plants_summary()
+
     @app.get("/api/v1/inventory-summary")
     async def get_inventory_summary():
         from app.services.inventory import InventoryService
@@ -18,6 +18,29 @@ class Settings(BaseSettings):
     STATIC_DIR: str = "static"
     TEMPLATES_DIR: str = "templates"
     
+    # Storage ("sqlite" for durable storage, "memory" for tests)
+    STORAGE_BACKEND: str = "sqlite"
+    SQLITE_PATH: str = "data/concretrack.db"
+    SQLITE_POOL_SIZE: int = 4
+    # Ids reserved from the SQLite id sequence at a time
+    ID_BLOCK_SIZE: int = 32
+    # Services serve and update an in-memory copy of the data and save whole
+    # records, so a second worker would overwrite the first one's changes.
+    # Startup takes this lock and fails when another process holds it:
+    # run a single worker per data directory
+    INSTANCE_LOCK_PATH: str = "data/concretrack.lock"
+    
+    # Stock movement journal: batched fsync interval (seconds) and entries per snapshot
+    STOCK_JOURNAL_DIR: str = "data/journal"
+    STOCK_JOURNAL_FLUSH_INTERVAL: float = 0.2
+    STOCK_JOURNAL_SNAPSHOT_EVERY: int = 1000
+    
+    # Checklist cold storage: completed checklists older than this many days
+    # are archived, checked every CHECKLIST_ARCHIVE_INTERVAL seconds
+    CHECKLIST_ARCHIVE_DIR: str = "data/checklist_archive"
+    CHECKLIST_ARCHIVE_AFTER_DAYS: int = 7
+    CHECKLIST_ARCHIVE_INTERVAL: float = 3600
+    
     # CORS
     ALLOWED_ORIGINS: List[str] = ["*"]
     
@@ -5,8 +5,20 @@ from config.middleware import setup_middleware
 from config.static_files import setup_static_files
 from config.routers import setup_routers
 from config.settings import settings
+from app.repositories.lock import InstanceLock
+from app.repositories.registry import init_repositories, close_repositories, get_id_sequences
+from app.services.ids import id_allocator
+from app.services.auth import AuthService
+from app.services.checklist import ChecklistService
+from app.services.fleet import FleetService
+from app.services.inventory import InventoryService
+from app.services.orders import OrdersService
+from app.services.plants import PlantsService
 import asyncio
 
+# Services whose state is persisted through the repository layer
+PERSISTENT_SERVICES = [AuthService, ChecklistService, FleetService, InventoryService, OrdersService, PlantsService]
+
 @asynccontextmanager
 async def app_lifespan(app: FastAPI):
     """
@@ -32,9 +44,36 @@ async def startup_handler(app: FastAPI) -> bool:
         print(f"📁 Static files: {settings.STATIC_DIR}")
         print(f"🎨 Templates: {settings.TEMPLATES_DIR}")
         
-        # Here you can add database connections, cache initialization, etc.
-        # await database.connect()
-        # await cache.initialize()
+        # One worker per data directory: each serves its own in-memory state
+        app.state.instance_lock = InstanceLock(settings.INSTANCE_LOCK_PATH)
+        app.state.instance_lock.acquire()
+        
+        print(f"💾 Storage backend: {settings.STORAGE_BACKEND}")
+        init_repositories(
+            settings.STORAGE_BACKEND,
+            settings.SQLITE_PATH,
+            settings.SQLITE_POOL_SIZE
+        )
+        # New ids come from the database sequence, so they survive restarts
+        id_allocator.bind(get_id_sequences(), settings.ID_BLOCK_SIZE)
+        # Before loading: checklist ids continue after the archived ones
+        ChecklistService.open_archive(
+            settings.CHECKLIST_ARCHIVE_DIR,
+            settings.CHECKLIST_ARCHIVE_AFTER_DAYS
+        )
+        for service in PERSISTENT_SERVICES:
+            service.load_from_repository()
+        # SQLite commits every stock change before the journal's batched fsync,
+        # so there the database wins; only the memory backend needs the journal to recover
+        InventoryService.open_journal(
+            settings.STOCK_JOURNAL_DIR,
+            settings.STOCK_JOURNAL_FLUSH_INTERVAL,
+            settings.STOCK_JOURNAL_SNAPSHOT_EVERY,
+            restore=settings.STORAGE_BACKEND == "memory"
+        )
+        archived = ChecklistService.archive_completed()
+        print(f"🗄️  Archived checklists: {archived}")
+        app.state.archive_task = asyncio.create_task(archive_checklists_periodically())
         
         print("✅ Startup completed successfully")
         return True
@@ -43,14 +82,29 @@ async def startup_handler(app: FastAPI) -> bool:
         print(f"❌ Startup failed: {e}")
         return False
 
+async def archive_checklists_periodically() -> None:
+    """Move old completed checklists to cold storage while the app runs"""
+    while True:
+        await asyncio.sleep(settings.CHECKLIST_ARCHIVE_INTERVAL)
+        try:
+            await asyncio.to_thread(ChecklistService.archive_completed)
+        except Exception as e:
+            print(f"⚠️  Checklist archiving failed: {e}")
+
 async def shutdown_handler(app: FastAPI) -> None:
     """Handle application shutdown"""
     try:
         print(f"🛑 Shutting down {settings.PROJECT_NAME}...")
         
-        # Here you can add cleanup logic
-        # await database.disconnect()
-        # await cache.close()
+        archive_task = getattr(app.state, "archive_task", None)
+        if archive_task is not None:
+            archive_task.cancel()
+        InventoryService.close_journal()
+        id_allocator.bind(None)
+        close_repositories()
+        instance_lock = getattr(app.state, "instance_lock", None)
+        if instance_lock is not None:
+            instance_lock.release()
         
         print("✅ Shutdown completed successfully")
         
@@ -63,6 +63,23 @@ async function apiCall(url, options = {}) {
     }
 }
 
+// Fetch every page of a cursor-paginated list endpoint
+async function apiFetchAll(url, params = {}, pageSize = 200) {
+    const items = [];
+    let cursor = null;
+
+    do {
+        const query = new URLSearchParams({ ...params, limit: pageSize });
+        if (cursor) query.set('cursor', cursor);
+
+        const page = await apiCall(`${url}?${query.toString()}`);
+        items.push(...page.data);
+        cursor = page.next_cursor;
+    } while (cursor);
+
+    return items;
+}
+
 // Show notification function
 function showNotification(message, type = 'info') {
     // You can implement a toast notification system here
@@ -6,6 +6,13 @@ const Checklist = (function() {
     let checklistsEmpty;
     let allChecklists = [];
     let filteredChecklists = [];
+    // Columns rendered by the checklists table and its filters
+    const CHECKLIST_TABLE_FIELDS = 'id,project_name,order_id,supervisor,scheduled_time,status,items.completed,items.category';
+    // Item changes are sent together once the user pauses for this long
+    const ITEM_FLUSH_DELAY_MS = 1000;
+    let currentChecklist = null;
+    let pendingItemChanges = {};
+    let itemFlushTimer = null;
 
     // Private methods
     function initChecklistPage() {
@@ -133,6 +140,7 @@ const Checklist = (function() {
     function displayChecklistDetails(checklist) {
         const modalBody = document.getElementById('checklistModalBody');
         if (!modalBody) return;
+        currentChecklist = checklist;
 
         const scheduledTime = new Date(checklist.scheduled_time).toLocaleString('es-ES');
         const createdTime = new Date(checklist.created_at).toLocaleString('es-ES');
@@ -271,6 +279,51 @@ const Checklist = (function() {
         modal.show();
     }
 
+    function queueItemChange(checklistId, change) {
+        // Reflect the change right away so consecutive taps build on it
+        if (currentChecklist && currentChecklist.id === checklistId) {
+            const item = currentChecklist.items.find(item => item.id === change.item_id);
+            if (item) {
+                item.completed = change.completed;
+                if (change.notes !== null) item.notes = change.notes;
+                displayChecklistDetails(currentChecklist);
+            }
+        }
+
+        (pendingItemChanges[checklistId] = pendingItemChanges[checklistId] || []).push({
+            ...change,
+            client_timestamp: new Date().toISOString()
+        });
+        clearTimeout(itemFlushTimer);
+        itemFlushTimer = setTimeout(flushItemChanges, ITEM_FLUSH_DELAY_MS);
+    }
+
+    async function flushItemChanges() {
+        const batches = pendingItemChanges;
+        pendingItemChanges = {};
+
+        for (const [checklistId, changes] of Object.entries(batches)) {
+            try {
+                await apiCall(`/api/checklists/${checklistId}/items`, {
+                    method: 'PUT',
+                    body: JSON.stringify({ changes: changes })
+                });
+                showNotification(changes.length === 1 ? 'Item actualizado' : `${changes.length} items actualizados`, 'success');
+            } catch (error) {
+                console.error('Error updating items:', error);
+                showNotification('Error al actualizar los items', 'error');
+            }
+
+            // Re-sync the modal with the server's view
+            const modal = document.getElementById('checklistModal');
+            if (modal && modal.classList.contains('show') && currentChecklist && currentChecklist.id === Number(checklistId)) {
+                Checklist.viewChecklistDetails(currentChecklist.id);
+            }
+        }
+        Checklist.loadChecklistsSummary();
+        Checklist.loadChecklistsData();
+    }
+
     function applyFilters() {
         const statusFilter = document.getElementById('status-filter').value;
         const categoryFilter = document.getElementById('category-filter').value;
@@ -324,8 +377,7 @@ const Checklist = (function() {
         loadChecklistsData: async function() {
             showLoading();
             try {
-                const data = await apiCall('/api/checklists');
-                allChecklists = data.data;
+                allChecklists = await apiFetchAll('/api/checklists', { fields: CHECKLIST_TABLE_FIELDS });
                 filteredChecklists = [...allChecklists];
                 displayChecklistsData(filteredChecklists);
             } catch (error) {
@@ -402,37 +454,19 @@ const Checklist = (function() {
             }
         },
 
-        toggleItem: async function(checklistId, itemId, completed) {
-            try {
-                const formData = new FormData();
-                formData.append('completed', completed);
-
-                await apiCall(`/api/checklists/${checklistId}/items/${itemId}`, {
-                    method: 'PUT',
-                    body: formData
-                });
-
-                showNotification('Item actualizado', 'success');
-                this.loadChecklistsSummary();
-                this.loadChecklistsData();
-                
-                // Refresh the modal if open
-                const modal = document.getElementById('checklistModal');
-                if (modal && modal.classList.contains('show')) {
-                    this.viewChecklistDetails(checklistId);
-                }
-            } catch (error) {
-                console.error('Error updating item:', error);
-                showNotification('Error al actualizar el item', 'error');
-            }
+        toggleItem: function(checklistId, itemId, completed) {
+            queueItemChange(checklistId, { item_id: itemId, completed: completed, notes: null });
         },
 
         addNote: function(checklistId, itemId) {
             const note = prompt('Ingresa una nota para este item:');
-            if (note) {
-                // En una implementación real, aquí enviarías la nota al servidor
-                showNotification('Función de notas en desarrollo', 'info');
-            }
+            if (!note) return;
+
+            const item = currentChecklist && currentChecklist.id === checklistId
+                ? currentChecklist.items.find(item => item.id === itemId)
+                : null;
+            if (!item) return;
+            queueItemChange(checklistId, { item_id: itemId, completed: item.completed, notes: note });
         },
 
         completeChecklist: async function(checklistId) {
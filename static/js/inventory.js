@@ -7,6 +7,10 @@ const Inventory = (function() {
     let allMaterials = [];
     let filteredMaterials = [];
     let currentMaterialId = null;
+    let usageByMaterial = {};
+
+    // Rolling window (days) used to estimate stock duration
+    const USAGE_WINDOW = 30;
 
     // Private methods
     function initInventoryPage() {
@@ -270,7 +274,7 @@ const Inventory = (function() {
             </div>
 
             <div class="mt-3 text-muted small">
-                * Estimación basada en uso promedio histórico
+                * Estimación basada en el uso promedio de los últimos ${USAGE_WINDOW} días
             </div>
         `;
 
@@ -280,25 +284,28 @@ const Inventory = (function() {
     }
 
     function calculateDaysRemaining(material) {
-        // Esta es una estimación simple - en una app real usarías datos históricos
-        const usageRates = {
-            'ARENA': 50,  // m³ por día
-            'AGUA': 25,   // m³ por día
-            'ADT1': 30,   // kg por día
-            'ADT2': 15,   // kg por día
-            'CMTO': 200,  // kg por día
-            'ADIC': 5,    // kg por día
-            'GRAVA': 40   // m³ por día
-        };
+        const usage = usageByMaterial[material.id];
+        if (!usage) return 'Sin datos';
+        if (usage.days_remaining === null) return 'Sin consumo reciente';
 
-        const dailyUsage = usageRates[material.name] || 10;
-        const daysRemaining = material.current_stock / dailyUsage;
-        
+        const daysRemaining = usage.days_remaining;
         if (daysRemaining < 7) return '< 1 semana';
         if (daysRemaining < 30) return Math.round(daysRemaining / 7) + ' semanas';
         return Math.round(daysRemaining / 30) + ' meses';
     }
 
+    async function loadUsageOverview() {
+        try {
+            const data = await apiCall(`/api/inventory/usage?windows=${USAGE_WINDOW}`);
+            usageByMaterial = {};
+            data.data.materials.forEach(material => {
+                usageByMaterial[material.material_id] = material.windows[USAGE_WINDOW];
+            });
+        } catch (error) {
+            console.error('Error loading usage overview:', error);
+        }
+    }
+
     function applyFilters() {
         const statusFilter = document.getElementById('status-filter')?.value || 'all';
 
@@ -337,7 +344,7 @@ const Inventory = (function() {
         loadInventoryData: async function() {
             showLoading();
             try {
-                const data = await apiCall('/api/inventory');
+                const [data] = await Promise.all([apiCall('/api/inventory'), loadUsageOverview()]);
                 allMaterials = data.data;
                 filteredMaterials = [...allMaterials];
                 displayInventoryData(filteredMaterials);
@@ -427,32 +434,30 @@ const Inventory = (function() {
             }
 
             try {
-                // En una implementación real, esto llamaría a la API
-                // Por ahora simulamos la respuesta
-                const requirements = {
-                    'ARENA': volume * 700,
-                    'AGUA': volume * 170,
-                    'ADT1': volume * 4,
-                    'ADT2': volume * 2,
-                    'CMTO': volume * 400,
-                    'GRAVA': volume * 1000
-                };
+                // The server converts each recipe into the material's stock unit
+                const data = await apiCall('/api/inventory/availability', {
+                    method: 'POST',
+                    body: JSON.stringify({ items: [{ mix_type: mixType, volume: volume }] })
+                });
+                const result = data.data;
+
+                if (result.unknown_mixes.length > 0) {
+                    showNotification('Tipo de mezcla desconocido', 'error');
+                    return;
+                }
 
                 let resultHTML = '';
-                let allAvailable = true;
+                const allAvailable = result.available;
 
-                for (const [materialName, requiredQty] of Object.entries(requirements)) {
-                    const material = allMaterials.find(m => m.name === materialName);
-                    const isAvailable = material && material.current_stock >= requiredQty;
-                    const status = material ? (isAvailable ? 'available' : 'insufficient') : 'not_found';
-                    
-                    if (!isAvailable) allAvailable = false;
+                for (const requirement of result.materials) {
+                    const material = allMaterials.find(m => m.name === requirement.name);
+                    const status = requirement.status;
 
                     resultHTML += `
                         <tr class="${status === 'available' ? 'requirement-available' : status === 'insufficient' ? 'requirement-insufficient' : 'requirement-not-found'}">
-                            <td><strong>${materialName}</strong></td>
-                            <td>${requiredQty.toFixed(2)} ${material?.unit || 'unidades'}</td>
-                            <td>${material ? `${material.current_stock} ${material.unit}` : 'No encontrado'}</td>
+                            <td><strong>${requirement.name}</strong></td>
+                            <td>${requirement.required.toFixed(2)} ${material?.unit || 'unidades'}</td>
+                            <td>${material ? `${requirement.available} ${material.unit}` : 'No encontrado'}</td>
                             <td>
                                 <span class="availability-badge availability-${status}">
                                     ${status === 'available' ? 'Disponible' : status === 'insufficient' ? 'Insuficiente' : 'No encontrado'}
@@ -6,6 +6,11 @@ const Orders = (function() {
     let ordersEmpty;
     let allOrders = [];
     let filteredOrders = [];
+    // Columns rendered by the orders table and its filters
+    const ORDER_TABLE_FIELDS = 'id,project_name,address,client,mix_type,volume,status,scheduled_time,priority,assigned_plant';
+    // Bursts of order events refresh the summary cards once
+    const SUMMARY_REFRESH_DELAY = 1000;
+    let summaryRefreshTimer = null;
 
     // Private methods
     function initOrdersPage() {
@@ -251,6 +256,29 @@ const Orders = (function() {
         displayOrdersData(filteredOrders);
     }
 
+    function scheduleSummaryRefresh() {
+        clearTimeout(summaryRefreshTimer);
+        summaryRefreshTimer = setTimeout(() => Orders.loadOrdersSummary(), SUMMARY_REFRESH_DELAY);
+    }
+
+    function handleOrderEvent(event) {
+        const change = JSON.parse(event.data);
+        const index = allOrders.findIndex(order => order.id === change.id);
+        // The event carries every table column, so no refetch is needed
+        const { type, previous_status, seq, ...order } = change;
+
+        if (type === 'status_changed' && index !== -1) {
+            allOrders[index] = { ...allOrders[index], ...order };
+        } else if (type === 'created' && index === -1) {
+            allOrders.push(order);
+        } else {
+            return;
+        }
+
+        applyFilters();
+        scheduleSummaryRefresh();
+    }
+
     // Public methods
     return {
         init: function() {
@@ -274,8 +302,7 @@ const Orders = (function() {
         loadOrdersData: async function() {
             showLoading();
             try {
-                const data = await apiCall('/api/orders');
-                allOrders = data.data;
+                allOrders = await apiFetchAll('/api/orders', { fields: ORDER_TABLE_FIELDS });
                 filteredOrders = [...allOrders];
                 displayOrdersData(filteredOrders);
             } catch (error) {
@@ -284,6 +311,19 @@ const Orders = (function() {
             }
         },
 
+        subscribeToChanges: function() {
+            if (!window.EventSource) return;
+
+            const source = new EventSource('/api/orders/events');
+            source.addEventListener('created', handleOrderEvent);
+            source.addEventListener('status_changed', handleOrderEvent);
+            // Sent when this screen fell behind: reload instead of replaying
+            source.addEventListener('resync', () => {
+                this.loadOrdersSummary();
+                this.loadOrdersData();
+            });
+        },
+
         loadProjects: async function() {
             try {
                 const data = await apiCall('/api/v1/projects');
@@ -355,7 +395,11 @@ const Orders = (function() {
                     body: JSON.stringify(formData)
                 });
 
-                showNotification('Orden creada exitosamente', 'success');
+                if (data.reservation && !data.reservation.reserved) {
+                    showNotification(`Orden creada, pero faltan materiales: ${data.reservation.short_materials.join(', ')}`, 'warning');
+                } else {
+                    showNotification('Orden creada exitosamente', 'success');
+                }
                 
                 // Close modal and refresh data
                 const modal = bootstrap.Modal.getInstance(document.getElementById('createOrderModal'));
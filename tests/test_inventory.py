@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.services.inventory import InventoryService
+
+client = TestClient(main.app)
+
+def _create_order(mix_type: str, volume: float) -> int:
+    response = client.post("/api/orders", json={
+        "project_id": 101, "mix_type": mix_type, "volume": volume,
+        "scheduled_time": (datetime.now() + timedelta(hours=2)).isoformat(),
+        "address": "Frente de prueba", "assigned_plant": "PLANTA 1", "estimated_duration": 1
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["data"]["id"]
+
+def _complete(order_id: int) -> None:
+    response = client.put(f"/api/orders/{order_id}/status", data={"status": "completed"})
+    assert response.status_code == 200, response.text
+
+def test_recipes_are_converted_to_stock_units():
+    requirements = InventoryService.calculate_material_requirements("C-25", 10)
+
+    assert requirements["ARENA"] == pytest.approx(10 * 750 / 1600)   # m³
+    assert requirements["AGUA"] == pytest.approx(10 * 175 / 1000)    # m³
+    assert requirements["GRAVA"] == pytest.approx(10 * 1050 / 1500)  # m³
+    assert requirements["CMTO"] == pytest.approx(10 * 350 / 1000)    # t
+    assert requirements["ADT1"] == pytest.approx(10 * 3)             # kg
+
+def test_completing_an_order_takes_its_recipe_in_stock_units():
+    requirements = InventoryService.calculate_material_requirements("C-25", 10)
+    for name, quantity in requirements.items():
+        material = InventoryService.get_material_by_name(name)
+        InventoryService.update_material_stock(material.id, material.current_stock + quantity)
+    before = {name: InventoryService.get_material_by_name(name).current_stock for name in requirements}
+
+    order_id = _create_order("C-25", 10)
+    assert order_id not in {entry["order_id"] for entry in
+                            client.get("/api/inventory/reservations").json()["data"]["unreserved_orders"]}
+    _complete(order_id)
+
+    for name, quantity in requirements.items():
+        assert InventoryService.get_material_by_name(name).current_stock == pytest.approx(before[name] - quantity)
+    shortfalls = client.get("/api/inventory/reservations").json()["data"]["shortfalls"]
+    assert order_id not in {entry["order_id"] for entry in shortfalls}
+
+def test_an_unreserved_order_only_takes_free_stock_and_records_the_rest():
+    order_id = _create_order("C-30", 5000)
+    unreserved = client.get("/api/inventory/reservations").json()["data"]["unreserved_orders"]
+    assert order_id in {entry["order_id"] for entry in unreserved}
+
+    requirements = InventoryService.calculate_material_requirements("C-30", 5000)
+    free = {name: InventoryService.get_available_stock(name) for name in requirements}
+    stock = {name: InventoryService.get_material_by_name(name).current_stock for name in requirements}
+    _complete(order_id)
+
+    data = client.get("/api/inventory/reservations").json()["data"]
+    missing = next(entry["missing"] for entry in data["shortfalls"] if entry["order_id"] == order_id)
+    for name, quantity in requirements.items():
+        # Stock held for other orders stays in place
+        after = InventoryService.get_material_by_name(name).current_stock
+        assert after == pytest.approx(stock[name] - min(quantity, free[name]))
+        if quantity > free[name]:
+            assert missing[name] == pytest.approx(quantity - free[name], abs=0.01)
+        else:
+            assert name not in missing
+    assert missing["CMTO"] > 0
+
+def test_usage_records_what_was_taken_from_stock():
+    order_id = _create_order("C-35", 4000)
+    requirements = InventoryService.calculate_material_requirements("C-35", 4000)
+    free = {name: InventoryService.get_available_stock(name) for name in requirements}
+    usage = InventoryService.get_average_daily_usage(1)
+    _complete(order_id)
+
+    after = InventoryService.get_average_daily_usage(1)
+    for name, quantity in requirements.items():
+        material = InventoryService.get_material_by_name(name)
+        recorded = after.get(material.id, 0.0) - usage.get(material.id, 0.0)
+        assert recorded == pytest.approx(min(quantity, free[name]))
+        assert recorded <= quantity
@@ -0,0 +1,131 @@
+import random
+import threading
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+import main
+from app.models.schemas.orders import CreateOrderRequest
+from app.services.auth import AuthService
+from app.services.checklist import ChecklistService
+from app.services.fleet import FleetService
+from app.services.orders import OrdersService
+
+THREADS = 16
+ROUNDS = 25
+STATUSES = ["scheduled", "preparing", "in_progress", "completed", "cancelled"]
+
+client = TestClient(main.app)
+
+def _order_payload(rng: random.Random) -> dict:
+    return {
+        "project_id": rng.choice([101, 102, 103, 104]),
+        "mix_type": "C-30",
+        "volume": round(rng.uniform(1, 40), 1),
+        "scheduled_time": (datetime.now() + timedelta(hours=rng.randint(-48, 48))).isoformat(),
+        "address": "Frente de prueba",
+        "priority": rng.choice(["low", "medium", "high"]),
+        "assigned_plant": rng.choice(["PLANTA 1", "PLANTA 2", "PLANTA 3"]),
+        "estimated_duration": round(rng.uniform(0.5, 4), 1)
+    }
+
+def _checklist_payload(rng: random.Random, order_id: int) -> dict:
+    return {
+        "order_id": order_id,
+        "project_name": "VITTRIO",
+        "supervisor": "Ing. Supervisor",
+        "scheduled_time": (datetime.now() + timedelta(hours=rng.randint(0, 48))).isoformat(),
+        "categories": rng.sample(ChecklistService.get_available_categories(), 2)
+    }
+
+def _run_threads(target, count: int) -> list:
+    """
+    Run target(seed) on `count` threads released together; returns what they raised
+    """
+    failures = []
+    start = threading.Barrier(count)
+
+    def run(seed: int) -> None:
+        try:
+            start.wait()
+            target(seed)
+        except BaseException as error:
+            failures.append(error)
+
+    threads = [threading.Thread(target=run, args=(seed,)) for seed in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return failures
+
+def test_concurrent_requests_keep_ids_unique_and_aggregates_consistent():
+    initial_orders = len(OrdersService.get_all_orders())
+    order_ids, checklist_ids, emails = [], [], []
+    shared = threading.Lock()
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        for round_number in range(ROUNDS):
+            response = client.post("/api/orders", json=_order_payload(rng))
+            assert response.status_code == 200, response.text
+            order_id = response.json()["data"]["id"]
+
+            response = client.post("/api/checklists", json=_checklist_payload(rng, order_id))
+            assert response.status_code == 200, response.text
+            checklist_id = response.json()["data"]["id"]
+
+            email = f"stress-{seed}-{round_number}@example.com"
+            response = client.post("/register", follow_redirects=False, data={
+                "name": "Usuario de prueba", "email": email, "password": "secreto",
+                "confirm_password": "secreto", "phone": "3000000000"
+            })
+            assert response.status_code == 302, response.text
+
+            with shared:
+                order_ids.append(order_id)
+                checklist_ids.append(checklist_id)
+                emails.append(email)
+                target = rng.choice(order_ids)
+            response = client.put(f"/api/orders/{target}/status", data={"status": rng.choice(STATUSES)})
+            assert response.status_code == 200, response.text
+
+            summary = client.get("/api/v1/orders-summary").json()
+            assert summary["active_orders"] <= summary["total_orders"]
+            assert summary["completed_today"] <= summary["total_orders"]
+
+    failures = _run_threads(worker, THREADS)
+
+    assert not failures, failures
+    assert len(order_ids) == len(set(order_ids)) == THREADS * ROUNDS
+    assert len(checklist_ids) == len(set(checklist_ids))
+    user_ids = [AuthService.get_user_by_email(email).id for email in emails]
+    assert len(user_ids) == len(set(user_ids)) == len(emails)
+    assert len({user.id for user in AuthService.get_all_users()}) == len(AuthService.get_all_users())
+    assert len(OrdersService.get_all_orders()) == initial_orders + len(order_ids)
+    assert OrdersService.check_summary_consistency()
+    assert ChecklistService.check_summary_consistency()
+    assert FleetService.check_counters()
+
+def test_summary_is_a_consistent_snapshot_while_orders_change():
+    done = threading.Event()
+
+    def write(seed: int) -> None:
+        rng = random.Random(seed)
+        try:
+            for _ in range(150):
+                order = OrdersService.create_order(CreateOrderRequest(**_order_payload(rng)))
+                OrdersService.update_order_status(order.id, rng.choice(STATUSES))
+        finally:
+            done.set()
+
+    def read(seed: int) -> None:
+        while not done.is_set():
+            summary = OrdersService.get_orders_summary()
+            assert summary["active_orders"] <= summary["total_orders"], summary
+            assert summary["active_orders"] + summary["completed_today"] <= summary["total_orders"], summary
+
+    failures = _run_threads(lambda seed: (write if seed % 2 else read)(seed), 8)
+
+    assert not failures, failures
+    assert OrdersService.check_summary_consistency()
@@ -0,0 +1,42 @@
+from fastapi.testclient import TestClient
+
+import main
+from app.services.orders import OrdersService
+
+HEADER = "project_id,mix_type,volume,scheduled_time,address,assigned_plant,estimated_duration,notes\n"
+
+client = TestClient(main.app)
+
+def _import_csv(body: str) -> dict:
+    response = client.post("/api/orders/import", content=body, headers={"content-type": "text/csv"})
+    assert response.status_code == 200
+    return response.json()["data"]
+
+def test_quoted_field_spanning_lines_stays_in_one_row():
+    data = _import_csv(
+        HEADER
+        + '101,C-30,5,2026-10-20T10:00:00,"Torre 1\nNivel 3",PLANTA 1,1,"Acceso por\n""portón"" norte"\n'
+        + "102,C-30,6,2026-10-20T12:00:00,Torre 2,PLANTA 2,1,\n"
+    )
+
+    assert data["created"] == 2 and data["errors"] == []
+    first = OrdersService.get_order_by_id(data["order_ids"][0])
+    assert first.address == "Torre 1\nNivel 3"
+    assert first.notes == 'Acceso por\n"portón" norte'
+
+def test_literal_inch_mark_in_unquoted_field_does_not_open_a_quote():
+    data = _import_csv(
+        HEADER
+        + '101,C-30,5,2026-10-20T10:00:00,Torre 1,PLANTA 1,1,Bomba de 4" requerida\n'
+        + "102,C-30,6,2026-10-20T11:00:00,Torre 2,PLANTA 2,1,\n"
+        + "103,C-30,7,2026-10-20T12:00:00,Provisionales,PLANTA 1,1,\n"
+    )
+
+    assert data["created"] == 3 and data["errors"] == []
+    assert OrdersService.get_order_by_id(data["order_ids"][0]).notes == 'Bomba de 4" requerida'
+
+def test_unterminated_quoted_field_is_reported():
+    data = _import_csv(HEADER + '101,C-30,5,2026-10-20T10:00:00,"Torre 1,PLANTA 1,1,\n')
+
+    assert data["created"] == 0
+    assert data["errors"] == [{"row": 1, "error": "Unterminated quoted field"}]
@@ -0,0 +1,48 @@
+import random
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+import main
+from app.services.rollups import RollupSeries, RollupService, bucket_index
+
+client = TestClient(main.app)
+
+def test_series_windows_match_a_dense_reference():
+    rng = random.Random(7)
+    series = RollupSeries(block_size=24)
+    reference = {}
+    for _ in range(500):
+        index = rng.randint(-100, 400)
+        volume = rng.uniform(-5, 10)
+        series.add("scheduled", index, volume)
+        reference[index] = reference.get(index, 0.0) + volume
+
+    for low, high in [(-150, 450), (0, 24), (23, 25), (30, 30), (390, 500)]:
+        expected = [reference.get(index, 0.0) for index in range(low, high)]
+        assert series.window("scheduled", low, high) == expected
+        assert series.window("completed", low, high) == [0.0] * (high - low)
+
+def test_far_apart_orders_allocate_one_block_each():
+    series = RollupSeries(block_size=24 * 32)
+    series.add("scheduled", bucket_index(datetime(1990, 1, 1, 8), "hour"), 5.0)
+    series.add("scheduled", bucket_index(datetime(2090, 1, 1, 8), "hour"), 7.0)
+
+    assert len(series.columns["scheduled"]) == 2
+    assert series.window("scheduled", bucket_index(datetime(2090, 1, 1, 8), "hour"),
+                         bucket_index(datetime(2090, 1, 1, 10), "hour")) == [7.0, 0.0]
+
+def test_orders_years_apart_are_accepted_and_rolled_up():
+    RollupService._ensure_built()
+    for scheduled_time in ("2015-03-02T08:00:00", "2045-03-02T08:00:00"):
+        response = client.post("/api/orders", json={
+            "project_id": 101, "mix_type": "C-99", "volume": 4, "scheduled_time": scheduled_time,
+            "address": "Historico", "assigned_plant": "PLANTA 9", "estimated_duration": 1
+        })
+        assert response.status_code == 200, response.text
+
+    rollups = client.get("/api/orders/rollups", params={
+        "granularity": "day", "from": "2015-03-01T00:00:00", "to": "2015-03-04T00:00:00",
+        "plant": "PLANTA 9", "mix_type": "C-99"
+    }).json()["data"]
+    assert rollups["series"][0]["scheduled"] == [0.0, 4.0, 0.0]
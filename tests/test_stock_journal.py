@@ -0,0 +1,117 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.repositories.journal import SEGMENT_PREFIX, StockJournal
+from app.services.inventory import InventoryService
+
+def _open(directory, snapshot_every=1000) -> StockJournal:
+    # A long interval keeps the background writer out of the way; tests flush explicitly
+    return StockJournal(str(directory), flush_interval=60, snapshot_every=snapshot_every)
+
+def _segments(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith(SEGMENT_PREFIX))
+
+def test_reopening_recovers_the_latest_snapshot_and_its_tail(tmp_path):
+    journal = _open(tmp_path, snapshot_every=3)
+    journal.initialize({1: 100.0, 2: 50.0})
+    for stock in (90.0, 80.0, 70.0, 60.0):
+        journal.append(1, stock)
+    journal.append(2, 45.0)
+    journal.close()
+
+    reopened = _open(tmp_path, snapshot_every=3)
+    try:
+        assert reopened.has_history
+        assert reopened.state == {1: 60.0, 2: 45.0}
+        assert reopened.append(1, 55.0) == 6
+    finally:
+        reopened.close()
+
+    recovered = _open(tmp_path)
+    try:
+        assert recovered.state == {1: 55.0, 2: 45.0}
+    finally:
+        recovered.close()
+
+def test_a_torn_final_line_is_cut_off_on_recovery(tmp_path):
+    journal = _open(tmp_path)
+    journal.initialize({1: 100.0})
+    journal.append(1, 90.0)
+    journal.append(1, 80.0)
+    journal.close()
+
+    segment = tmp_path / _segments(tmp_path)[-1]
+    intact = segment.stat().st_size
+    with open(segment, "a", encoding="utf-8") as handle:
+        handle.write('{"seq": 3, "ts": "2026-01-01T00:00:00", "material_id": 1, "sto')
+
+    reopened = _open(tmp_path)
+    assert reopened.state == {1: 80.0}
+    assert segment.stat().st_size == intact
+    reopened.append(1, 70.0)
+    reopened.close()
+
+    recovered = _open(tmp_path)
+    try:
+        assert recovered.state == {1: 70.0}
+    finally:
+        recovered.close()
+
+def test_state_at_replays_up_to_the_requested_moment(tmp_path):
+    before = datetime.now() - timedelta(seconds=1)
+    journal = _open(tmp_path, snapshot_every=2)
+    try:
+        journal.initialize({1: 100.0, 2: 10.0})
+        moments = []
+        for stock in (90.0, 80.0, 70.0):
+            time.sleep(0.01)
+            journal.append(1, stock)
+            journal.flush()
+            time.sleep(0.01)
+            moments.append(datetime.now())
+
+        assert journal.state_at(before) is None
+        assert journal.state_at(moments[0]) == {1: 90.0, 2: 10.0}
+        assert journal.state_at(moments[1]) == {1: 80.0, 2: 10.0}
+        assert journal.state_at(moments[2]) == {1: 70.0, 2: 10.0}
+    finally:
+        journal.close()
+
+@pytest.fixture
+def arena():
+    material = InventoryService.get_material_by_name("ARENA")
+    original = material.current_stock
+    yield material
+    InventoryService.close_journal()
+    InventoryService.update_material_stock(material.id, original)
+
+def _stale_journal(directory, arena, stock: float) -> None:
+    journal = _open(directory)
+    journal.initialize({material.id: material.current_stock for material in InventoryService._materials_db})
+    journal.append(arena.id, stock)
+    journal.close()
+
+def test_database_stock_wins_over_a_lagging_journal(tmp_path, arena):
+    _stale_journal(tmp_path, arena, 10.0)
+    InventoryService.update_material_stock(arena.id, 500.0)
+
+    InventoryService.open_journal(str(tmp_path), flush_interval=60, restore=False)
+    InventoryService.close_journal()
+
+    assert arena.current_stock == 500.0
+    journal = _open(tmp_path)
+    try:
+        assert journal.state[arena.id] == 500.0
+    finally:
+        journal.close()
+
+def test_memory_backend_restores_stock_from_the_journal(tmp_path, arena):
+    _stale_journal(tmp_path, arena, 10.0)
+    InventoryService.update_material_stock(arena.id, 500.0)
+
+    InventoryService.open_journal(str(tmp_path), flush_interval=60, restore=True)
+
+    assert arena.current_stock == 10.0